@@ -1,6 +1,5 @@
 from flask import Flask, render_template, request, redirect, url_for, send_file, jsonify, g
 import mysql.connector
-import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import json
@@ -10,9 +9,20 @@ from itertools import combinations, cycle
 import decimal
 import random
 import csv
+from lot_filter_batch import filter_batch, filter_table
+from lot_combo_mask import RecentDrawMasks
+from lot_draw_history import load_draw_history
+from lot_combo_table import load_combo_table
+from lot_sumeo_index import load_sumeo_index
+from lot_scoring import ScoringContext, CountingCursor, snapshot_key_for, score_batch
+from lot_manifest import seed_everything, build_manifest, snapshot_id
+from lot_topk import DiverseTopK
 
 app = Flask(__name__)
 
+# Number of seeded prediction results kept per predictor
+PREDICTION_CACHE_SIZE = 32
+
 # Configure MySQL connection
 db_config = {
     'host': 'localhost',
@@ -159,7 +169,14 @@ class GeorgiaFantasy5Predictor:
         """
         try:
             self.conn = mysql.connector.connect(**config)
-            self.cursor = self.conn.cursor(dictionary=True)
+            # Counting wrapper so we can verify the scoring loop issues no queries
+            self.cursor = CountingCursor(self.conn.cursor(dictionary=True))
+            self.scoring_context = None
+            self.scoring_query_count = 0
+            
+            # Seeded prediction results by manifest request key
+            self.prediction_cache = {}
+            self.last_manifest = None
             
             # Georgia Fantasy 5 specifics
             self.num_range = range(1, 43)  # Numbers 1-42
@@ -188,8 +205,13 @@ class GeorgiaFantasy5Predictor:
             self.load_historical_data()
         except mysql.connector.Error as e:
             print(f"Database connection error: {e}")
-            # Create empty dataframe for historical draws if DB connection fails
-            self.historical_draws = pd.DataFrame(columns=['date', 'b1', 'b2', 'b3', 'b4', 'b5', 'sum'])
+            # Fall back to the shared (possibly empty) draw history if DB connection fails
+            self.historical_draws = load_draw_history()
+            self.recent_masks = RecentDrawMasks([])
+            self.scoring_context = None
+            self.scoring_query_count = 0
+            self.prediction_cache = {}
+            self.last_manifest = None
             self.conn = None
             self.cursor = None
     
@@ -452,37 +474,40 @@ class GeorgiaFantasy5Predictor:
         """Load historical draws from MySQL database"""
         if not self.conn or not self.cursor:
             print("Database connection not available.")
-            self.historical_draws = pd.DataFrame(columns=['date', 'b1', 'b2', 'b3', 'b4', 'b5', 'sum'])
+            self.historical_draws = load_draw_history()
+            self.recent_masks = RecentDrawMasks([])
             return
             
         try:
-            query = "SELECT * FROM ga_f5_draws ORDER BY date DESC"
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
-            
-            # Process any decimal values
-            processed_results = []
-            for row in results:
-                processed_row = {}
-                for key, value in row.items():
-                    if isinstance(value, decimal.Decimal):
-                        processed_row[key] = float(value)
-                    else:
-                        processed_row[key] = value
-                processed_results.append(processed_row)
-            
-            # Convert to DataFrame for easier manipulation
-            self.historical_draws = pd.DataFrame(processed_results)
+            # Shared typed store - only draws newer than the ones already held are fetched
+            self.historical_draws = load_draw_history(self.cursor)
             print(f"Loaded {len(self.historical_draws)} historical draws")
         except Exception as e:
             print(f"Error loading historical data: {e}")
-            self.historical_draws = pd.DataFrame(columns=['date', 'b1', 'b2', 'b3', 'b4', 'b5', 'sum'])
+            self.historical_draws = load_draw_history()
+        
+        # Bitmask snapshot of the recent draws for duplicate checks
+        self.recent_masks = RecentDrawMasks(self.get_recent_draw_numbers(10), depth=10)
+    
+    def get_scoring_context(self):
+        """
+        Get the scoring snapshot (frequency vector, average sum, col1 lookup),
+        rebuilt from the draw history's cumulative counts only when a new draw
+        has arrived or the day has rolled over
+        """
+        latest_date = self.historical_draws.latest_date
+        snapshot_key = snapshot_key_for(latest_date)
+        
+        if self.scoring_context is None or self.scoring_context.snapshot_key != snapshot_key:
+            self.scoring_context = ScoringContext.from_history(
+                self.historical_draws, self.col1_data, self.rank_limits, self.rank_counts, snapshot_key
+            )
+        
+        return self.scoring_context
     
     def get_last_n_draws(self, n=10):
-        """Get the last n draws"""
-        if self.historical_draws.empty:
-            return pd.DataFrame(columns=['date', 'b1', 'b2', 'b3', 'b4', 'b5', 'sum'])
-        return self.historical_draws.head(n)
+        """Get the last n draws as dicts (date, b1-b5, sum), most recent first"""
+        return self.historical_draws.last_draws(n)
     
     def count_sequential_numbers(self, numbers):
         """Count sequences of 2 and 3 consecutive numbers"""
@@ -548,38 +573,36 @@ class GeorgiaFantasy5Predictor:
         Returns:
         tuple: (individual_dup_counts, cumulative_dup_counts)
         """
-        dup_counts = []
+        recent_masks = self.recent_masks
+        if max_draws > recent_masks.depth:
+            recent_masks = RecentDrawMasks(self.get_recent_draw_numbers(max_draws), depth=max_draws)
         
-        last_draws = self.get_last_n_draws(max_draws)
-        if last_draws.empty:
+        if not len(recent_masks):
             return [0] * max_draws, [0] * max_draws
         
-        # Individual draw duplicate counts
-        for i, row in last_draws.iterrows():
-            previous_draw = [int(row['b1']), int(row['b2']), int(row['b3']), int(row['b4']), int(row['b5'])]
-            dup_count = len(set(numbers).intersection(set(previous_draw)))
-            dup_counts.append(dup_count)
-        
-        # Calculate cumulative duplicates
-        cumulative_dups = []
-        for i in range(1, max_draws + 1):
-            # All numbers from the last i draws
-            all_previous_nums = []
-            for j in range(i):
-                if j < len(last_draws):
-                    row = last_draws.iloc[j]
-                    all_previous_nums.extend([
-                        int(row['b1']), int(row['b2']), int(row['b3']), 
-                        int(row['b4']), int(row['b5'])
-                    ])
-            
-            # Count unique duplicates
-            unique_prevs = set(all_previous_nums)
-            dup_count = len(set(numbers).intersection(unique_prevs))
-            cumulative_dups.append(dup_count)
+        # One AND plus popcount per previous draw and per cumulative window
+        dup_counts, cumulative_dups = recent_masks.duplicate_counts(numbers)
+        dup_counts = dup_counts[:max_draws]
+        cumulative_dups = cumulative_dups[:max_draws]
+        
+        # Windows longer than the available history cover every available draw
+        cumulative_dups += [cumulative_dups[-1]] * (max_draws - len(cumulative_dups))
         
         return dup_counts, cumulative_dups
     
+    def get_recent_draw_numbers(self, n=3):
+        """Get the numbers of the last n draws as lists, most recent first"""
+        return self.historical_draws.recent(n)
+    
+    def get_filter_settings(self):
+        """Current filter settings in the form used by lot_filter_batch"""
+        return {
+            'max_seq2': self.max_seq2,
+            'max_seq3': self.max_seq3,
+            'max_mod_tot': self.max_mod_tot,
+            'sum_range': self.sum_range
+        }
+    
     def filter_combination(self, combination):
         """
         Apply all filters to a combination
@@ -593,67 +616,142 @@ class GeorgiaFantasy5Predictor:
         # Basic checks
         if len(combination) != self.nums_per_draw:
             return False
-            
-        # Even/Odd distribution
-        even_count = sum(1 for num in combination if num % 2 == 0)
-        odd_count = self.nums_per_draw - even_count
         
-        if not (2 <= even_count <= 3 and 2 <= odd_count <= 3):
-            return False
-            
-        # Sequential numbers check
-        seq2, seq3 = self.count_sequential_numbers(combination)
-        if seq2 > self.max_seq2 or seq3 > self.max_seq3:
-            return False
-            
-        # Modular totals check
-        mod_total, mod_x = self.calculate_modular_total(combination)
-        if mod_total > self.max_mod_tot or mod_x > 0:
-            return False
-            
-        # Decade distribution check
-        d0, d1, d2, d3, d4 = self.calculate_decade_distribution(combination)
-        if d0 > 2 or d1 > 2 or d2 > 2 or d3 > 2 or d4 > 2:
-            return False
-            
-        # Duplicate check from previous draws
-        dup_counts, cumulative_dups = self.calculate_duplicates_from_previous(combination)
+        # Even/odd, sequential, modular, decade, duplicate and sum rules are
+        # applied by the shared vectorized kernel
+        return bool(filter_batch([combination], self.get_filter_settings(), self.recent_masks)[0])
+    
+    def _best_per_group(self, keys, scores, candidates):
+        """
+        Index of the highest-scoring candidate for each distinct key
         
-        # Your filtering rules:
-        # - No more than 1 number from most recent draw
-        if len(dup_counts) > 0 and dup_counts[0] > 1:
-            return False
-            
-        # - No more than 2 numbers from cumulative 2 most recent draws
-        if len(cumulative_dups) > 1 and cumulative_dups[1] > 2:
-            return False
-            
-        # - No more than 3 numbers from cumulative 3 most recent draws
-        if len(cumulative_dups) > 2 and cumulative_dups[2] > 3:
-            return False
-            
-        # Sum range check
-        total_sum = sum(combination)
-        min_sum, max_sum = self.sum_range
-        if not (min_sum <= total_sum <= max_sum):
-            return False
+        Returns:
+        np.ndarray: Candidate indexes, best group first (ties go to the lower id)
+        """
+        if len(candidates) == 0:
+            return candidates
+        best = np.full(int(keys.max()) + 1, -np.inf)
+        np.maximum.at(best, keys[candidates], scores[candidates])
+        winners = candidates[scores[candidates] == best[keys[candidates]]]
+        _, first = np.unique(keys[winners], return_index=True)
+        winners = winners[first]
+        return winners[np.argsort(-scores[winners], kind='stable')]
+    
+    def generate_exact_predictions(self, count=10, specific_even_odd=None):
+        """
+        Filter and score every combination and return the true top predictions
+        
+        Uses the same diversity selection as generate_predictions: the best
+        combination for each col1 value first, then the best for each unused
+        col5 value, then the highest remaining scores.
         
-        # All filters passed
-        return True
+        Parameters:
+        count (int): Number of predictions to generate
+        specific_even_odd (tuple): Optional tuple of (even_count, odd_count) to use
+        
+        Returns:
+        list: List of prediction dictionaries with combinations and scores
+        """
+        min_sum, max_sum = self.sum_range
+        if min_sum == max_sum:
+            # Exact sum: the candidates are one zero-copy slice of the sumeo index
+            even, odd = specific_even_odd if specific_even_odd else (None, None)
+            combos = load_sumeo_index().combos_for(min_sum, even, odd)
+            combos = combos[filter_batch(combos, self.get_filter_settings(), self.recent_masks)]
+        else:
+            table = load_combo_table()
+            mask = filter_table(table, self.get_filter_settings(), self.recent_masks)
+            if specific_even_odd:
+                mask &= table['even'] == specific_even_odd[0]
+            combos = table.combos[np.flatnonzero(mask)]
+        
+        if len(combos) == 0:
+            print("No combinations satisfy the current filters")
+            return []
+        
+        scores, _ = score_batch(combos, self.get_scoring_context())
+        print(f"Scored all {len(combos)} valid combinations")
+        
+        # Best combination for each col1 value
+        everything = np.arange(len(combos))
+        selected = list(self._best_per_group(combos[:, 0], scores, everything)[:count])
+        
+        # Then prioritize col5 diversity among the rest
+        if len(selected) < count:
+            remaining = np.ones(len(combos), dtype=bool)
+            remaining[selected] = False
+            remaining &= ~np.isin(combos[:, -1], combos[selected, -1])
+            col5_best = self._best_per_group(combos[:, -1], scores, np.flatnonzero(remaining))
+            selected.extend(col5_best[:count - len(selected)])
+        
+        # Then any remaining high scorers (partial sort of the top k)
+        if len(selected) < count:
+            remaining = np.ones(len(combos), dtype=bool)
+            remaining[selected] = False
+            rest = np.flatnonzero(remaining)
+            k = min(count - len(selected), len(rest))
+            if k > 0:
+                top = rest[np.argpartition(-scores[rest], k - 1)[:k]]
+                selected.extend(top[np.argsort(-scores[top], kind='stable')])
+        
+        predictions = []
+        for index in selected:
+            combo = [int(num) for num in combos[index]]
+            stats = self._calculate_stats(combo)
+            predictions.append({
+                'combination': combo,
+                'score': self._calculate_score(combo, stats),
+                'sum': sum(combo),
+                'stats': stats
+            })
+        
+        return sorted(predictions, key=lambda x: x['score'], reverse=True)[:count]
+    
+    def run_manifest(self, seed, count, specific_even_odd=None, exact=False):
+        """Manifest describing a generate_predictions run with the current settings"""
+        settings = self.get_filter_settings()
+        settings.update({'specific_even_odd': specific_even_odd, 'exact': exact})
+        # The scoring windows count back from today, so the reference date is part of the snapshot
+        latest_date = self.historical_draws.latest_date
+        return build_manifest('app', seed, count, settings, self.rank_limits, self.rank_counts,
+                              snapshot_id(*snapshot_key_for(latest_date), len(self.historical_draws)))
     
-    def generate_predictions(self, count=10, specific_even_odd=None):
+    def generate_predictions(self, count=10, specific_even_odd=None, exact=False, seed=None):
         """
         Generate top predictions with improved selection for position 1 based on historical data
         
         Parameters:
         count (int): Number of predictions to generate
         specific_even_odd (tuple): Optional tuple of (even_count, odd_count) to use
+        exact (bool): Score every valid combination instead of exploring candidates
+        seed (int): Random seed; identical seeded requests are served from cache
         
         Returns:
         list: List of prediction dictionaries with combinations and scores
         """
+        used_seed = seed_everything(seed)
+        manifest = self.run_manifest(used_seed, count, specific_even_odd, exact)
+        self.last_manifest = manifest
+        
+        if seed is not None and manifest['request_key'] in self.prediction_cache:
+            print(f"Serving {count} predictions for seed {used_seed} from cache")
+            return self.prediction_cache[manifest['request_key']]
+        
+        predictions = self._generate_predictions(count, specific_even_odd, exact)
+        if seed is not None:
+            # Keep the cache bounded, dropping the oldest entry first
+            if len(self.prediction_cache) >= PREDICTION_CACHE_SIZE:
+                self.prediction_cache.pop(next(iter(self.prediction_cache)))
+            self.prediction_cache[manifest['request_key']] = predictions
+        return predictions
+    
+    def _generate_predictions(self, count=10, specific_even_odd=None, exact=False):
+        """Generate predictions using the already-seeded random module (see generate_predictions)"""
         print(f"Generating {count} predictions for Georgia Fantasy 5...")
         
+        if exact:
+            return self.generate_exact_predictions(count, specific_even_odd)
+        
         # Check if database is available
         if self.historical_draws.empty:
             # Generate some random combinations if no historical data
@@ -671,8 +769,12 @@ class GeorgiaFantasy5Predictor:
             sorted_combinations = sorted(filtered_combinations, key=lambda x: x['score'], reverse=True)
             return sorted_combinations[:count]
         
+        # Exact sum: a direct slice of the sumeo index instead of a search
+        if self.sum_range[0] == self.sum_range[1]:
+            return self.generate_exact_predictions(count, specific_even_odd)
+        
         # Get the latest draw date for tracking
-        latest_date = self.historical_draws.iloc[0]['date'] if not self.historical_draws.empty else None
+        latest_date = self.historical_draws.latest_date
         
         # Calculate typical distribution for initial filtering
         if specific_even_odd:
@@ -703,29 +805,26 @@ class GeorgiaFantasy5Predictor:
         if len(pos3_candidates) < 10:
             pos3_candidates.extend([n for n in all_nums if n not in pos3_candidates][:10-len(pos3_candidates)])
         
-        # Track all filtered combinations
-        filtered_combinations = []
-        
-        # Track combinations by their col1 value
-        col1_combinations = {}
+        # Keep only what the final col1/col5 diversity selection needs
+        candidates = DiverseTopK(count)
         
         # For each sum range, try to generate combinations
         min_sum, max_sum = self.sum_range
         
-        # Special case for exact sum
-        if min_sum == max_sum:
-            sum_ranges = [(min_sum, max_sum)]
-        else:
-            sum_ranges = [
-                (min_sum, min_sum + 10),
-                (min_sum + 10, min_sum + 20),
-                (min_sum + 20, min_sum + 30),
-                (min_sum + 30, max_sum)
-            ]
+        sum_ranges = [
+            (min_sum, min_sum + 10),
+            (min_sum + 10, min_sum + 20),
+            (min_sum + 20, min_sum + 30),
+            (min_sum + 30, max_sum)
+        ]
         
         # Track used col1 values for each key to ensure round-robin
         used_col1_values = {}
         
+        # Load the scoring snapshot once for the whole generation
+        self.get_scoring_context()
+        queries_before = self.cursor.query_count if self.cursor else 0
+        
         # Maximum combinations to generate per col1 value
         max_per_col1 = 20
         max_attempts = 10000
@@ -746,12 +845,8 @@ class GeorgiaFantasy5Predictor:
                 
                 # Ensure we try each col1 value explicitly
                 for forced_col1 in col1_candidates:
-                    # Initialize if this col1 isn't tracked yet
-                    if forced_col1 not in col1_combinations:
-                        col1_combinations[forced_col1] = []
-                    
                     # Don't generate too many combinations for a single col1
-                    if len(col1_combinations[forced_col1]) >= max_per_col1:
+                    if candidates.group_counts.get(forced_col1, 0) >= max_per_col1:
                         continue
                     
                     # Get a wide range of pos5 candidates
@@ -794,21 +889,25 @@ class GeorgiaFantasy5Predictor:
                                             'stats': stats
                                         }
                                         
-                                        filtered_combinations.append(new_combo)
-                                        col1_combinations[forced_col1].append(new_combo)
+                                        candidates.push(score, new_combo, combo[0], combo[-1], tuple(combo))
                                         
                                         # If we have enough combinations for this col1, move on
-                                        if len(col1_combinations[forced_col1]) >= max_per_col1:
+                                        if candidates.group_counts[forced_col1] >= max_per_col1:
                                             break
-                                if len(col1_combinations[forced_col1]) >= max_per_col1 or attempts > max_attempts:
+                                if candidates.group_counts.get(forced_col1, 0) >= max_per_col1 or attempts > max_attempts:
                                     break
-                            if len(col1_combinations[forced_col1]) >= max_per_col1 or attempts > max_attempts:
+                            if candidates.group_counts.get(forced_col1, 0) >= max_per_col1 or attempts > max_attempts:
                                 break
-                        if len(col1_combinations[forced_col1]) >= max_per_col1 or attempts > max_attempts:
+                        if candidates.group_counts.get(forced_col1, 0) >= max_per_col1 or attempts > max_attempts:
                             break
         
+        # Filtering and scoring run from in-memory snapshots only
+        if self.cursor:
+            self.scoring_query_count = self.cursor.query_count - queries_before
+            print(f"Scoring loop issued {self.scoring_query_count} database queries")
+        
         # If we couldn't generate any combinations, return random ones
-        if not filtered_combinations:
+        if not len(candidates):
             print("Could not generate any filtered combinations. Using random combinations.")
             random_combinations = []
             for _ in range(count * 2):  # Generate more than needed
@@ -827,7 +926,7 @@ class GeorgiaFantasy5Predictor:
             return sorted_random[:count]
         
         # Track if we have enough diversity
-        unique_col1_values = set(combo['combination'][0] for combo in filtered_combinations)
+        unique_col1_values = candidates.col1_values()
         print(f"Generated combinations with {len(unique_col1_values)} different col1 values")
         
         # If we don't have enough col1 diversity, try harder
@@ -836,7 +935,7 @@ class GeorgiaFantasy5Predictor:
             
             # For each col1 value in candidates that isn't represented yet
             for col1_value in col1_candidates:
-                if col1_value not in unique_col1_values and len(filtered_combinations) < count * 3:
+                if col1_value not in unique_col1_values and len(candidates) < count * 3:
                     
                     # Try to generate a valid combination with this col1
                     for _ in range(50):  # Try up to 50 times for each missing col1
@@ -860,86 +959,16 @@ class GeorgiaFantasy5Predictor:
                                 'stats': stats
                             }
                             
-                            filtered_combinations.append(new_combo)
-                            if col1_value not in col1_combinations:
-                                col1_combinations[col1_value] = []
-                            col1_combinations[col1_value].append(new_combo)
+                            candidates.push(score, new_combo, col1_value, combo[-1], tuple(combo))
                             unique_col1_values.add(col1_value)
                             break
         
-        # Final diversity selection
-        # First select the best combination for each col1 value
-        diverse_combinations = []
-        
-        # Sort col1 values by their best score
-        col1_best_scores = {}
-        for col1, combos in col1_combinations.items():
-            if combos:  # Skip empty groups
-                best_combo = max(combos, key=lambda x: x['score'])
-                col1_best_scores[col1] = best_combo['score']
-        
-        # Check if we have any scores to sort
-        if not col1_best_scores:
-            print("No valid combinations found. Using random combinations.")
-            random_combinations = []
-            for _ in range(count * 2):
-                combo = sorted(random.sample(range(1, 43), 5))
-                if self.filter_combination(combo):
-                    stats = self._calculate_stats(combo)
-                    score = self._calculate_score(combo, stats)
-                    random_combinations.append({
-                        'combination': combo,
-                        'score': score,
-                        'sum': sum(combo),
-                        'stats': stats
-                    })
-            
-            sorted_random = sorted(random_combinations, key=lambda x: x['score'], reverse=True)
-            return sorted_random[:count]
-        
-        # Take combinations in order of best score, one from each col1 group
-        for col1 in sorted(col1_best_scores.keys(), key=lambda x: col1_best_scores[x], reverse=True):
-            if len(diverse_combinations) >= count:
-                break
-                
-            # Get best combination from this col1 group
-            best_combo = max(col1_combinations[col1], key=lambda x: x['score'])
-            diverse_combinations.append(best_combo)
-        
-        # If we don't have enough combinations yet, add more
-        if diverse_combinations and len(diverse_combinations) < count:
-            # Track which col5 values we've used
-            used_col5 = set(combo['combination'][-1] for combo in diverse_combinations)
-            
-            # Sort remaining combinations by score
-            remaining = sorted(
-                [c for c in filtered_combinations if c not in diverse_combinations],
-                key=lambda x: x['score'],
-                reverse=True
-            )
-            
-            # First prioritize col5 diversity
-            for combo in remaining:
-                if len(diverse_combinations) >= count:
-                    break
-                    
-                col5 = combo['combination'][-1]
-                if col5 not in used_col5:
-                    diverse_combinations.append(combo)
-                    used_col5.add(col5)
-            
-            # Then add any remaining high scorers
-            for combo in remaining:
-                    if len(diverse_combinations) >= count:
-                        break
-                        
-                    if combo not in diverse_combinations:
-                        diverse_combinations.append(combo)
+        # Final diversity selection: best per col1 group, then col5 diversity,
+        # then the remaining high scorers (maintained online by DiverseTopK)
+        final_combinations = candidates.select(count)
         
-        # Final sorting by score
-        if diverse_combinations:
-            final_combinations = sorted(diverse_combinations, key=lambda x: x['score'], reverse=True)
-            return final_combinations[:count]
+        if final_combinations:
+            return final_combinations
         else:
             # Ultimate fallback if we somehow still have no combinations
             print("No valid combinations found after all attempts. Using completely random combinations.")
@@ -957,11 +986,11 @@ class GeorgiaFantasy5Predictor:
     
     def _calculate_stats(self, numbers):
         """Calculate statistical measures for a combination"""
-        numbers_array = np.array(numbers)
-        
-        # Basic stats
-        mean = np.mean(numbers_array)
-        median = np.median(numbers_array)
+        # Basic stats (plain Python - NumPy call overhead dominates on 5 numbers)
+        mean = sum(numbers) / len(numbers)
+        sorted_nums = sorted(numbers)
+        n = len(sorted_nums)
+        median = float(sorted_nums[n//2]) if n % 2 == 1 else (sorted_nums[n//2-1] + sorted_nums[n//2]) / 2
         
         # Even/Odd distribution
         even_count = sum(1 for num in numbers if num % 2 == 0)
@@ -1013,41 +1042,11 @@ class GeorgiaFantasy5Predictor:
         Returns:
         float: A score between a0-100
         """
-        # Get frequency of each number in last 30 days
-        frequency = {}
-        
-        if self.conn and self.cursor and not self.historical_draws.empty:
-            try:
-                query = """
-                SELECT ball, COUNT(*) as freq FROM (
-                    SELECT b1 as ball FROM ga_f5_draws WHERE date >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-                    UNION ALL SELECT b2 as ball FROM ga_f5_draws WHERE date >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-                    UNION ALL SELECT b3 as ball FROM ga_f5_draws WHERE date >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-                    UNION ALL SELECT b4 as ball FROM ga_f5_draws WHERE date >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-                    UNION ALL SELECT b5 as ball FROM ga_f5_draws WHERE date >= DATE_SUB(NOW(), INTERVAL 30 DAY)
-                ) as all_balls
-                WHERE ball IN (%s)
-                GROUP BY ball
-                """ % ','.join(str(num) for num in combination)
-                
-                self.cursor.execute(query)
-                freq_results = self.cursor.fetchall()
-                
-                # Convert to a dictionary for easier lookup
-                for row in freq_results:
-                    # Convert any Decimal values to float
-                    ball = int(row['ball'])
-                    if isinstance(row['freq'], decimal.Decimal):
-                        frequency[ball] = float(row['freq'])
-                    else:
-                        frequency[ball] = row['freq']
-            except Exception as e:
-                print(f"Error getting number frequencies: {e}")
+        # All database-derived inputs come from the snapshot of the current draw history
+        context = self.get_scoring_context()
         
-        # Fill in any missing numbers with a default frequency of 0
-        for num in combination:
-            if num not in frequency:
-                frequency[num] = 0
+        # Get frequency of each number in last 30 days
+        frequency = {num: context.frequency[num] for num in combination}
         
         # Calculate frequency score (0-100)
         max_possible_freq = 10  # Assuming a number could appear in all 5 positions for 30 days = 150 times
@@ -1069,22 +1068,7 @@ class GeorgiaFantasy5Predictor:
         seq_penalty = stats['seq2'] * 5 + stats['seq3'] * 15
         
         # Sum score - prefer combinations with sums close to average winning sum
-        avg_sum = 100  # Default if DB query fails
-        
-        if self.conn and self.cursor and not self.historical_draws.empty:
-            try:
-                query = "SELECT AVG(sum) as avg_sum FROM ga_f5_draws WHERE date >= DATE_SUB(NOW(), INTERVAL 365 DAY)"
-                self.cursor.execute(query)
-                result = self.cursor.fetchone()
-                
-                # Handle Decimal type for avg_sum
-                if result and result['avg_sum']:
-                    if isinstance(result['avg_sum'], decimal.Decimal):
-                        avg_sum = float(result['avg_sum'])
-                    else:
-                        avg_sum = result['avg_sum']
-            except Exception as e:
-                print(f"Error getting average sum: {e}")
+        avg_sum = context.avg_sum
         
         sum_score = 100 - min(abs(stats['sum'] - avg_sum), 30) * 3.33
         
@@ -1144,11 +1128,12 @@ class GeorgiaFantasy5Predictor:
             key = (sum_range, even_str, odd_str)
             pos1 = combination[0]
             
-            if key in self.col1_data and pos1 in self.col1_data[key]:
+            col1_data = context.col1_data
+            if key in col1_data and pos1 in col1_data[key]:
                 col1_bonus = 15  # Bonus points for having first position from historical data
-            elif (sum_range, "*", "*") in self.col1_data and pos1 in self.col1_data[(sum_range, "*", "*")]:
+            elif (sum_range, "*", "*") in col1_data and pos1 in col1_data[(sum_range, "*", "*")]:
                 col1_bonus = 10  # Smaller bonus for generic sum range match
-            elif ("*", even_str, odd_str) in self.col1_data and pos1 in self.col1_data[("*", even_str, odd_str)]:
+            elif ("*", even_str, odd_str) in col1_data and pos1 in col1_data[("*", even_str, odd_str)]:
                 col1_bonus = 10  # Smaller bonus for generic even/odd match
         
         # Calculate final score with weighted components
@@ -1239,20 +1224,9 @@ def index():
         predictor = get_predictor()
         
         # Get the last 10 draws for display
-        last_draws = predictor.get_last_n_draws(10)
-        
-        # Convert to list for JSON serialization, handle datetime objects
-        last_draws_list = []
-        for _, row in last_draws.iterrows():
-            draw_dict = {}
-            for key, value in row.items():
-                if key in ['b1', 'b2', 'b3', 'b4', 'b5', 'sum']:
-                    draw_dict[key] = int(value) if value is not None else None
-                elif key == 'date':
-                    draw_dict[key] = value.strftime('%Y-%m-%d') if value is not None else None
-                else:
-                    draw_dict[key] = value
-            last_draws_list.append(draw_dict)
+        # Last 10 draws for display, dates as strings for JSON serialization
+        last_draws_list = [dict(draw, date=draw['date'].strftime('%Y-%m-%d'))
+                           for draw in predictor.get_last_n_draws(10)]
         
         return render_template(
             'index.html',
@@ -1308,6 +1282,8 @@ def generate():
         if request.method == 'POST':
             # Get parameters from form
             count = int(request.form.get('count', 10))
+            exact = request.form.get('exact') == '1'
+            seed = int(request.form['seed']) if request.form.get('seed', '').strip() else None
             
             # Debug the form data
             print("Form data received:")
@@ -1336,33 +1312,23 @@ def generate():
                     # Default to (3, 2) if not specified
                     even_count = int(request.form.get('even_count', 3))
                     odd_count = int(request.form.get('odd_count', 2))
-                    predictions = predictor.generate_predictions(count, specific_even_odd=(even_count, odd_count))
+                    predictions = predictor.generate_predictions(count, specific_even_odd=(even_count, odd_count),
+                                                                 exact=exact, seed=seed)
                 else:
                     # Use default behavior for ranges
-                    predictions = predictor.generate_predictions(count)
+                    predictions = predictor.generate_predictions(count, exact=exact, seed=seed)
             else:
                 # Use default behavior if no sum range specified
-                predictions = predictor.generate_predictions(count)
+                predictions = predictor.generate_predictions(count, exact=exact, seed=seed)
         else:
             # Use default count for GET requests
             count = 10
             predictions = predictor.generate_predictions(count)
         
         # Get the last 10 draws for display
-        last_draws = predictor.get_last_n_draws(10)
-        
-        # Convert to list for JSON serialization, handle datetime objects
-        last_draws_list = []
-        for _, row in last_draws.iterrows():
-            draw_dict = {}
-            for key, value in row.items():
-                if key in ['b1', 'b2', 'b3', 'b4', 'b5', 'sum']:
-                    draw_dict[key] = int(value) if value is not None else None
-                elif key == 'date':
-                    draw_dict[key] = value.strftime('%Y-%m-%d') if value is not None else None
-                else:
-                    draw_dict[key] = value
-            last_draws_list.append(draw_dict)
+        # Last 10 draws for display, dates as strings for JSON serialization
+        last_draws_list = [dict(draw, date=draw['date'].strftime('%Y-%m-%d'))
+                           for draw in predictor.get_last_n_draws(10)]
         
         # Try rendering the template
         try:
@@ -1370,6 +1336,7 @@ def generate():
                 'predictions.html',
                 predictions=predictions,
                 last_draws=last_draws_list,
+                seed=predictor.last_manifest['seed'] if predictor.last_manifest else None,
                 filters={
                     'max_seq2': predictor.max_seq2,
                     'max_seq3': predictor.max_seq3,
@@ -1509,20 +1476,9 @@ def stats():
         predictor = get_predictor()
         
         # Get the last 10 draws for display
-        last_draws = predictor.get_last_n_draws(10)
-        
-        # Convert to list for JSON serialization, handle datetime objects
-        last_draws_list = []
-        for _, row in last_draws.iterrows():
-            draw_dict = {}
-            for key, value in row.items():
-                if key in ['b1', 'b2', 'b3', 'b4', 'b5', 'sum']:
-                    draw_dict[key] = int(value) if value is not None else None
-                elif key == 'date':
-                    draw_dict[key] = value.strftime('%Y-%m-%d') if value is not None else None
-                else:
-                    draw_dict[key] = value
-            last_draws_list.append(draw_dict)
+        # Last 10 draws for display, dates as strings for JSON serialization
+        last_draws_list = [dict(draw, date=draw['date'].strftime('%Y-%m-%d'))
+                           for draw in predictor.get_last_n_draws(10)]
         
         try:
             return render_template('stats.html', last_draws=last_draws_list)
@@ -1574,39 +1530,9 @@ def get_frequency_stats():
         if not predictor.conn or not predictor.cursor:
             return jsonify({'error': 'Database not available'}), 500
         
-        # Query to get frequency for each number
-        query = f"""
-        SELECT ball, COUNT(*) as freq FROM (
-            SELECT b1 as ball FROM ga_f5_draws WHERE date >= DATE_SUB(NOW(), INTERVAL {days} DAY)
-            UNION ALL SELECT b2 as ball FROM ga_f5_draws WHERE date >= DATE_SUB(NOW(), INTERVAL {days} DAY)
-            UNION ALL SELECT b3 as ball FROM ga_f5_draws WHERE date >= DATE_SUB(NOW(), INTERVAL {days} DAY)
-            UNION ALL SELECT b4 as ball FROM ga_f5_draws WHERE date >= DATE_SUB(NOW(), INTERVAL {days} DAY)
-            UNION ALL SELECT b5 as ball FROM ga_f5_draws WHERE date >= DATE_SUB(NOW(), INTERVAL {days} DAY)
-        ) as all_balls
-        GROUP BY ball
-        ORDER BY ball ASC
-        """
-        
-        predictor.cursor.execute(query)
-        results = predictor.cursor.fetchall()
-        
-        # Process results to handle Decimal values
-        frequency_data = []
-        for row in results:
-            ball = int(row['ball'])
-            freq = float(row['freq']) if isinstance(row['freq'], decimal.Decimal) else row['freq']
-            frequency_data.append({'ball': ball, 'frequency': freq})
-        
-        # Fill in missing balls with zero frequency
-        all_balls = set(range(1, 43))
-        existing_balls = set(item['ball'] for item in frequency_data)
-        missing_balls = all_balls - existing_balls
-        
-        for ball in missing_balls:
-            frequency_data.append({'ball': ball, 'frequency': 0})
-        
-        # Sort by ball number
-        frequency_data.sort(key=lambda x: x['ball'])
+        # Frequency for each number from the draw history's cumulative counts
+        frequency = predictor.historical_draws.frequency(days=days)
+        frequency_data = [{'ball': ball, 'frequency': int(frequency[ball])} for ball in range(1, 43)]
         
         return jsonify({'data': frequency_data})
     except Exception as e:
@@ -6,6 +6,7 @@ import os
 import io
 import csv
 from datetime import datetime
+from lot_middle_table import get_middle_table
 
 class Fantasy5Predictor:
     def __init__(self, scaffolding_file):
@@ -137,64 +138,17 @@ class Fantasy5Predictor:
         current_even = (b1 % 2 == 0) + (b5 % 2 == 0)
         even_needed = even_target - current_even
         
-        # We need to find b2, b3, b4 that:
-        # 1. Are in ascending order between b1 and b5
-        # 2. Sum to the remaining sum
-        # 3. Have the required number of even digits
-        
-        valid_combinations = []
+        # Exact matches (b2 < b3 < b4 strictly between b1 and b5 with the remaining
+        # sum and even count), or the closest ones, from the precomputed table
+        middles = get_middle_table().closest(b1, b5, remaining_sum, even_needed)
+        if middles:
+            b2, b3, b4 = random.choice(middles)
+            return [b1, b2, b3, b4, b5]
         
         # Define the range for middle values
         min_b2 = b1 + 1
         max_b4 = b5 - 1
         
-        # Brute force approach for small range
-        for b2 in range(min_b2, max_b4 - 1):
-            for b3 in range(b2 + 1, max_b4):
-                for b4 in range(b3 + 1, max_b4 + 1):
-                    # Check if they sum to the remaining sum
-                    if b2 + b3 + b4 == remaining_sum:
-                        # Check if they have the right number of even digits
-                        b2_even = b2 % 2 == 0
-                        b3_even = b3 % 2 == 0
-                        b4_even = b4 % 2 == 0
-                        middle_even_count = b2_even + b3_even + b4_even
-                        
-                        if middle_even_count == even_needed:
-                            valid_combinations.append([b1, b2, b3, b4, b5])
-        
-        if valid_combinations:
-            return random.choice(valid_combinations)
-        
-        # If we couldn't find an exact match, find the closest match
-        closest_combinations = []
-        min_diff = float('inf')
-        
-        for b2 in range(min_b2, max_b4 - 1):
-            for b3 in range(b2 + 1, max_b4):
-                for b4 in range(b3 + 1, max_b4 + 1):
-                    # Calculate how close this combination is to our targets
-                    sum_diff = abs((b2 + b3 + b4) - remaining_sum)
-                    
-                    b2_even = b2 % 2 == 0
-                    b3_even = b3 % 2 == 0
-                    b4_even = b4 % 2 == 0
-                    middle_even_count = b2_even + b3_even + b4_even
-                    even_diff = abs(middle_even_count - even_needed)
-                    
-                    # Combined difference (prioritize sum)
-                    total_diff = (sum_diff * 10) + even_diff
-                    
-                    # Update best match if this is better
-                    if total_diff < min_diff:
-                        min_diff = total_diff
-                        closest_combinations = [[b1, b2, b3, b4, b5]]
-                    elif total_diff == min_diff:
-                        closest_combinations.append([b1, b2, b3, b4, b5])
-        
-        if closest_combinations:
-            return random.choice(closest_combinations)
-        
         # Ultimate fallback if no valid combinations found
         # Just pick random middle values
         b2 = random.randint(min_b2, min(min_b2 + 5, max_b4 - 2))
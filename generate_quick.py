@@ -3,11 +3,19 @@
 Quick lottery generation with default settings
 """
 
+import argparse
 from datetime import datetime
 from lot_cover_1000 import GAFantasy5Generator
 from lot_cover_1000_summary import LottoDrawSummary
+from lot_manifest import seed_everything, write_manifest
+from lot_draw_io import NUMPY_AVAILABLE as COLUMNAR_AVAILABLE
 
 def main():
+    parser = argparse.ArgumentParser(description="Quick GA Fantasy 5 generation with default settings")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for parallel generation")
+    parser.add_argument("--seed", type=int, help="Random seed (reuses an identical earlier run when one exists)")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("GA FANTASY 5 LOTTERY GENERATOR - QUICK VERSION")
     print("=" * 60)
@@ -19,19 +27,34 @@ def main():
     # Create generator
     generator = GAFantasy5Generator()
     
-    # Generate draws
-    start_time = datetime.now()
-    draws = generator.generate_draws(count=count, include_scores=True)
-    end_time = datetime.now()
-    
-    # Create timestamped filenames
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    csv_filename = f"ga_fantasy5_{count}_draws_{timestamp}.csv"
-    json_filename = f"ga_fantasy5_{count}_draws_{timestamp}.json"
+    # Serve an identical seeded request from its earlier run
+    seed = seed_everything(args.seed)
+    manifest = generator.run_manifest(seed, count)
+    cached, draws = generator.load_cached_draws(manifest) if args.seed is not None else (None, None)
     
-    # Save files
-    generator.save_draws_csv(draws, csv_filename)
-    generator.save_draws_json(draws, json_filename)
+    start_time = datetime.now()
+    if cached:
+        csv_filename, json_filename = cached['outputs'][:2]
+        end_time = datetime.now()
+    else:
+        # Create timestamped filenames
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        csv_filename = f"ga_fantasy5_{count}_draws_{timestamp}.csv"
+        json_filename = f"ga_fantasy5_{count}_draws_{timestamp}.json"
+        
+        # Columnar copy for fast, memory-mapped analysis, written batch by batch during generation
+        stream_files = [f"ga_fantasy5_{count}_draws_{timestamp}.npz"] if COLUMNAR_AVAILABLE else []
+        
+        # Generate draws
+        draws = generator.generate_draws(count=count, include_scores=True, workers=args.workers, seed=seed,
+                                         output_files=stream_files)
+        end_time = datetime.now()
+        
+        # Save files and the run manifest
+        generator.save_draws_csv(draws, csv_filename)
+        generator.save_draws_json(draws, json_filename)
+        manifest['outputs'] = [csv_filename, json_filename] + stream_files
+        write_manifest(manifest, json_filename)
     
     # Display results
     generation_time = (end_time - start_time).total_seconds()
@@ -39,6 +62,7 @@ def main():
     print(f"\nGENERATION COMPLETE!")
     print(f"Time taken: {generation_time:.2f} seconds")
     print(f"Total draws: {len(draws)}")
+    print(f"Seed: {seed}")
     print(f"CSV file: {csv_filename}")
     print(f"JSON file: {json_filename}")
     
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - Historical Backtest
+Replays every draw in ga_f5_draws through the filter rules and the scoring
+model, each draw seeing only the draws before it. The rolling state
+(previous-draw masks, 30-day ball frequencies, 365-day average sum) comes
+from cumulative sums over the date-ordered history, so the whole history is
+evaluated in a few array passes after a single query.
+
+The predictor model scores each winner against that rolling state, as
+GeorgiaFantasy5Predictor would have on the day. The cover model uses the
+fixed inputs GAFantasy5Generator scores with (every ball at
+COVER_FREQUENCY, DEFAULT_AVG_SUM), so its scores match the generator's.
+"""
+
+import argparse
+import csv
+import json
+import time
+import numpy as np
+
+from lot_combo_mask import combo_masks, popcount
+from lot_draw_history import day_date, day_number
+from lot_filter_batch import DUP_LIMITS, filter_rules, get_filter_settings
+from lot_scoring import (ScoringContext, score_batch, AVG_SUM_DAYS, COVER_FREQUENCY,
+                         DEFAULT_AVG_SUM, FREQUENCY_DAYS, NUM_MAX)
+
+try:
+    import mysql.connector
+    MYSQL_AVAILABLE = True
+except ImportError:
+    MYSQL_AVAILABLE = False
+
+# Database configuration (matches the generators)
+DEFAULT_DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '',
+    'database': 'ga_f5_lotto'
+}
+
+# Fallback history export (Date, b1..b5 columns)
+HISTORY_CSV = "data/georgia_fantasy5_data.csv"
+
+# Percentiles reported for the winners' scores
+SCORE_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def load_history(db_config=None, csv_path=HISTORY_CSV):
+    """
+    Load every historical draw in date order
+
+    Reads date and b1-b5 only, from MySQL or else the CSV export.
+
+    Returns:
+    tuple: (days, balls) - (N,) int32 day numbers and (N, 5) sorted uint8 balls
+    """
+    rows = []
+    if MYSQL_AVAILABLE:
+        try:
+            conn = mysql.connector.connect(**(db_config or DEFAULT_DB_CONFIG))
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SELECT date, b1, b2, b3, b4, b5 FROM ga_f5_draws ORDER BY date")
+            rows = [(row['date'], [row['b1'], row['b2'], row['b3'], row['b4'], row['b5']])
+                    for row in cursor.fetchall()]
+            cursor.close()
+            conn.close()
+        except Exception as e:
+            print(f"Error loading draws from database: {e}")
+
+    if not rows:
+        try:
+            with open(csv_path, 'r') as f:
+                rows = [(row['Date'], [row['b1'], row['b2'], row['b3'], row['b4'], row['b5']])
+                        for row in csv.DictReader(f)]
+        except (OSError, KeyError) as e:
+            print(f"Error loading draws from {csv_path}: {e}")
+
+    days = np.array([day_number(draw_date) for draw_date, _ in rows], dtype=np.int32)
+    balls = np.sort(np.array([[int(num) for num in nums] for _, nums in rows], dtype=np.uint8).reshape(-1, 5), axis=1)
+    order = np.argsort(days, kind='stable')
+    return days[order], balls[order]
+
+
+def rolling_duplicates(balls, depth=len(DUP_LIMITS)):
+    """
+    Numbers each draw shares with its previous 1..depth draws combined
+
+    Returns:
+    np.ndarray: (N, depth) uint8, column i = shared with the last i+1 draws (0 where no history)
+    """
+    masks = combo_masks(balls)
+    counts = np.zeros((len(balls), depth), dtype=np.uint8)
+    cumulative = np.zeros(len(balls), dtype=np.uint64)
+    for i in range(depth):
+        # Mask of the draw i+1 places back, OR-ed into the running union
+        cumulative[i + 1:] |= masks[:len(masks) - i - 1]
+        counts[:, i] = popcount(masks & cumulative)
+    return counts
+
+
+def _window_starts(days, window):
+    """
+    Index of the first draw within window days before each draw, and of the draw itself
+
+    The window matches DrawHistory.window_start on the draw's date: the first
+    whole day counted is day - window + 1, and the draw's own day is excluded.
+    """
+    return np.searchsorted(days, days - window + 1, side='left'), np.searchsorted(days, days, side='left')
+
+
+def rolling_frequency(days, balls, window=FREQUENCY_DAYS):
+    """
+    Ball frequencies over the window days before each draw
+
+    Returns:
+    np.ndarray: (N, 43) int32, row i = appearances of each ball before draw i
+    """
+    hits = np.zeros((len(balls) + 1, NUM_MAX + 1), dtype=np.int32)
+    hits[np.arange(1, len(balls) + 1)[:, None], balls] = 1
+    cumulative = np.cumsum(hits, axis=0, out=hits)
+    start, stop = _window_starts(days, window)
+    return cumulative[stop] - cumulative[start]
+
+
+def rolling_avg_sum(days, balls, window=AVG_SUM_DAYS):
+    """
+    Average winning sum over the window days before each draw
+
+    Returns:
+    np.ndarray: (N,) float64 (DEFAULT_AVG_SUM where the window is empty)
+    """
+    cumulative = np.concatenate([[0], np.cumsum(balls.sum(axis=1, dtype=np.int64))])
+    start, stop = _window_starts(days, window)
+    count = stop - start
+    totals = cumulative[stop] - cumulative[start]
+    return np.where(count > 0, totals / np.maximum(count, 1), DEFAULT_AVG_SUM)
+
+
+class Backtest:
+    """Rolling per-draw state for the whole history, built once"""
+
+    def __init__(self, days, balls):
+        """
+        Parameters:
+        days (np.ndarray): (N,) day numbers in ascending order
+        balls (np.ndarray): (N, 5) sorted balls
+        """
+        self.days = np.asarray(days, dtype=np.int32)
+        self.balls = np.asarray(balls, dtype=np.uint8)
+        self.dups = rolling_duplicates(self.balls)
+        self.frequency = rolling_frequency(self.days, self.balls)
+        self.avg_sum = rolling_avg_sum(self.days, self.balls)
+
+    def __len__(self):
+        return len(self.balls)
+
+    def date_range(self):
+        """ISO dates of the first and last draw (None when empty)"""
+        if not len(self):
+            return None, None
+        return day_date(self.days[0]).isoformat(), day_date(self.days[-1]).isoformat()
+
+    def restrict(self, first_day):
+        """Keep only draws from first_day on (their rolling state still reflects the earlier history)"""
+        keep = self.days >= first_day
+        for attr in ('days', 'balls', 'dups', 'frequency', 'avg_sum'):
+            setattr(self, attr, getattr(self, attr)[keep])
+
+    def scores(self, model='cover', rank_limits=None, rank_counts=None, col1_data=None):
+        """Score of each winner against the history before its date (see the module docstring for 'cover')"""
+        if model == 'cover':
+            context = ScoringContext([COVER_FREQUENCY] * (NUM_MAX + 1), DEFAULT_AVG_SUM, None,
+                                     rank_limits, rank_counts)
+        else:
+            context = ScoringContext(self.frequency, self.avg_sum, col1_data, rank_limits, rank_counts)
+        scores, _ = score_batch(self.balls, context, model=model)
+        return scores
+
+    def rule_masks(self, settings=None):
+        """(rule name, description, pass mask over the winners) in pipeline order"""
+        return filter_rules(self.balls, settings, self.dups)
+
+    def run(self, settings=None, model='cover', rank_limits=None, rank_counts=None, col1_data=None):
+        """
+        Pass rates of every filter rule and score percentiles of the winners
+
+        Returns:
+        dict: draws, date range, all_rules_pass_rate, score_percentiles and one row
+              per rule (pass rate and median winner score when passing / failing)
+        """
+        start = time.perf_counter()
+        settings = get_filter_settings(settings)
+        scores = self.scores(model, rank_limits, rank_counts, col1_data)
+        passed_all = np.ones(len(self), dtype=bool)
+        rules = []
+
+        for name, description, passed in self.rule_masks(settings):
+            passed_all &= passed
+            rules.append({
+                'rule': name,
+                'description': description,
+                'passed': int(np.count_nonzero(passed)),
+                'pass_rate': _rate(np.count_nonzero(passed), len(self)),
+                'median_score_passed': _median(scores[passed]),
+                'median_score_failed': _median(scores[~passed])
+            })
+
+        first_date, last_date = self.date_range()
+        return {
+            'draws': len(self),
+            'first_date': first_date,
+            'last_date': last_date,
+            'settings': settings,
+            'model': model,
+            'passed_all': int(np.count_nonzero(passed_all)),
+            'all_rules_pass_rate': _rate(np.count_nonzero(passed_all), len(self)),
+            'score_percentiles': {str(p): round(float(v), 2) for p, v in
+                                  zip(SCORE_PERCENTILES, np.percentile(scores, SCORE_PERCENTILES))} if len(self) else {},
+            'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+            'rules': rules
+        }
+
+
+def _rate(count, total):
+    return round(int(count) / total * 100, 2) if total else 0.0
+
+
+def _median(values):
+    return round(float(np.median(values)), 2) if len(values) else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GA Fantasy 5 Historical Backtest")
+    parser.add_argument("--since", help="Only report draws on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--model", choices=['cover', 'predictor'], default='cover', help="Scoring model")
+    parser.add_argument("--max-seq2", type=int, default=1, help="Max sequential pairs")
+    parser.add_argument("--max-seq3", type=int, default=0, help="Max sequential triplets")
+    parser.add_argument("--max-mod-tot", type=int, default=1, help="Max modular total")
+    parser.add_argument("--sum-min", type=int, default=70, help="Sum minimum")
+    parser.add_argument("--sum-max", type=int, default=139, help="Sum maximum")
+    parser.add_argument("--json", help="Also write the report to this file")
+
+    args = parser.parse_args()
+
+    load_start = time.perf_counter()
+    days, balls = load_history()
+    backtest = Backtest(days, balls)
+    if args.since:
+        backtest.restrict(day_number(args.since))
+    print(f"Loaded {len(days)} draws and built rolling state in {time.perf_counter() - load_start:.2f}s")
+
+    if not len(backtest):
+        print("No draws to backtest")
+    else:
+        if args.model == 'predictor':
+            # Rank data and col1 lookup as the predictor loads them
+            from app import GeorgiaFantasy5Predictor, db_config
+            scorer = GeorgiaFantasy5Predictor(db_config)
+            col1_data = getattr(scorer, 'col1_data', None)
+        else:
+            from lot_cover_1000 import GAFantasy5Generator
+            scorer = GAFantasy5Generator()
+            col1_data = None
+        settings = {
+            'max_seq2': args.max_seq2,
+            'max_seq3': args.max_seq3,
+            'max_mod_tot': args.max_mod_tot,
+            'sum_range': (args.sum_min, args.sum_max)
+        }
+        report = backtest.run(settings, args.model, getattr(scorer, 'rank_limits', None),
+                              getattr(scorer, 'rank_counts', None), col1_data)
+
+        print(f"\nBacktest of {report['draws']} draws ({report['first_date']} to {report['last_date']}) "
+              f"in {report['elapsed_ms']} ms")
+        print(f"{'Rule':<10} {'Setting':<34} {'Pass %':>7} {'Median score (pass/fail)':>26}")
+        for rule in report['rules']:
+            medians = f"{rule['median_score_passed']} / {rule['median_score_failed']}"
+            print(f"{rule['rule']:<10} {rule['description']:<34} {rule['pass_rate']:>7} {medians:>26}")
+        print(f"\nWinners passing every rule: {report['passed_all']} ({report['all_rules_pass_rate']}%)")
+        print("Winner score percentiles: " +
+              ", ".join(f"p{p}={v}" for p, v in report['score_percentiles'].items()))
+
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"Report saved to {args.json}")
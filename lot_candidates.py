@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - In-Memory Candidate Engine
+Answers the combo_5_42 candidate queries of the 1K cover build (sum/even/odd,
+seq2/seq3, mod_tot/mod_x, decade profile, b1) against the memory-mapped
+combination table and returns combination id arrays, instead of running one
+INSERT ... SELECT into a MySQL temp table per predicate pair. The cover build
+then copies the candidates' combo_5_42 rows into its temp_sumeo_draw_* tables
+in a few batched INSERTs.
+"""
+
+import argparse
+
+import numpy as np
+
+from lot_combo_table import load_combo_table
+from lot_sumeo_index import SumeoIndex, load_sumeo_index
+
+# Structural limits of the cover build's candidate query
+# (seq2 <= 1 AND seq3 = 0 AND mod_tot <= 1 AND mod_x = 0)
+CANDIDATE_LIMITS = {
+    'max_seq2': 1,
+    'max_seq3': 0,
+    'max_mod_tot': 1,
+    'max_mod_x': 0
+}
+
+def decade_key(d0, d1, d2, d3, d4):
+    """Single integer for a decade profile (each count is 0-5)"""
+    return (((d0 * 6 + d1) * 6 + d2) * 6 + d3) * 6 + d4
+
+
+class CandidateEngine:
+    """Candidate id queries over the precomputed combination table"""
+
+    def __init__(self, table=None, **limits):
+        """
+        Parameters:
+        table (ComboTable): Combination table (the process-wide table by default)
+        limits: Overrides for CANDIDATE_LIMITS
+        """
+        self.table = table if table is not None else load_combo_table()
+        self.index = SumeoIndex(table) if table is not None else load_sumeo_index()
+        self.limits = dict(CANDIDATE_LIMITS, **limits)
+        self._sumeo_cache = {}
+
+    def sumeo_ids(self, sum_val, even, odd):
+        """
+        Ids with the given sum and even/odd split that pass the structural limits
+
+        Returns:
+        np.ndarray: Ascending uint32 combination ids
+        """
+        key = (sum_val, even, odd)
+        if key not in self._sumeo_cache:
+            # The sumeo is one slice of the index; only the structural limits need checking
+            ids = self.index.ids_for(sum_val, even, odd)
+            table = self.table
+            mask = table['seq2'][ids] <= self.limits['max_seq2']
+            mask &= table['seq3'][ids] <= self.limits['max_seq3']
+            mask &= table['mod_tot'][ids] <= self.limits['max_mod_tot']
+            mask &= table['mod_x'][ids] <= self.limits['max_mod_x']
+            self._sumeo_cache[key] = ids[mask]
+        return self._sumeo_cache[key]
+
+    def candidate_ids(self, sum_val, even, odd, decade_profiles=None, col1_values=None):
+        """
+        Union of the candidate query over every (decade profile, b1) pair
+
+        Parameters:
+        sum_val (int): Sum of the five balls
+        even (int): Even count
+        odd (int): Odd count
+        decade_profiles (list): (d0, d1, d2, d3, d4) tuples (None = any profile)
+        col1_values (list): Allowed b1 values (None = any value)
+
+        Returns:
+        np.ndarray: Ascending uint32 combination ids
+        """
+        ids = self.sumeo_ids(sum_val, even, odd)
+        if not len(ids):
+            return ids
+
+        keep = np.ones(len(ids), dtype=bool)
+        if decade_profiles is not None:
+            keys = decade_key(*(self.table[f'd{d}'][ids].astype(np.int32) for d in range(5)))
+            wanted = np.array([decade_key(*(int(v) for v in profile)) for profile in decade_profiles],
+                              dtype=np.int32)
+            keep &= np.isin(keys, wanted)
+        if col1_values is not None:
+            keep &= np.isin(self.table['b1'][ids], np.array([int(v) for v in col1_values], dtype=np.int32))
+        return ids[keep]
+
+    def combinations(self, ids):
+        """(N, 5) ball array for an id array"""
+        return np.asarray(self.table.combos[ids])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GA Fantasy 5 Cover Candidate Engine")
+    parser.add_argument("sum", type=int, help="Sum of the five balls")
+    parser.add_argument("even", type=int, help="Even count")
+    parser.add_argument("odd", type=int, help="Odd count")
+    parser.add_argument("--decades", nargs="*", help="Decade profiles as d0,d1,d2,d3,d4")
+    parser.add_argument("--col1", nargs="*", type=int, help="Allowed col1 (b1) values")
+    parser.add_argument("--show", type=int, default=10, help="Number of candidates to print")
+
+    args = parser.parse_args()
+
+    engine = CandidateEngine()
+    profiles = [tuple(int(v) for v in text.split(',')) for text in args.decades] if args.decades else None
+    ids = engine.candidate_ids(args.sum, args.even, args.odd, profiles, args.col1)
+    print(f"{len(ids)} candidates for sum={args.sum}, even={args.even}, odd={args.odd}")
+    for combo in engine.combinations(ids[:args.show]):
+        print(' '.join(f"{int(num):2d}" for num in combo))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - Combination Bitmasks
+Represents combinations and historical draws as 64-bit masks (bit i = ball i)
+so duplicate checks against previous draws become one AND plus a popcount.
+"""
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def combo_mask(combination):
+    """Bitmask for a single combination"""
+    mask = 0
+    for num in combination:
+        mask |= 1 << int(num)
+    return mask
+
+
+def popcount_int(mask):
+    """Number of set bits in a Python int"""
+    return bin(mask).count('1')
+
+
+def combo_masks(combos):
+    """Vectorized bitmasks for an (N, k) array of combinations -> (N,) uint64"""
+    shifts = np.asarray(combos, dtype=np.uint64)
+    # Balls within a combination are distinct, so summing the bits is the same as OR-ing them
+    return (np.uint64(1) << shifts).sum(axis=1, dtype=np.uint64)
+
+
+def popcount(masks):
+    """Vectorized popcount over a uint64 array"""
+    masks = np.asarray(masks, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(masks).astype(np.uint8)
+
+    # SWAR fallback for NumPy < 2.0
+    m1, m2, m4 = np.uint64(0x5555555555555555), np.uint64(0x3333333333333333), np.uint64(0x0F0F0F0F0F0F0F0F)
+    h01 = np.uint64(0x0101010101010101)
+    v = masks - ((masks >> np.uint64(1)) & m1)
+    v = (v & m2) + ((v >> np.uint64(2)) & m2)
+    v = (v + (v >> np.uint64(4))) & m4
+    return ((v * h01) >> np.uint64(56)).astype(np.uint8)
+
+
+class RecentDrawMasks:
+    """
+    Snapshot of the most recent draws as bitmasks
+
+    Build once per history snapshot (e.g. when a predictor loads its draws);
+    every duplicate check afterwards is mask arithmetic only.
+    """
+
+    def __init__(self, recent_draws, depth=10):
+        """
+        Parameters:
+        recent_draws (list): Previous draws, most recent first
+        depth (int): Number of draws to keep
+        """
+        recent_draws = list(recent_draws)[:depth]
+        self.depth = depth
+        self.draw_masks = [combo_mask(draw) for draw in recent_draws]
+
+        # cumulative_masks[i] = every number drawn in the last i+1 draws
+        self.cumulative_masks = []
+        running = 0
+        for mask in self.draw_masks:
+            running |= mask
+            self.cumulative_masks.append(running)
+
+    def __len__(self):
+        return len(self.draw_masks)
+
+    def duplicate_counts(self, combination):
+        """
+        Individual and cumulative duplicates for one combination
+
+        Returns:
+        tuple: (dup_counts, cumulative_dups), one entry per stored draw
+        """
+        mask = combo_mask(combination)
+        dup_counts = [popcount_int(mask & draw_mask) for draw_mask in self.draw_masks]
+        cumulative_dups = [popcount_int(mask & cumulative) for cumulative in self.cumulative_masks]
+        return dup_counts, cumulative_dups
+
+    def cumulative_duplicates_batch(self, masks, depth):
+        """
+        Vectorized cumulative duplicates for an array of combination masks
+
+        Returns:
+        np.ndarray: (N, min(depth, len(self))) uint8, column i = numbers shared with the last i+1 draws
+        """
+        depth = min(depth, len(self))
+        counts = np.empty((len(masks), depth), dtype=np.uint8)
+        for i in range(depth):
+            counts[:, i] = popcount(masks & np.uint64(self.cumulative_masks[i]))
+        return counts
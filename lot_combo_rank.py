@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - Combination Rank/Unrank Codec
+Maps each k-of-n combination to a dense colexicographic id in [0, C(n,k)) so
+combinations can travel as 32-bit integers (and be deduplicated with bitsets)
+instead of Python lists and tuples.
+
+The colex rank of a sorted combination c1 < c2 < ... < ck (balls numbered
+from 1) is sum(C(c_i - 1, i)) for i = 1..k.
+"""
+
+from math import comb
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# GA Fantasy 5 game shape
+NUM_MAX = 42
+NUMS_PER_DRAW = 5
+
+
+def combination_count(num_max=NUM_MAX, nums_per_draw=NUMS_PER_DRAW):
+    """Total number of combinations (size of the id space)"""
+    return comb(num_max, nums_per_draw)
+
+
+def rank_combination(combination):
+    """
+    Get the colex id of a single combination
+
+    Parameters:
+    combination (list): Ball numbers (any order, no repeats)
+
+    Returns:
+    int: Dense id in [0, C(n, k))
+    """
+    return sum(comb(num - 1, i) for i, num in enumerate(sorted(combination), 1))
+
+
+def unrank_combination(rank, nums_per_draw=NUMS_PER_DRAW, num_max=NUM_MAX):
+    """
+    Get the combination for a colex id
+
+    Parameters:
+    rank (int): Id in [0, C(num_max, nums_per_draw))
+    nums_per_draw (int): Balls per combination
+    num_max (int): Highest ball number
+
+    Returns:
+    list: Sorted ball numbers
+    """
+    combination = []
+    top = num_max
+    for i in range(nums_per_draw, 0, -1):
+        # Largest ball whose C(ball - 1, i) still fits in the remaining rank
+        while comb(top - 1, i) > rank:
+            top -= 1
+        rank -= comb(top - 1, i)
+        combination.append(top)
+        top -= 1
+    return combination[::-1]
+
+
+def _binomial_table(num_max, nums_per_draw):
+    """(num_max + 1, nums_per_draw + 1) table of C(a, i) for vectorized lookups"""
+    return np.array([[comb(a, i) for i in range(nums_per_draw + 1)] for a in range(num_max + 1)],
+                    dtype=np.int64)
+
+
+def encode(combos, num_max=NUM_MAX):
+    """
+    Vectorized rank: (N, k) array of combinations -> (N,) uint32 ids
+
+    Rows may be in any order; they are sorted before ranking.
+    """
+    combos = np.sort(np.asarray(combos, dtype=np.intp), axis=1)
+    nums_per_draw = combos.shape[1]
+    binomials = _binomial_table(num_max, nums_per_draw)
+
+    ids = np.zeros(combos.shape[0], dtype=np.int64)
+    for i in range(nums_per_draw):
+        ids += binomials[combos[:, i] - 1, i + 1]
+    return ids.astype(np.uint32)
+
+
+def decode(ids, nums_per_draw=NUMS_PER_DRAW, num_max=NUM_MAX):
+    """Vectorized unrank: (N,) ids -> (N, k) uint8 array of sorted combinations"""
+    remaining = np.asarray(ids, dtype=np.int64).copy()
+    binomials = _binomial_table(num_max, nums_per_draw)
+    combos = np.empty((remaining.shape[0], nums_per_draw), dtype=np.uint8)
+
+    for i in range(nums_per_draw, 0, -1):
+        # C(a, i) is non-decreasing in a, so the largest a with C(a, i) <= rank is a search
+        a = np.searchsorted(binomials[:, i], remaining, side='right') - 1
+        remaining -= binomials[a, i]
+        combos[:, i - 1] = a + 1
+
+    return combos
+
+
+class ComboIdSet:
+    """Bitset over the combination id space (one bit per combination)"""
+
+    def __init__(self, num_max=NUM_MAX, nums_per_draw=NUMS_PER_DRAW):
+        self.size = combination_count(num_max, nums_per_draw)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, combo_id):
+        return bool(self.bits[combo_id >> 3] & (1 << (combo_id & 7)))
+
+    def add(self, combo_id):
+        """Add an id; returns True if it was not already present"""
+        byte, bit = combo_id >> 3, 1 << (combo_id & 7)
+        if self.bits[byte] & bit:
+            return False
+        self.bits[byte] |= bit
+        self.count += 1
+        return True
+
+    def contains_many(self, ids):
+        """Vectorized membership test for an array of ids"""
+        ids = np.asarray(ids, dtype=np.int64)
+        bits = np.frombuffer(self.bits, dtype=np.uint8)
+        return ((bits[ids >> 3] >> (ids & 7)) & 1).astype(bool)
+
+    def add_many(self, ids):
+        """Add an array of ids in one call"""
+        ids = np.unique(np.asarray(ids, dtype=np.int64))
+        ids = ids[~self.contains_many(ids)]
+        bits = np.frombuffer(self.bits, dtype=np.uint8)
+        np.bitwise_or.at(bits, ids >> 3, (1 << (ids & 7)).astype(np.uint8))
+        self.count += len(ids)
+
+    def to_array(self):
+        """All ids in the set as a sorted uint32 array"""
+        bits = np.unpackbits(np.frombuffer(self.bits, dtype=np.uint8), bitorder='little')
+        return np.flatnonzero(bits[:self.size]).astype(np.uint32)
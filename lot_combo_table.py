@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - Precomputed Combination Table
+Enumerates all C(42,5) = 850,668 combinations once into a compact columnar
+file (the Python-side equivalent of the MySQL combo_5_42 table) that every
+process can memory-map at startup instead of recomputing filter statistics
+one combination at a time.
+
+Rows are stored in colexicographic order, so a row index is the combination
+id produced by lot_combo_rank.encode().
+"""
+
+import os
+import argparse
+from math import comb
+
+import numpy as np
+
+from lot_combo_rank import encode, decode
+from lot_combo_mask import combo_masks
+
+# GA Fantasy 5 game shape
+NUM_MAX = 42
+NUMS_PER_DRAW = 5
+
+# On-disk location of the table (built on first use if missing)
+COMBO_TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                'data', f'combo_{NUMS_PER_DRAW}_{NUM_MAX}.npy')
+
+# Column layout - one uint8 row per column, so each column is contiguous
+COMBO_COLUMNS = [
+    'b1', 'b2', 'b3', 'b4', 'b5',
+    'sum', 'even', 'seq2', 'seq3', 'mod_tot', 'mod_x',
+    'd0', 'd1', 'd2', 'd3', 'd4'
+]
+COLUMN_INDEX = {name: i for i, name in enumerate(COMBO_COLUMNS)}
+
+
+def enumerate_combinations(num_max=NUM_MAX, nums_per_draw=NUMS_PER_DRAW):
+    """Return every sorted combination as an (N, k) uint8 array, in colex (id) order"""
+    total = comb(num_max, nums_per_draw)
+    return decode(np.arange(total, dtype=np.uint32), nums_per_draw, num_max)
+
+
+def compute_combo_features(combos):
+    """
+    Compute the filter statistics for an array of combinations
+
+    Parameters:
+    combos (array-like): (N, 5) array of ball numbers (any order)
+
+    Returns:
+    dict: Column name -> (N,) uint8 array for every non-ball column in COMBO_COLUMNS
+    """
+    combos = np.sort(np.asarray(combos, dtype=np.uint8), axis=1)
+
+    # Sequential pairs and triplets (matches count_sequential_numbers)
+    gaps = np.diff(combos.astype(np.int16), axis=1) == 1
+    seq2 = gaps.sum(axis=1, dtype=np.uint8)
+    seq3 = (gaps[:, :-1] & gaps[:, 1:]).sum(axis=1, dtype=np.uint8)
+
+    # Modular totals (numbers sharing a last digit)
+    mods = np.sort(combos % 10, axis=1)
+    distinct = 1 + (np.diff(mods, axis=1) != 0).sum(axis=1)
+    mod_tot = (combos.shape[1] - distinct).astype(np.uint8)
+    # With 5 balls at most one remainder can appear 3+ times
+    mod_x = (mods[:, :-2] == mods[:, 2:]).any(axis=1).astype(np.uint8)
+
+    features = {
+        'sum': combos.sum(axis=1, dtype=np.uint16).astype(np.uint8),
+        'even': (combos % 2 == 0).sum(axis=1, dtype=np.uint8),
+        'seq2': seq2,
+        'seq3': seq3,
+        'mod_tot': mod_tot,
+        'mod_x': mod_x,
+    }
+
+    # Decade distribution (1-9, 10-19, 20-29, 30-39, 40-42)
+    decades = combos // 10
+    for d in range(5):
+        features[f'd{d}'] = (decades == d).sum(axis=1, dtype=np.uint8)
+
+    return features
+
+
+def build_combo_table(path=COMBO_TABLE_FILE):
+    """Enumerate the full combination space and write the columnar table"""
+    combos = enumerate_combinations()
+    features = compute_combo_features(combos)
+
+    data = np.empty((len(COMBO_COLUMNS), combos.shape[0]), dtype=np.uint8)
+    data[:NUMS_PER_DRAW] = combos.T
+    for name, values in features.items():
+        data[COLUMN_INDEX[name]] = values
+
+    # Write to a temp file and swap it in so concurrent readers never map a partial table
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        np.save(f, data)
+    os.replace(temp_path, path)
+
+    print(f"Built combination table with {data.shape[1]} rows to {path}")
+    return path
+
+
+class ComboTable:
+    """Read-only, memory-mapped view of the precomputed combination table"""
+
+    def __init__(self, path=COMBO_TABLE_FILE):
+        self.path = path
+        self.data = np.load(path, mmap_mode='r')
+        self._masks = None
+        if self.data.shape[0] != len(COMBO_COLUMNS):
+            raise ValueError(f"Unexpected combination table layout in {path}: {self.data.shape}")
+        # Tables built before rows were stored in id order must be rebuilt
+        sample = np.arange(min(len(self), 64))
+        if not np.array_equal(encode(self.combos[sample]), sample):
+            raise ValueError(f"Combination table {path} is not in id order")
+
+    def __len__(self):
+        return self.data.shape[1]
+
+    def __getitem__(self, name):
+        """Return a single column (zero-copy) by name"""
+        return self.data[COLUMN_INDEX[name]]
+
+    @property
+    def combos(self):
+        """(N, 5) view of the ball columns"""
+        return self.data[:NUMS_PER_DRAW].T
+
+    @property
+    def masks(self):
+        """(N,) uint64 bitmask per combination (bit i = ball i), computed once per process"""
+        if self._masks is None:
+            self._masks = combo_masks(self.combos)
+        return self._masks
+
+
+_combo_table = None
+
+
+def load_combo_table(path=COMBO_TABLE_FILE, build_if_missing=True):
+    """
+    Get the process-wide combination table, building it on first use
+
+    Parameters:
+    path (str): Location of the table file
+    build_if_missing (bool): Build the table if the file does not exist
+
+    Returns:
+    ComboTable: Memory-mapped table shared by every caller in the process
+    """
+    global _combo_table
+
+    if _combo_table is not None and _combo_table.path == path:
+        return _combo_table
+
+    if not os.path.exists(path):
+        if not build_if_missing:
+            raise FileNotFoundError(f"Combination table not found: {path}")
+        build_combo_table(path)
+
+    try:
+        _combo_table = ComboTable(path)
+    except ValueError as e:
+        if not build_if_missing:
+            raise
+        print(f"{e} - rebuilding")
+        build_combo_table(path)
+        _combo_table = ComboTable(path)
+    return _combo_table
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GA Fantasy 5 Combination Table Builder")
+    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
+
+    build_parser = subparsers.add_parser("build", help="Build (or rebuild) the combination table")
+    build_parser.add_argument("--path", default=COMBO_TABLE_FILE, help="Output file")
+
+    info_parser = subparsers.add_parser("info", help="Show combination table details")
+    info_parser.add_argument("--path", default=COMBO_TABLE_FILE, help="Table file")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_combo_table(args.path)
+    elif args.command == "info":
+        table = load_combo_table(args.path, build_if_missing=False)
+        print(f"Table: {table.path}")
+        print(f"Rows: {len(table)}")
+        print(f"Columns: {', '.join(COMBO_COLUMNS)}")
+        print(f"Sum range: {table['sum'].min()} - {table['sum'].max()}")
+    else:
+        parser.print_help()
@@ -11,8 +11,20 @@ from datetime import datetime
 import csv
 import json
 import decimal
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
+from lot_combo_rank import rank_combination, decode, ComboIdSet
+from lot_combo_mask import RecentDrawMasks
+from lot_scoring import ScoringContext, COVER_FREQUENCY, DEFAULT_AVG_SUM
+from lot_draw_io import DRAW_COLUMN_NAMES, open_draw_writer
+from lot_manifest import build_manifest, find_cached_run, snapshot_id, seed_everything, write_manifest
 try:
     import numpy as np
+    from lot_filter_batch import filter_batch, filter_pass_rates
+    from lot_scoring import score_batch
+    from lot_combo_table import load_combo_table
+    from lot_sampler import get_filtered_sampler, InsufficientCombinationsError
+    from lot_coverage import CoverageOptimizer
     NUMPY_AVAILABLE = True
 except ImportError:
     NUMPY_AVAILABLE = False
@@ -25,6 +37,24 @@ except ImportError:
     MYSQL_AVAILABLE = False
     print("MySQL connector not available - using default rank data")
 
+# Draws requested from each shard in parallel mode. Fixed (never derived from
+# the worker count) so a given seed always produces the same draws.
+PARALLEL_SHARD_SIZE = 500
+
+# Generator copy used by each worker process (set by _init_worker)
+_worker_generator = None
+
+
+def _init_worker(generator):
+    """Process pool initializer - keep one generator per worker"""
+    global _worker_generator
+    _worker_generator = generator
+
+
+def _run_shard(task):
+    """Process pool entry point for one shard"""
+    return _worker_generator.generate_shard(*task)
+
 
 class GAFantasy5Generator:
     """Generate GA Fantasy 5 lottery draws with comprehensive filtering"""
@@ -38,6 +68,11 @@ class GAFantasy5Generator:
         self.max_seq3 = 0  # Max sequential triplets
         self.max_mod_tot = 1  # Max modular total
         self.sum_range = (70, 139)  # Sum range limits
+        self.dup_limits = (1, 2, 3)  # Max numbers shared with the last 1, 2 and 3 draws
+        
+        # Size of the filtered space from the last enumeration (None until known)
+        self.filtered_space_size = None
+        self.coverage_report = None  # Set by coverage runs (see lot_coverage)
         
         # Database configuration
         self.db_config = {
@@ -51,8 +86,14 @@ class GAFantasy5Generator:
         
         # Load historical data and rank analysis data
         self.recent_draws = self.load_recent_draws()
+        self.recent_masks = RecentDrawMasks(self.recent_draws)  # Bitmask snapshot for duplicate checks
         self.rank_limits = self.load_rank_limits()
         self.rank_counts = self.load_rank_counts()
+        
+        # Scoring inputs (no historical frequency data here: every number defaults to 5, average sum to 100)
+        self.scoring_context = ScoringContext(frequency=[COVER_FREQUENCY] * (self.num_range[1] + 1),
+                                              avg_sum=DEFAULT_AVG_SUM,
+                                              rank_limits=self.rank_limits, rank_counts=self.rank_counts)
         print(f"Loaded {len(self.recent_draws)} recent draws for duplicate filtering")
         print(f"Loaded rank limits: {self.rank_limits}")
         print(f"Loaded rank counts: {len(self.rank_counts)} values")
@@ -174,37 +215,34 @@ class GAFantasy5Generator:
     
     def calculate_duplicates_from_previous(self, combination):
         """Calculate duplicates from previous draws with filtering rules"""
-        if not self.recent_draws:
-            return [], []
-            
-        dup_counts = []
-        cumulative_dups = []
-        cumulative_numbers = set()
-        
-        # Check each recent draw
-        for i, recent_draw in enumerate(self.recent_draws):
-            # Count duplicates with this specific draw
-            duplicates = len(set(combination) & set(recent_draw))
-            dup_counts.append(duplicates)
-            
-            # Add numbers to cumulative set
-            cumulative_numbers.update(recent_draw)
-            
-            # Count cumulative duplicates up to this point
-            cumulative_duplicates = len(set(combination) & cumulative_numbers)
-            cumulative_dups.append(cumulative_duplicates)
-            
-            # Only check first 3 draws for filtering
-            if i >= 2:
-                break
-        
-        return dup_counts, cumulative_dups
+        # One AND plus popcount per draw against the precomputed masks;
+        # only the first 3 draws are used for filtering
+        dup_counts, cumulative_dups = self.recent_masks.duplicate_counts(combination)
+        return dup_counts[:3], cumulative_dups[:3]
+    
+    def get_filter_settings(self):
+        """Current filter settings in the form filter_batch expects"""
+        return {
+            'max_seq2': self.max_seq2,
+            'max_seq3': self.max_seq3,
+            'max_mod_tot': self.max_mod_tot,
+            'sum_range': self.sum_range,
+            'dup_limits': self.dup_limits
+        }
+    
+    def filter_pass_rates(self):
+        """Per-rule elimination counts of the current settings over the full space (see lot_filter_batch)"""
+        return filter_pass_rates(load_combo_table(), self.get_filter_settings(), self.recent_masks)
     
     def filter_combination(self, combination):
         """Apply all filters to a combination"""
         # Basic checks
         if len(combination) != self.nums_per_draw:
             return False
+        
+        # Delegate to the vectorized kernel so every generator applies identical rules
+        if NUMPY_AVAILABLE:
+            return bool(filter_batch([combination], self.get_filter_settings(), self.recent_masks)[0])
             
         # Even/Odd distribution (2-3 even, 2-3 odd)
         even_count = sum(1 for num in combination if num % 2 == 0)
@@ -231,17 +269,17 @@ class GAFantasy5Generator:
         # Historical duplicate check from previous draws
         dup_counts, cumulative_dups = self.calculate_duplicates_from_previous(combination)
         
-        # Apply filtering rules:
-        # - No more than 1 number from most recent draw
-        if len(dup_counts) > 0 and dup_counts[0] > 1:
+        # Apply filtering rules (defaults 1, 2 and 3):
+        # - No more than dup_limits[0] numbers from most recent draw
+        if len(dup_counts) > 0 and dup_counts[0] > self.dup_limits[0]:
             return False
             
-        # - No more than 2 numbers from cumulative 2 most recent draws
-        if len(cumulative_dups) > 1 and cumulative_dups[1] > 2:
+        # - No more than dup_limits[1] numbers from cumulative 2 most recent draws
+        if len(cumulative_dups) > 1 and cumulative_dups[1] > self.dup_limits[1]:
             return False
             
-        # - No more than 3 numbers from cumulative 3 most recent draws
-        if len(cumulative_dups) > 2 and cumulative_dups[2] > 3:
+        # - No more than dup_limits[2] numbers from cumulative 3 most recent draws
+        if len(cumulative_dups) > 2 and cumulative_dups[2] > self.dup_limits[2]:
             return False
             
         # Sum range check
@@ -257,43 +295,361 @@ class GAFantasy5Generator:
         return sorted(random.sample(range(self.num_range[0], self.num_range[1] + 1), 
                                   self.nums_per_draw))
     
-    def generate_draws(self, count=1000, max_attempts=100000, include_scores=True):
-        """Generate specified number of unique filtered draws with scores"""
-        draws = set()
+    def get_sampler(self):
+        """Sampler over every combination that passes the current filters (enumerated once per snapshot)"""
+        sampler = get_filtered_sampler(self.get_filter_settings(), self.recent_draws, self.recent_masks)
+        self.filtered_space_size = len(sampler)
+        return sampler
+    
+    def get_filtered_space(self):
+        """
+        Enumerate every combination that passes the current filters
+        
+        Returns:
+        np.ndarray: uint32 ids (see lot_combo_rank) of all valid combinations
+        """
+        return self.get_sampler().ids
+    
+    def score_weights(self, ids):
+        """Cover-model scores of a set of combination ids, used as sampling weights"""
+        scores, _ = score_batch(load_combo_table().combos[ids], self.scoring_context, model='cover')
+        return scores
+    
+    def get_alias_table(self, sampler):
+        """Score-weighted alias table over the sampler's ids (built once per rank snapshot)"""
+        return sampler.alias_table(snapshot_id(self.rank_limits, self.rank_counts), self.score_weights)
+    
+    def check_draw_count(self, count, weighted=False):
+        """Raise InsufficientCombinationsError at once unless the filters allow count distinct draws"""
+        sampler = self.get_sampler()
+        sampler.require(count)
+        if weighted:
+            alias = self.get_alias_table(sampler)
+            if count > alias.support:
+                raise InsufficientCombinationsError(alias.support, count)
+        return sampler
+    
+    def score_filtered_space(self):
+        """
+        Score every combination that passes the current filters
+        
+        Returns:
+        tuple: (ids, scores) - uint32 ids of all valid combinations and their float32 scores
+        """
+        valid_ids = self.get_filtered_space()
+        return valid_ids, self.score_weights(valid_ids)
+    
+    def score_draw(self, combination, include_scores=True):
+        """Build the output record for a single draw"""
+        if not include_scores:
+            return list(combination)
+        
+        score, stats = self.calculate_score(combination)
+        return {
+            'id': rank_combination(combination),
+            'combination': list(combination),
+            'score': round(score, 4),
+            'sum': sum(combination),
+            'stats': stats
+        }
+    
+    def stream_draws(self, writers, records):
+        """Hand a batch of freshly generated draw records to the open output writers"""
+        for record in records:
+            row = dict(zip(DRAW_COLUMN_NAMES, self.draw_row(record)))
+            for writer in writers:
+                writer.write(row)
+    
+    def score_draws(self, combos, include_scores=True, writers=(), batch_size=1000):
+        """
+        Build the output records of a list of combinations, streaming each batch
+        to the writers as soon as it is scored
+        
+        Returns:
+        list: Records in the order of combos
+        """
+        records = []
+        for start in range(0, len(combos), batch_size):
+            batch = [self.score_draw(combination, include_scores) for combination in combos[start:start + batch_size]]
+            self.stream_draws(writers, batch)
+            records.extend(batch)
+        return records
+    
+    def generate_draws_sampled(self, count=1000, include_scores=True, weighted=False, writers=()):
+        """
+        Generate draws by sampling from the fully enumerated filtered space
+        
+        Unlike rejection sampling this costs the same however tight the
+        filters are, and always returns the requested count.
+        
+        Parameters:
+        count (int): Number of draws
+        include_scores (bool): Build scored records
+        weighted (bool): Draw in proportion to the cover score instead of uniformly
+        writers (list): Open draw writers that receive each batch as it is scored
+        
+        Returns:
+        list: Draws, sorted by score when scores are included
+        """
+        table = load_combo_table()
+        sampler = self.get_sampler()
+        print(f"Filtered space: {self.filtered_space_size} of {len(table)} combinations pass all filters")
+        
+        alias = self.get_alias_table(sampler) if weighted else None
+        picks = np.sort(sampler.sample(count, alias=alias))
+        combos = table.combos[picks].tolist()
+        scored_draws = self.score_draws(combos, include_scores, writers)
+        
+        if include_scores:
+            # Sort by score (highest first)
+            scored_draws.sort(key=lambda x: x['score'], reverse=True)
+        
+        return scored_draws
+    
+    def generate_draws_ranked(self, count=1000, include_scores=True, writers=()):
+        """
+        The count highest-scoring draws of the fully enumerated filtered space
+        
+        Every valid combination is scored with the cover model and the top
+        count are kept (ties in id order), so the result is deterministic.
+        
+        Parameters:
+        count (int): Number of draws
+        include_scores (bool): Build scored records
+        writers (list): Open draw writers that receive each batch as it is scored
+        
+        Returns:
+        list: Draws, highest score first
+        """
+        table = load_combo_table()
+        ids, scores = self.score_filtered_space()
+        print(f"Filtered space: {self.filtered_space_size} of {len(table)} combinations pass all filters")
+        
+        top = ids[np.argsort(-scores, kind='stable')[:count]]
+        combos = table.combos[top].tolist()
+        scored_draws = self.score_draws(combos, include_scores, writers)
+        
+        if include_scores:
+            # Scalar scores are rounded, so re-sort (stable: batch order breaks ties)
+            scored_draws.sort(key=lambda x: x['score'], reverse=True)
+        
+        return scored_draws
+    
+    def generate_draws_coverage(self, count=1000, include_scores=True, k=3, writers=()):
+        """
+        Pick draws that jointly cover the most k-subsets of the filtered space
+        
+        Greedy maximum coverage (see lot_coverage): each pick covers the most
+        k-of-5 subsets no earlier pick covered, ties going to the higher cover
+        score, so the tickets overlap as little as possible.
+        
+        Parameters:
+        count (int): Number of draws
+        include_scores (bool): Build scored records
+        k (int): Subset size to cover (3 = every 3-of-5 subset)
+        writers (list): Open draw writers that receive each batch as it is scored
+        
+        Returns:
+        list: Draws in selection order (each prefix is itself a greedy cover)
+        """
+        table = load_combo_table()
+        ids, scores = self.score_filtered_space()
+        print(f"Filtered space: {self.filtered_space_size} of {len(table)} combinations pass all filters")
+        
+        optimizer = CoverageOptimizer(table.combos[ids], k, scores)
+        positions, _ = optimizer.select(count)
+        self.coverage_report = optimizer.report()
+        print(f"Coverage: {self.coverage_report['covered']} of {self.coverage_report['universe']} "
+              f"{k}-subsets ({self.coverage_report['coverage_rate']}%)")
+        
+        combos = table.combos[ids[positions]].tolist()
+        return self.score_draws(combos, include_scores, writers)
+    
+    def generate_shard(self, seed, round_index, shard_index, quota, include_scores=True, weighted=False):
+        """
+        Generate one shard of filtered draws from its own random stream
+        
+        Parameters:
+        seed (int): Run seed
+        round_index (int): Merge round the shard belongs to
+        shard_index (int): Shard number within the round
+        quota (int): Number of unique draws wanted
+        include_scores (bool): Build scored records
+        weighted (bool): Draw in proportion to the cover score instead of uniformly
+        
+        Returns:
+        tuple: (ids, draws) - combination ids and output records, in generation order
+        """
+        rng = np.random.default_rng([seed, round_index, shard_index])
+        sampler = self.get_sampler()
+        
+        # Distinct ids straight from the filtered space - no rejected candidates
+        if weighted:
+            alias = self.get_alias_table(sampler)
+            accepted = sampler.sample(min(quota, alias.support), rng, alias)
+        else:
+            accepted = sampler.sample(min(quota, len(sampler)), rng)
+        
+        combos = decode(accepted, self.nums_per_draw, self.num_range[1]).tolist()
+        return accepted.tolist(), [self.score_draw(combination, include_scores) for combination in combos]
+    
+    def generate_draws_parallel(self, count=1000, workers=2, seed=None, include_scores=True, weighted=False,
+                                writers=()):
+        """
+        Generate draws on a process pool
+        
+        Work is split into fixed-size shards, each with its own random stream
+        derived from (seed, round, shard). Shards are merged in shard order and
+        deduplicated, so the result depends only on the seed, never on the
+        number of workers.
+        
+        Parameters:
+        count (int): Number of draws to generate
+        workers (int): Worker processes (1 runs the shards in this process)
+        seed (int): Run seed (drawn from the random module if omitted)
+        include_scores (bool): Build scored records
+        weighted (bool): Draw in proportion to the cover score instead of uniformly
+        writers (list): Open draw writers that receive each round's new draws as they are merged
+        
+        Returns:
+        list: Draws, sorted by score when scores are included
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.check_draw_count(count, weighted)
+        print(f"Parallel generation: {workers} workers, seed {seed}")
+        
+        draws = ComboIdSet()
         scored_draws = []
-        attempts = 0
+        executor = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,))
+        
+        try:
+            round_index = 0
+            while len(draws) < count:
+                shards = -(-(count - len(draws)) // PARALLEL_SHARD_SIZE)
+                tasks = [(seed, round_index, shard_index, PARALLEL_SHARD_SIZE, include_scores, weighted)
+                         for shard_index in range(shards)]
+                if executor:
+                    results = executor.map(_run_shard, tasks)
+                else:
+                    results = (self.generate_shard(*task) for task in tasks)
+                
+                merged = []
+                for ids, records in results:
+                    for combo_id, record in zip(ids, records):
+                        if len(draws) < count and draws.add(combo_id):
+                            merged.append(record)
+                self.stream_draws(writers, merged)
+                scored_draws.extend(merged)
+                
+                print(f"Round {round_index + 1}: {len(draws)} of {count} draws")
+                round_index += 1
+        finally:
+            if executor:
+                executor.shutdown()
+        
+        if include_scores:
+            # Sort by score (highest first)
+            scored_draws.sort(key=lambda x: x['score'], reverse=True)
         
+        return scored_draws
+    
+    def generate_draws(self, count=1000, max_attempts=100000, include_scores=True, batch_size=1000,
+                       exhaustive=False, workers=1, seed=None, weighted=False, coverage_k=None, output_files=None):
+        """
+        Generate specified number of unique filtered draws with scores
+        
+        With NumPy, draws come straight from the enumerated filtered space and
+        settings that cannot yield count draws raise InsufficientCombinationsError
+        immediately; without it candidates are rejection-sampled (max_attempts).
+        With coverage_k the draws are a greedy k-subset cover of the filtered
+        space instead of a sample; with exhaustive they are its count
+        highest-scoring combinations (deterministic, so workers, seed and
+        weighted do not apply). Otherwise a seed or workers > 1 selects the
+        reproducible sharded sampler.
+        
+        output_files (.ndjson, .npz or .parquet paths) are opened before
+        generation starts and receive every batch of draws as it is produced.
+        NDJSON lines are in generation order; the columnar files are stored by
+        score, like the CSV. A failed run leaves none of them behind.
+        """
         print(f"Generating {count} unique GA Fantasy 5 draws...")
         print(f"Filter settings: seq2≤{self.max_seq2}, seq3≤{self.max_seq3}, "
               f"mod_tot≤{self.max_mod_tot}, sum_range={self.sum_range}")
         print(f"Rank analysis: {len(self.rank_limits)} limits, {len(self.rank_counts)} counts")
         
+        with ExitStack() as stack:
+            writers = [stack.enter_context(open_draw_writer(path, count, 'Score' if include_scores else None))
+                       for path in output_files or []]
+            
+            if NUMPY_AVAILABLE:
+                self.check_draw_count(count, weighted)
+                if coverage_k:
+                    scored_draws = self.generate_draws_coverage(count, include_scores, coverage_k, writers)
+                elif exhaustive:
+                    scored_draws = self.generate_draws_ranked(count, include_scores, writers)
+                elif workers > 1 or seed is not None:
+                    scored_draws = self.generate_draws_parallel(count, workers, seed, include_scores, weighted,
+                                                                writers)
+                else:
+                    scored_draws = self.generate_draws_sampled(count, include_scores, weighted, writers)
+            else:
+                scored_draws = self.generate_draws_rejection(count, max_attempts, include_scores, batch_size,
+                                                             exhaustive or workers > 1 or weighted or coverage_k,
+                                                             writers)
+        
+        for path in output_files or []:
+            print(f"Streamed {len(scored_draws)} draws to {path}")
+        return scored_draws
+    
+    def generate_draws_rejection(self, count=1000, max_attempts=100000, include_scores=True, batch_size=1000,
+                                 fallback=False, writers=()):
+        """
+        Generate draws by rejection-sampling random candidates (used without NumPy)
+        
+        Parameters:
+        fallback (bool): A NumPy-only mode was requested, so say it is being ignored
+        writers (list): Open draw writers that receive each batch's accepted draws
+        
+        Returns:
+        list: Draws, sorted by score when scores are included
+        """
+        draws = ComboIdSet()  # Ids of accepted draws (one bit per possible combination)
+        scored_draws = []
+        attempts = 0
+        
+        if fallback:
+            print("NumPy not available - falling back to random sampling on a single core")
+        
         while len(draws) < count and attempts < max_attempts:
-            combination = self.generate_random_combination()
+            # Draw candidates in batches and filter each batch in one vectorized call
+            batch = [self.generate_random_combination()
+                     for _ in range(min(batch_size, max_attempts - attempts))]
+            if NUMPY_AVAILABLE:
+                passed = filter_batch(batch, self.get_filter_settings(), self.recent_masks)
+            else:
+                passed = [self.filter_combination(combination) for combination in batch]
             
-            if self.filter_combination(combination):
-                combo_tuple = tuple(combination)
-                if combo_tuple not in draws:
-                    draws.add(combo_tuple)
-                    
-                    if include_scores:
-                        score, stats = self.calculate_score(combination)
-                        scored_draws.append({
-                            'combination': list(combination),
-                            'score': round(score, 4),
-                            'sum': sum(combination),
-                            'stats': stats
-                        })
-                    else:
-                        scored_draws.append(list(combination))
+            accepted = []
+            for combination, is_valid in zip(batch, passed):
+                if len(draws) >= count:
+                    break
+                
+                if is_valid and draws.add(rank_combination(combination)):
+                    accepted.append(self.score_draw(combination, include_scores))
                     
                     if len(draws) % 100 == 0:
                         print(f"Generated {len(draws)} draws...")
+                
+                attempts += 1
+                
+                if attempts % 10000 == 0:
+                    print(f"Attempts: {attempts}, Generated: {len(draws)}")
             
-            attempts += 1
-            
-            if attempts % 10000 == 0:
-                print(f"Attempts: {attempts}, Generated: {len(draws)}")
+            self.stream_draws(writers, accepted)
+            scored_draws.extend(accepted)
         
         if len(draws) < count:
             print(f"Warning: Only generated {len(draws)} draws after {attempts} attempts")
@@ -360,16 +716,11 @@ class GAFantasy5Generator:
     
     def calculate_stats(self, numbers):
         """Calculate statistical measures for a combination"""
-        # Basic stats
-        if NUMPY_AVAILABLE:
-            numbers_array = np.array(numbers)
-            mean = float(np.mean(numbers_array))
-            median = float(np.median(numbers_array))
-        else:
-            mean = sum(numbers) / len(numbers)
-            sorted_nums = sorted(numbers)
-            n = len(sorted_nums)
-            median = sorted_nums[n//2] if n % 2 == 1 else (sorted_nums[n//2-1] + sorted_nums[n//2]) / 2
+        # Basic stats (plain Python - NumPy call overhead dominates on 5 numbers)
+        mean = sum(numbers) / len(numbers)
+        sorted_nums = sorted(numbers)
+        n = len(sorted_nums)
+        median = float(sorted_nums[n//2]) if n % 2 == 1 else (sorted_nums[n//2-1] + sorted_nums[n//2]) / 2
         
         # Even/Odd distribution
         even_count = sum(1 for num in numbers if num % 2 == 0)
@@ -502,6 +853,76 @@ class GAFantasy5Generator:
         
         return final_score, stats
     
+    def draw_row(self, draw_data):
+        """
+        Flat output row for a draw (the scored CSV columns without Rank)
+        
+        Returns:
+        list: Values in lot_draw_io.DRAW_COLUMN_NAMES order
+        """
+        if isinstance(draw_data, dict):
+            combination = draw_data['combination']
+            score = draw_data.get('score', float('nan'))
+            stats = draw_data.get('stats') or self.calculate_stats(combination)
+        else:
+            combination = draw_data
+            score = float('nan')
+            stats = self.calculate_stats(combination)
+        
+        # Calculate duplicate counts for this combination
+        dup_counts, cumulative_dups = self.calculate_duplicates_from_previous(combination)
+        dup1 = dup_counts[0] if len(dup_counts) > 0 else 0
+        dup2 = cumulative_dups[1] if len(cumulative_dups) > 1 else 0  
+        dup3 = cumulative_dups[2] if len(cumulative_dups) > 2 else 0
+        
+        # Calculate individual rank scores for each rank level (r0-r7)
+        rank_scores = [0] * 8  # Initialize r0-r7 counters
+        
+        # Check each number against the frequency-based rank limits
+        for num in combination:
+            # Get the frequency count for this number (num 1-42 maps to index 0-41)
+            if 1 <= num <= 42 and (num - 1) < len(self.rank_counts):
+                num_frequency = self.rank_counts[num - 1]  # Convert number to 0-based index
+                
+                # Find the appropriate rank limit based on frequency level
+                # Lower frequencies get more lenient limits (higher rank limit index)
+                if num_frequency == 0:
+                    limit_index = 7  # Best rank - use most lenient limit
+                elif num_frequency == 1:
+                    limit_index = 6
+                elif num_frequency == 2:
+                    limit_index = 5  
+                elif num_frequency == 3:
+                    limit_index = 4
+                elif num_frequency == 4:
+                    limit_index = 3
+                elif num_frequency == 5:
+                    limit_index = 2
+                elif num_frequency == 6:
+                    limit_index = 1
+                else:  # 7+
+                    limit_index = 0  # Worst rank - use most restrictive limit
+                
+                # Increment the counter for this rank level
+                if 0 <= limit_index < 8:
+                    rank_scores[limit_index] += 1
+        
+        return [score] + list(combination) + [
+            sum(combination), 
+            stats['even'], 
+            stats['odd'],
+            stats['seq2'],
+            stats['seq3'], 
+            stats['mod_total'],
+            stats['modx'],
+            dup1,
+            dup2,
+            dup3
+        ] + rank_scores + [  # Add r0-r7 counts
+            round(stats['mean'], 2),
+            round(stats['median'], 2)
+        ]
+    
     def save_draws_csv(self, draws, filename="ga_fantasy5_1000_draws_scored.csv"):
         """Save draws to CSV file with scores"""
         with open(filename, 'w', newline='') as csvfile:
@@ -509,66 +930,10 @@ class GAFantasy5Generator:
             
             # Check if draws have score information
             if draws and isinstance(draws[0], dict) and 'score' in draws[0]:
-                writer.writerow(['Rank', 'Score', 'Num1', 'Num2', 'Num3', 'Num4', 'Num5', 'Sum', 'Even', 'Odd', 'Seq2', 'Seq3', 'Mod', 'Modx', 'Dup1', 'Dup2', 'Dup3', 'r0', 'r1', 'r2', 'r3', 'r4', 'r5', 'r6', 'r7', 'Mean', 'Median'])
+                writer.writerow(['Rank'] + DRAW_COLUMN_NAMES)
                 
                 for i, draw_data in enumerate(draws, 1):
-                    combination = draw_data['combination']
-                    stats = draw_data['stats']
-                    
-                    # Calculate duplicate counts for this combination
-                    dup_counts, cumulative_dups = self.calculate_duplicates_from_previous(combination)
-                    dup1 = dup_counts[0] if len(dup_counts) > 0 else 0
-                    dup2 = cumulative_dups[1] if len(cumulative_dups) > 1 else 0  
-                    dup3 = cumulative_dups[2] if len(cumulative_dups) > 2 else 0
-                    
-                    # Calculate individual rank scores for each rank level (r0-r7)
-                    rank_scores = [0] * 8  # Initialize r0-r7 counters
-                    
-                    # Check each number against the frequency-based rank limits
-                    for num in combination:
-                        # Get the frequency count for this number (num 1-42 maps to index 0-41)
-                        if 1 <= num <= 42 and (num - 1) < len(self.rank_counts):
-                            num_frequency = self.rank_counts[num - 1]  # Convert number to 0-based index
-                            
-                            # Find the appropriate rank limit based on frequency level
-                            # Lower frequencies get more lenient limits (higher rank limit index)
-                            if num_frequency == 0:
-                                limit_index = 7  # Best rank - use most lenient limit
-                            elif num_frequency == 1:
-                                limit_index = 6
-                            elif num_frequency == 2:
-                                limit_index = 5  
-                            elif num_frequency == 3:
-                                limit_index = 4
-                            elif num_frequency == 4:
-                                limit_index = 3
-                            elif num_frequency == 5:
-                                limit_index = 2
-                            elif num_frequency == 6:
-                                limit_index = 1
-                            else:  # 7+
-                                limit_index = 0  # Worst rank - use most restrictive limit
-                            
-                            # Increment the counter for this rank level
-                            if 0 <= limit_index < 8:
-                                rank_scores[limit_index] += 1
-                    
-                    row = [i, draw_data['score']] + combination + [
-                        draw_data['sum'], 
-                        stats['even'], 
-                        stats['odd'],
-                        stats['seq2'],
-                        stats['seq3'], 
-                        stats['mod_total'],
-                        stats['modx'],
-                        dup1,
-                        dup2,
-                        dup3
-                    ] + rank_scores + [  # Add r0-r7 counts
-                        round(stats['mean'], 2),
-                        round(stats['median'], 2)
-                    ]
-                    writer.writerow(row)
+                    writer.writerow([i] + self.draw_row(draw_data))
             else:
                 # Legacy format for backward compatibility
                 writer.writerow(['Draw', 'Num1', 'Num2', 'Num3', 'Num4', 'Num5', 'Sum'])
@@ -583,26 +948,67 @@ class GAFantasy5Generator:
         
         print(f"Saved {len(draws)} draws to {filename}")
     
+    def run_manifest(self, seed, count, include_scores=True, exhaustive=False, weighted=False, outputs=None,
+                     coverage_k=None):
+        """Manifest describing a generate_draws run with the current settings"""
+        settings = self.get_filter_settings()
+        settings.update({'include_scores': include_scores, 'exhaustive': exhaustive, 'weighted': weighted})
+        if coverage_k:
+            settings['coverage_k'] = coverage_k
+        return build_manifest('lot_cover_1000', seed, count, settings, self.rank_limits, self.rank_counts,
+                              snapshot_id(self.recent_draws), outputs)
+    
+    def load_cached_draws(self, manifest, directory='.'):
+        """
+        Load the draws of an earlier identical run
+        
+        Returns:
+        tuple: (cached_manifest, draws), or (None, None) if no usable run exists
+        """
+        cached = find_cached_run(manifest, directory)
+        json_files = [output for output in cached['outputs'] if output.endswith('.json')] if cached else []
+        if not json_files:
+            return None, None
+        
+        with open(json_files[0], 'r') as jsonfile:
+            draws = json.load(jsonfile)['draws']
+        print(f"Reusing identical run from {json_files[0]} (seed {cached['seed']})")
+        return cached, draws
+    
     def save_draws_json(self, draws, filename="ga_fantasy5_1000_draws_scored.json"):
-        """Save draws to JSON file with scores and rank analysis"""
-        data = {
+        """
+        Save draws to JSON file with scores and rank analysis
+        
+        The header fields are written first and each draw follows as one compact
+        line, so no whole-document copy of the draws is built in memory.
+        """
+        header = {
             'generated_at': datetime.now().isoformat(),
             'total_draws': len(draws),
             'filter_settings': {
                 'max_seq2': self.max_seq2,
                 'max_seq3': self.max_seq3,
                 'max_mod_tot': self.max_mod_tot,
-                'sum_range': self.sum_range
+                'sum_range': self.sum_range,
+                'dup_limits': self.dup_limits
             },
+            'filtered_space_size': self.filtered_space_size,
+            'coverage': self.coverage_report,
             'rank_analysis_config': {
                 'rank_limits': self.rank_limits,
                 'rank_counts_length': len(self.rank_counts)
-            },
-            'draws': draws
+            }
         }
         
         with open(filename, 'w') as jsonfile:
-            json.dump(data, jsonfile, indent=2)
+            jsonfile.write('{\n')
+            for key, value in header.items():
+                jsonfile.write(f'  {json.dumps(key)}: {json.dumps(value)},\n')
+            jsonfile.write('  "draws": [')
+            for i, draw in enumerate(draws):
+                jsonfile.write(',\n    ' if i else '\n    ')
+                jsonfile.write(json.dumps(draw, separators=(',', ':')))
+            jsonfile.write('\n  ]\n}\n')
         
         print(f"Saved {len(draws)} draws to {filename}")
     
@@ -666,8 +1072,9 @@ def main():
     """Main function to generate 1000 GA Fantasy 5 draws with scoring"""
     generator = GAFantasy5Generator()
     
-    # Generate 1000 draws with scores
-    draws = generator.generate_draws(count=1000, include_scores=True)
+    # Generate 1000 draws with scores (seeded so the run can be reproduced from its manifest)
+    seed = seed_everything()
+    draws = generator.generate_draws(count=1000, include_scores=True, seed=seed)
     
     # Save to files with timestamp to avoid permission issues
     from datetime import datetime
@@ -677,6 +1084,7 @@ def main():
     
     generator.save_draws_csv(draws, csv_file)
     generator.save_draws_json(draws, json_file)
+    write_manifest(generator.run_manifest(seed, 1000, outputs=[csv_file, json_file]), json_file)
     
     # Print statistics
     generator.print_statistics(draws)
@@ -20,6 +20,8 @@ except ImportError:
     PLOTTING_AVAILABLE = False
     print("Matplotlib/NumPy not available - charts will be skipped")
 
+from lot_draw_io import read_draws, columnar_sibling, NUMPY_AVAILABLE as COLUMNAR_AVAILABLE
+
 
 class LottoDrawSummary:
     """Analyze and summarize lottery draw data"""
@@ -42,8 +44,13 @@ class LottoDrawSummary:
         return files[0]
     
     def load_data(self):
-        """Load draw data from CSV file"""
+        """Load draw data, memory-mapping the columnar copy of the CSV when one exists"""
         try:
+            if COLUMNAR_AVAILABLE and (not self.csv_file.endswith('.csv') or columnar_sibling(self.csv_file)):
+                self.draws = read_draws(self.csv_file)
+                print(f"Loaded {len(self.draws)} draws from {self.draws.path}")
+                return
+            
             with open(self.csv_file, 'r') as f:
                 reader = csv.DictReader(f)
                 self.draws = list(reader)
@@ -6,9 +6,12 @@ Alternative to the web dashboard for direct terminal use
 
 import json
 import os
+import argparse
 from datetime import datetime
 from lot_cover_1000 import GAFantasy5Generator
 from lot_cover_1000_summary import LottoDrawSummary
+from lot_manifest import seed_everything, write_manifest
+from lot_draw_io import NUMPY_AVAILABLE as COLUMNAR_AVAILABLE
 
 def get_user_input(prompt, default_value, input_type=str):
     """Get user input with default value"""
@@ -24,6 +27,16 @@ def get_user_input(prompt, default_value, input_type=str):
 
 def main():
     """Main CLI interface"""
+    parser = argparse.ArgumentParser(description="GA Fantasy 5 lottery generation CLI")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for parallel generation")
+    parser.add_argument("--seed", type=int, help="Random seed (reuses an identical earlier run when one exists)")
+    parser.add_argument("--weighted", action="store_true", help="Draw in proportion to the cover score instead of uniformly")
+    parser.add_argument("--coverage", type=int, metavar="K",
+                        help="Pick tickets that jointly cover the most K-of-5 subsets (e.g. 3) instead of sampling")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="Also stream the draws to an NDJSON file (one record per line) as they are generated")
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("GA FANTASY 5 LOTTERY GENERATOR - CLI VERSION")
     print("=" * 60)
@@ -40,6 +53,7 @@ def main():
     
     include_scores = input("Include scoring & ranking? [y/N]: ").lower().startswith('y')
     load_historical = input("Load historical data for duplicate filtering? [y/N]: ").lower().startswith('y')
+    exhaustive = input("Rank the full filtered space and keep the top scorers (exhaustive)? [y/N]: ").lower().startswith('y')
     
     print(f"\n{'='*60}")
     print("GENERATING DRAWS...")
@@ -53,19 +67,41 @@ def main():
     generator.sum_range = (sum_min, sum_max)
     
     try:
-        # Generate draws
-        start_time = datetime.now()
-        draws = generator.generate_draws(count=count, include_scores=include_scores)
-        end_time = datetime.now()
+        # Serve an identical seeded request from its earlier run
+        seed = seed_everything(args.seed)
+        manifest = generator.run_manifest(seed, count, include_scores, exhaustive, args.weighted,
+                                          coverage_k=args.coverage)
+        cached, draws = generator.load_cached_draws(manifest) if args.seed is not None else (None, None)
         
-        # Create timestamped filenames
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        csv_filename = f"ga_fantasy5_{count}_draws_{timestamp}.csv"
-        json_filename = f"ga_fantasy5_{count}_draws_{timestamp}.json"
-        
-        # Save files
-        generator.save_draws_csv(draws, csv_filename)
-        generator.save_draws_json(draws, json_filename)
+        start_time = datetime.now()
+        if cached:
+            csv_filename, json_filename = cached['outputs'][:2]
+            end_time = datetime.now()
+        else:
+            # Create timestamped filenames
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            csv_filename = f"ga_fantasy5_{count}_draws_{timestamp}.csv"
+            json_filename = f"ga_fantasy5_{count}_draws_{timestamp}.json"
+            
+            # Files written batch by batch during generation
+            stream_files = []
+            if COLUMNAR_AVAILABLE and include_scores:
+                # Columnar copy for fast, memory-mapped analysis
+                stream_files.append(f"ga_fantasy5_{count}_draws_{timestamp}.npz")
+            if args.ndjson:
+                stream_files.append(f"ga_fantasy5_{count}_draws_{timestamp}.ndjson")
+            
+            # Generate draws
+            draws = generator.generate_draws(count=count, include_scores=include_scores, exhaustive=exhaustive,
+                                             workers=args.workers, seed=seed, weighted=args.weighted,
+                                             coverage_k=args.coverage, output_files=stream_files)
+            end_time = datetime.now()
+            
+            # Save files and the run manifest
+            generator.save_draws_csv(draws, csv_filename)
+            generator.save_draws_json(draws, json_filename)
+            manifest['outputs'] = [csv_filename, json_filename] + stream_files
+            write_manifest(manifest, json_filename)
         
         # Display results
         generation_time = (end_time - start_time).total_seconds()
@@ -73,8 +109,17 @@ def main():
         print(f"\nGENERATION COMPLETE!")
         print(f"Time taken: {generation_time:.2f} seconds")
         print(f"Total draws: {len(draws)}")
+        print(f"Seed: {seed}")
+        if generator.filtered_space_size is not None:
+            print(f"Filtered space: {generator.filtered_space_size} valid combinations")
+        if generator.coverage_report:
+            report = generator.coverage_report
+            print(f"Coverage: {report['covered']} of {report['universe']} {report['subset_size']}-subsets "
+                  f"({report['coverage_rate']}%)")
         print(f"CSV file: {csv_filename}")
         print(f"JSON file: {json_filename}")
+        for filename in (cached or manifest)['outputs'][2:]:
+            print(f"Streamed file: {filename}")
         
         if draws and isinstance(draws[0], dict):
             scores = [draw['score'] for draw in draws]
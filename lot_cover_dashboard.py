@@ -20,11 +20,18 @@ sys.path.append('.')
 
 # Import the generator class from lot_cover_1000.py
 from lot_cover_1000 import GAFantasy5Generator
+from lot_manifest import seed_everything, write_manifest, manifest_path
+from lot_draw_io import read_draws, columnar_sibling, NUMPY_AVAILABLE as COLUMNAR_AVAILABLE
+
+if COLUMNAR_AVAILABLE:
+    import numpy as np
+from lot_param_search import load_pareto_table, recommended_settings
 
 app = Flask(__name__)
 app.secret_key = 'ga_fantasy5_dashboard_secret_key'
 
-# Default settings
+# Fallback defaults; the filter values are replaced by the recommended row of the
+# parameter search's Pareto table once one has been saved (python lot_param_search.py)
 DEFAULT_SETTINGS = {
     'count': 1000,
     'max_seq2': 1,
@@ -32,22 +39,48 @@ DEFAULT_SETTINGS = {
     'max_mod_tot': 1,
     'sum_min': 70,
     'sum_max': 139,
+    'dup1': 1,
+    'dup2': 2,
+    'dup3': 3,
     'include_scores': True,
-    'load_historical': True
+    'load_historical': True,
+    'exhaustive': False,
+    'weighted': False,
+    'ndjson': False,
+    'coverage_k': 0,
+    'workers': 1,
+    'seed': None
 }
 
+def default_settings():
+    """DEFAULT_SETTINGS with the filter values of the recommended Pareto row, if any"""
+    settings = DEFAULT_SETTINGS.copy()
+    settings.update(recommended_settings())
+    return settings
+
 def load_settings():
     """Load settings from file or return defaults"""
+    defaults = default_settings()
     try:
         with open('dashboard_settings.json', 'r') as f:
             settings = json.load(f)
             # Ensure all required keys exist
-            for key, default_value in DEFAULT_SETTINGS.items():
+            for key, default_value in defaults.items():
                 if key not in settings:
                     settings[key] = default_value
             return settings
     except FileNotFoundError:
-        return DEFAULT_SETTINGS.copy()
+        return defaults
+
+def build_generator(settings):
+    """Generator configured with the filter values of a settings dict"""
+    generator = GAFantasy5Generator()
+    generator.max_seq2 = settings.get('max_seq2', 1)
+    generator.max_seq3 = settings.get('max_seq3', 0)
+    generator.max_mod_tot = settings.get('max_mod_tot', 1)
+    generator.sum_range = (settings.get('sum_min', 70), settings.get('sum_max', 139))
+    generator.dup_limits = (settings.get('dup1', 1), settings.get('dup2', 2), settings.get('dup3', 3))
+    return generator
 
 def save_settings(settings):
     """Save settings to file"""
@@ -61,7 +94,7 @@ def save_settings(settings):
 def index():
     """Main dashboard page"""
     settings = load_settings()
-    return render_template('dashboard.html', settings=settings)
+    return render_template('dashboard.html', settings=settings, defaults=default_settings())
 
 @app.route('/api/settings', methods=['GET', 'POST'])
 def api_settings():
@@ -93,26 +126,51 @@ def api_generate():
         settings = request.json if request.json else load_settings()
         
         # Create generator with custom settings
-        generator = GAFantasy5Generator()
-        generator.max_seq2 = settings.get('max_seq2', 1)
-        generator.max_seq3 = settings.get('max_seq3', 0)
-        generator.max_mod_tot = settings.get('max_mod_tot', 1)
-        generator.sum_range = (settings.get('sum_min', 70), settings.get('sum_max', 139))
+        generator = build_generator(settings)
         
         # Generate draws
         count = settings.get('count', 1000)
         include_scores = settings.get('include_scores', True)
-        
-        draws = generator.generate_draws(count=count, include_scores=include_scores)
-        
-        # Create timestamped filenames
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        csv_filename = f"ga_fantasy5_{count}_draws_{timestamp}.csv"
-        json_filename = f"ga_fantasy5_{count}_draws_{timestamp}.json"
-        
-        # Save files
-        generator.save_draws_csv(draws, csv_filename)
-        generator.save_draws_json(draws, json_filename)
+        exhaustive = settings.get('exhaustive', False)
+        weighted = settings.get('weighted', False)
+        coverage_k = int(settings.get('coverage_k') or 0) or None
+        workers = max(1, int(settings.get('workers', 1)))
+        requested_seed = settings.get('seed')
+        if requested_seed in ('', None):
+            requested_seed = None
+        
+        # Identical seeded requests are served from the earlier run's files
+        seed = seed_everything(requested_seed)
+        manifest = generator.run_manifest(seed, count, include_scores, exhaustive, weighted, coverage_k=coverage_k)
+        cached, draws = generator.load_cached_draws(manifest) if requested_seed is not None else (None, None)
+        
+        if cached:
+            csv_filename, json_filename = cached['outputs'][:2]
+            ndjson_filename = next((name for name in cached['outputs'] if name.endswith('.ndjson')), None)
+        else:
+            # Create timestamped filenames
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            csv_filename = f"ga_fantasy5_{count}_draws_{timestamp}.csv"
+            json_filename = f"ga_fantasy5_{count}_draws_{timestamp}.json"
+            ndjson_filename = f"ga_fantasy5_{count}_draws_{timestamp}.ndjson" if settings.get('ndjson') else None
+            
+            # Files written batch by batch during generation
+            stream_files = []
+            if COLUMNAR_AVAILABLE and include_scores:
+                # Columnar copy for fast, memory-mapped analysis
+                stream_files.append(f"ga_fantasy5_{count}_draws_{timestamp}.npz")
+            if ndjson_filename:
+                stream_files.append(ndjson_filename)
+            
+            draws = generator.generate_draws(count=count, include_scores=include_scores, exhaustive=exhaustive,
+                                             workers=workers, seed=seed, weighted=weighted,
+                                             coverage_k=coverage_k, output_files=stream_files)
+            
+            # Save files and the run manifest
+            generator.save_draws_csv(draws, csv_filename)
+            generator.save_draws_json(draws, json_filename)
+            manifest['outputs'] = [csv_filename, json_filename] + stream_files
+            write_manifest(manifest, json_filename)
         
         # Generate quick summary statistics
         if draws and isinstance(draws[0], dict):
@@ -126,17 +184,27 @@ def api_generate():
                 'avg_score': f"{sum(scores)/len(scores):.4f}",
                 'sum_range': f"{min(sums)} - {max(sums)}",
                 'avg_sum': f"{sum(sums)/len(sums):.1f}",
+                'filtered_space_size': generator.filtered_space_size,
+                'coverage': generator.coverage_report,
+                'seed': seed,
+                'cached': cached is not None,
                 'files': {
                     'csv': csv_filename,
-                    'json': json_filename
+                    'json': json_filename,
+                    'ndjson': ndjson_filename
                 }
             }
         else:
             summary = {
                 'total_draws': len(draws),
+                'filtered_space_size': generator.filtered_space_size,
+                'coverage': generator.coverage_report,
+                'seed': seed,
+                'cached': cached is not None,
                 'files': {
                     'csv': csv_filename,
-                    'json': json_filename
+                    'json': json_filename,
+                    'ndjson': ndjson_filename
                 }
             }
         
@@ -146,9 +214,34 @@ def api_generate():
             'settings_used': settings
         })
         
+    except ValueError as e:
+        # Includes settings no combination can satisfy (InsufficientCombinationsError)
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/filter_analysis', methods=['POST'])
+def api_filter_analysis():
+    """API endpoint reporting how many combinations each filter eliminates"""
+    try:
+        settings = request.json if request.json else load_settings()
+        
+        generator = build_generator(settings)
+        report = generator.filter_pass_rates()
+        report['requested'] = settings.get('count', 1000)
+        return jsonify({'success': True, 'analysis': report})
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/pareto')
+def api_pareto():
+    """API endpoint returning the saved parameter search (Pareto table)"""
+    result = load_pareto_table()
+    if result is None:
+        return jsonify({'error': 'No parameter search saved - run python lot_param_search.py'}), 404
+    return jsonify({'success': True, 'search': result})
+
 @app.route('/api/analyze/<filename>')
 def api_analyze(filename):
     """API endpoint to analyze a generated file"""
@@ -156,17 +249,22 @@ def api_analyze(filename):
         if not os.path.exists(filename):
             return jsonify({'error': 'File not found'}), 404
         
-        # Load and analyze the file
-        draws = []
-        with open(filename, 'r') as f:
-            reader = csv.DictReader(f)
-            draws = list(reader)
+        # Load and analyze the file (memory-mapped columnar copy when available)
+        if COLUMNAR_AVAILABLE and (not filename.endswith('.csv') or columnar_sibling(filename)):
+            draws = read_draws(filename)
+        else:
+            with open(filename, 'r') as f:
+                reader = csv.DictReader(f)
+                draws = list(reader)
         
         if not draws:
             return jsonify({'error': 'No data in file'}), 400
         
-        # Generate analysis summary
-        analysis = analyze_draws_summary(draws)
+        # Generate analysis summary (straight from the column arrays when memory-mapped)
+        if COLUMNAR_AVAILABLE and hasattr(draws, 'columns'):
+            analysis = analyze_draws_columns(draws.columns)
+        else:
+            analysis = analyze_draws_summary(draws)
         
         return jsonify({
             'success': True,
@@ -238,6 +336,57 @@ def analyze_draws_summary(draws):
     except Exception as e:
         return {'error': str(e)}
 
+def most_common(values):
+    """
+    (value, count) pairs of an integer array, like Counter(values).most_common()
+
+    Ordered by count, ties by first appearance.
+    """
+    unique, first, counts = np.unique(values, return_index=True, return_counts=True)
+    order = np.lexsort((first, -counts))
+    return list(zip(unique[order].tolist(), counts[order].tolist()))
+
+def analyze_draws_columns(columns):
+    """
+    analyze_draws_summary computed from column arrays (see lot_draw_io.read_draws)
+
+    Counts come from whole-column np.unique calls and the ranges and averages
+    from vector reductions, so no per-row objects are built.
+    """
+    try:
+        sums = np.asarray(columns['Sum'], dtype=np.int64)
+        # Row-major like the per-draw extend of Num1..Num5, so count ties resolve the same way
+        all_numbers = np.stack([np.asarray(columns[f'Num{i}'], dtype=np.int64) for i in range(1, 6)], axis=1).ravel()
+        number_counts = most_common(all_numbers)
+        
+        analysis = {
+            'sums': {
+                'range': f"{int(sums.min())} - {int(sums.max())}",
+                'average': f"{int(sums.sum())/len(sums):.1f}",
+                'most_common': [{'sum': s, 'count': c} for s, c in most_common(sums)[:5]]
+            },
+            'even_odd': {
+                'distribution': [{'even': k, 'odd': 5-k, 'count': v, 'percent': f"{v/len(sums)*100:.1f}%"}
+                               for k, v in sorted(most_common(columns['Even']))] if 'Even' in columns else []
+            },
+            'hottest_numbers': [{'number': n, 'count': c, 'percent': f"{c/len(all_numbers)*100:.2f}%"}
+                               for n, c in number_counts[:10]],
+            'coldest_numbers': [{'number': n, 'count': c, 'percent': f"{c/len(all_numbers)*100:.2f}%"}
+                               for n, c in number_counts[-10:]],
+        }
+        
+        if 'Score' in columns:
+            scores = np.asarray(columns['Score'], dtype=np.float64)
+            analysis['scores'] = {
+                'range': f"{scores.min():.4f} - {scores.max():.4f}",
+                'average': f"{scores.sum()/len(scores):.4f}"
+            }
+        
+        return analysis
+        
+    except Exception as e:
+        return {'error': str(e)}
+
 @app.route('/api/files')
 def api_files():
     """API endpoint to list generated files"""
@@ -315,10 +464,11 @@ def api_delete_file(filename):
         
         os.remove(filename)
         
-        # Also try to remove corresponding JSON file
-        json_filename = filename.replace('.csv', '.json')
-        if os.path.exists(json_filename):
-            os.remove(json_filename)
+        # Also try to remove the corresponding JSON, columnar and manifest files
+        base = os.path.splitext(filename)[0]
+        for related in [base + '.json', base + '.ndjson', base + '.npz', base + '.parquet', manifest_path(filename)]:
+            if os.path.exists(related):
+                os.remove(related)
         
         return jsonify({'success': True, 'deleted': filename})
         
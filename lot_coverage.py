@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - Greedy Coverage Optimizer
+Picks tickets from the filtered space that together cover as many distinct
+k-of-5 subsets (3 by default) of that space as possible, instead of the
+highest-scoring draws, which overlap heavily.
+
+Covered subsets are a flat bitset over the colex subset ids (see
+lot_combo_rank). Selection is lazy greedy: every candidate keeps an upper
+bound on its gain (gains only shrink as coverage grows), and stale bounds at
+the top of the heap are refreshed a whole batch at a time with one vectorized
+lookup. The result is exactly the greedy choice - most newly covered subsets,
+ties to the best score - at a small fraction of the full re-evaluations.
+"""
+
+import argparse
+import heapq
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from lot_combo_rank import encode, NUM_MAX, NUMS_PER_DRAW
+
+# Default subset size (3-of-5 coverage)
+SUBSET_SIZE = 3
+
+# Stale heap entries refreshed per vectorized gain computation
+REFRESH_BATCH = 256
+
+
+def subset_ids(combos, k=SUBSET_SIZE, num_max=NUM_MAX):
+    """
+    Colex ids of every k-subset of each combination
+
+    Parameters:
+    combos (np.ndarray): (N, 5) sorted ball array
+    k (int): Subset size
+    num_max (int): Highest ball number
+
+    Returns:
+    np.ndarray: (N, C(5, k)) int32 subset ids in [0, C(num_max, k))
+    """
+    combos = np.asarray(combos)
+    columns = [encode(combos[:, list(positions)], num_max)
+               for positions in combinations(range(combos.shape[1]), k)]
+    return np.stack(columns, axis=1).astype(np.int32)
+
+
+class CoverageOptimizer:
+    """Lazy greedy maximum coverage of k-subsets over a candidate pool"""
+
+    def __init__(self, combos, k=SUBSET_SIZE, scores=None, num_max=NUM_MAX):
+        """
+        Parameters:
+        combos (np.ndarray): (N, 5) candidate tickets (e.g. the filtered space)
+        k (int): Subset size to cover (1-5)
+        scores (np.ndarray): Tie-break score per candidate, higher first (candidate order if omitted)
+        num_max (int): Highest ball number
+        """
+        if not 1 <= k <= NUMS_PER_DRAW:
+            raise ValueError(f"Subset size must be between 1 and {NUMS_PER_DRAW}")
+
+        self.k = k
+        self.subsets = subset_ids(combos, k, num_max)
+        self.covered = np.zeros(comb(num_max, k), dtype=bool)
+        self.covered_count = 0
+        self.universe = int(np.count_nonzero(np.bincount(self.subsets.ravel(), minlength=len(self.covered))))
+
+        # Heap priority among equal gains: best score first, then candidate order
+        if scores is None:
+            self.order = np.arange(len(self.subsets))
+        else:
+            self.order = np.argsort(-np.asarray(scores, dtype=np.float64), kind='stable')
+
+    def __len__(self):
+        return len(self.subsets)
+
+    def gains(self, positions):
+        """Subsets each candidate would newly cover (vectorized over positions)"""
+        return self.subsets.shape[1] - np.count_nonzero(self.covered[self.subsets[positions]], axis=1)
+
+    def select(self, count):
+        """
+        Greedily pick tickets, each covering the most still-uncovered subsets
+
+        Parameters:
+        count (int): Number of tickets (at most the pool size)
+
+        Returns:
+        tuple: (positions, gains) - candidate positions in selection order and
+               the subsets each one newly covered
+        """
+        count = min(count, len(self.subsets))
+        full_gain = self.subsets.shape[1]
+
+        # Heap of (-gain bound, tie-break rank); every bound is exact before the first pick
+        heap = [(-full_gain, rank) for rank in range(len(self.order))]
+        evaluated = np.zeros(len(self.order), dtype=np.int64)
+        picks, pick_gains = [], []
+
+        while len(picks) < count:
+            bound, rank = heap[0]
+            if evaluated[rank] == len(picks):
+                # Exact gain at least every other bound - the greedy choice
+                heapq.heappop(heap)
+                position = int(self.order[rank])
+                self.covered[self.subsets[position]] = True
+                self.covered_count -= bound
+                picks.append(position)
+                pick_gains.append(-bound)
+                continue
+
+            # Refresh the stale bounds at the top of the heap in one batch
+            batch = [heapq.heappop(heap)[1] for _ in range(min(REFRESH_BATCH, len(heap)))]
+            ranks = np.array(batch)
+            fresh = self.gains(self.order[ranks])
+            evaluated[ranks] = len(picks)
+            for rank, gain in zip(batch, fresh.tolist()):
+                heapq.heappush(heap, (-gain, rank))
+
+        return np.array(picks, dtype=np.int64), np.array(pick_gains, dtype=np.int64)
+
+    def report(self):
+        """Coverage summary of the tickets selected so far"""
+        return {
+            'subset_size': self.k,
+            'universe': self.universe,
+            'covered': self.covered_count,
+            'coverage_rate': round(self.covered_count / self.universe * 100, 2) if self.universe else 0.0
+        }
+
+
+def optimize_coverage(combos, count, k=SUBSET_SIZE, scores=None):
+    """
+    Pick count tickets from combos maximizing k-subset coverage
+
+    Returns:
+    tuple: (positions, report) - selected candidate positions in greedy order and the coverage report
+    """
+    optimizer = CoverageOptimizer(combos, k, scores)
+    positions, _ = optimizer.select(count)
+    return positions, optimizer.report()
+
+
+if __name__ == "__main__":
+    import time
+
+    from lot_combo_table import load_combo_table
+    from lot_sampler import get_filtered_sampler
+
+    parser = argparse.ArgumentParser(description="GA Fantasy 5 Greedy Coverage Optimizer")
+    parser.add_argument("--count", type=int, default=1000, help="Number of tickets")
+    parser.add_argument("--k", type=int, default=SUBSET_SIZE, help="Subset size to cover")
+    parser.add_argument("--show", type=int, default=10, help="Number of tickets to print")
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    ids = get_filtered_sampler().ids
+    optimizer = CoverageOptimizer(load_combo_table().combos[ids], args.k)
+    positions, gains = optimizer.select(args.count)
+    report = optimizer.report()
+
+    print(f"{len(positions)} tickets from {len(ids)} filtered combinations in {time.perf_counter() - start:.1f}s")
+    print(f"Covered {report['covered']} of {report['universe']} {args.k}-subsets ({report['coverage_rate']}%)")
+    for combo, gain in zip(load_combo_table().combos[ids[positions[:args.show]]], gains):
+        print(' '.join(f"{int(num):2d}" for num in combo), f"+{gain}")
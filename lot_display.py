@@ -3,7 +3,10 @@ import numpy as np
 import random
 import os
 import csv
+import argparse
 from datetime import datetime
+from lot_manifest import seed_everything, build_manifest, snapshot_id, write_manifest
+from lot_middle_table import get_middle_table
 
 class Fantasy5Predictor:
     def __init__(self, scaffolding_file):
@@ -135,64 +138,17 @@ class Fantasy5Predictor:
         current_even = (b1 % 2 == 0) + (b5 % 2 == 0)
         even_needed = even_target - current_even
         
-        # We need to find b2, b3, b4 that:
-        # 1. Are in ascending order between b1 and b5
-        # 2. Sum to the remaining sum
-        # 3. Have the required number of even digits
-        
-        valid_combinations = []
+        # Exact matches (b2 < b3 < b4 strictly between b1 and b5 with the remaining
+        # sum and even count), or the closest ones, from the precomputed table
+        middles = get_middle_table().closest(b1, b5, remaining_sum, even_needed)
+        if middles:
+            b2, b3, b4 = random.choice(middles)
+            return [b1, b2, b3, b4, b5]
         
         # Define the range for middle values
         min_b2 = b1 + 1
         max_b4 = b5 - 1
         
-        # Brute force approach for small range
-        for b2 in range(min_b2, max_b4 - 1):
-            for b3 in range(b2 + 1, max_b4):
-                for b4 in range(b3 + 1, max_b4 + 1):
-                    # Check if they sum to the remaining sum
-                    if b2 + b3 + b4 == remaining_sum:
-                        # Check if they have the right number of even digits
-                        b2_even = b2 % 2 == 0
-                        b3_even = b3 % 2 == 0
-                        b4_even = b4 % 2 == 0
-                        middle_even_count = b2_even + b3_even + b4_even
-                        
-                        if middle_even_count == even_needed:
-                            valid_combinations.append([b1, b2, b3, b4, b5])
-        
-        if valid_combinations:
-            return random.choice(valid_combinations)
-        
-        # If we couldn't find an exact match, find the closest match
-        closest_combinations = []
-        min_diff = float('inf')
-        
-        for b2 in range(min_b2, max_b4 - 1):
-            for b3 in range(b2 + 1, max_b4):
-                for b4 in range(b3 + 1, max_b4 + 1):
-                    # Calculate how close this combination is to our targets
-                    sum_diff = abs((b2 + b3 + b4) - remaining_sum)
-                    
-                    b2_even = b2 % 2 == 0
-                    b3_even = b3 % 2 == 0
-                    b4_even = b4 % 2 == 0
-                    middle_even_count = b2_even + b3_even + b4_even
-                    even_diff = abs(middle_even_count - even_needed)
-                    
-                    # Combined difference (prioritize sum)
-                    total_diff = (sum_diff * 10) + even_diff
-                    
-                    # Update best match if this is better
-                    if total_diff < min_diff:
-                        min_diff = total_diff
-                        closest_combinations = [[b1, b2, b3, b4, b5]]
-                    elif total_diff == min_diff:
-                        closest_combinations.append([b1, b2, b3, b4, b5])
-        
-        if closest_combinations:
-            return random.choice(closest_combinations)
-        
         # Ultimate fallback if no valid combinations found
         # Just pick random middle values
         b2 = random.randint(min_b2, min(min_b2 + 5, max_b4 - 2))
@@ -201,7 +157,13 @@ class Fantasy5Predictor:
         
         return [b1, b2, b3, b4, b5]
     
-    def generate_predictions(self, count=10, sum_range=(85, 120), even_range=(2, 3)):
+    def run_manifest(self, seed, count, sum_range, even_range, outputs=None):
+        """Manifest describing a generate_predictions run"""
+        settings = {'sum_range': sum_range, 'even_range': even_range}
+        history = snapshot_id(self.filtered_data.to_dict('records'))
+        return build_manifest('lot_display', seed, count, settings, history_snapshot=history, outputs=outputs)
+    
+    def generate_predictions(self, count=10, sum_range=(85, 120), even_range=(2, 3), seed=None):
         """
         Generate lottery number predictions
         
@@ -209,10 +171,12 @@ class Fantasy5Predictor:
         count (int): Number of predictions to generate
         sum_range (tuple): Range of sums to consider (min, max)
         even_range (tuple): Range of even number counts to consider (min, max)
+        seed (int): Random seed (a fresh one is drawn if None; see self.seed)
         
         Returns:
         list: List of prediction combinations
         """
+        self.seed = seed_everything(seed)
         predictions = []
         min_sum, max_sum = sum_range
         
@@ -344,6 +308,10 @@ def create_sample_scaffolding(csv_path, num_records=100):
 
 def main():
     """Main function to run the application"""
+    parser = argparse.ArgumentParser(description="Fantasy 5 scaffolding predictor")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible predictions")
+    args = parser.parse_args()
+    
     # Define file paths
     data_dir = 'data'
     os.makedirs(data_dir, exist_ok=True)
@@ -358,7 +326,7 @@ def main():
     
     # Generate predictions
     print("\nGenerating predictions...")
-    predictions = predictor.generate_predictions(count=10, sum_range=(110, 110), even_range=(2, 3))
+    predictions = predictor.generate_predictions(count=10, sum_range=(110, 110), even_range=(2, 3), seed=args.seed)
     
     # Display predictions
     print("\nFantasy 5 Predictions:")
@@ -370,6 +338,8 @@ def main():
     # Export to CSV
     predictions_file = os.path.join(data_dir, 'fantasy5_predictions.csv')
     predictor.export_to_csv(predictions, predictions_file)
+    write_manifest(predictor.run_manifest(predictor.seed, 10, (110, 110), (2, 3), outputs=[predictions_file]),
+                   predictions_file)
     
     print("\nApplication completed successfully!")
 
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - Typed Draw History Store
+Keeps the draw history as typed arrays - dates as int32 day numbers, balls
+as an (N, 5) uint8 array, bitmasks as uint64 and sums as uint16 - loaded
+from the date and b1-b5 columns only. Arrays are stored oldest first with
+spare capacity, so a new draw is an amortized O(1) append, and one store is
+shared read-only by every predictor and endpoint in the process.
+
+Alongside the draws it keeps cumulative ball counts (row i = appearances of
+each ball in the first i draws) and cumulative sums, so the frequency vector
+or average sum over any window - last N days, last N draws, since a date -
+is two row lookups and a subtraction, with no query.
+"""
+
+from datetime import date, datetime
+
+import numpy as np
+
+from lot_combo_mask import combo_masks
+from lot_combo_rank import NUM_MAX
+
+# Day numbers count from this date
+EPOCH = date(1970, 1, 1)
+
+# Rows allocated for an empty store
+INITIAL_CAPACITY = 1024
+
+
+def day_number(value):
+    """Day number of a date, datetime or date string (YYYY-MM-DD or MM/DD/YYYY)"""
+    if isinstance(value, datetime):
+        value = value.date()
+    elif isinstance(value, str):
+        for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%Y-%m-%d %H:%M:%S"):
+            try:
+                value = datetime.strptime(value.strip(), fmt).date()
+                break
+            except ValueError:
+                continue
+        else:
+            raise ValueError(f"Unrecognized draw date: {value}")
+    return (value - EPOCH).days
+
+
+def day_date(day):
+    """Date of a day number"""
+    return date.fromordinal(EPOCH.toordinal() + int(day))
+
+
+def _read_only(array):
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+class DrawHistory:
+    """Draw history as typed arrays (oldest first), with amortized O(1) append"""
+
+    def __init__(self, days=None, balls=None):
+        """
+        Parameters:
+        days (array-like): Day numbers (see day_number), ascending (several draws may share a day)
+        balls (array-like): (N, 5) ball numbers in the same order
+        """
+        days = np.asarray([] if days is None else days, dtype=np.int32)
+        balls = np.sort(np.asarray([] if balls is None else balls, dtype=np.uint8).reshape(-1, 5), axis=1)
+        if len(days) != len(balls):
+            raise ValueError("Every draw needs a date")
+        if np.any(np.diff(days) < 0):
+            raise ValueError("Draw dates must be ascending")
+
+        capacity = max(INITIAL_CAPACITY, 2 * len(days))
+        self._days = np.empty(capacity, dtype=np.int32)
+        self._balls = np.empty((capacity, 5), dtype=np.uint8)
+        self._masks = np.empty(capacity, dtype=np.uint64)
+        self._sums = np.empty(capacity, dtype=np.uint16)
+        # Cumulative columns have one more row than draws (row 0 = no draws)
+        self._counts = np.zeros((capacity + 1, NUM_MAX + 1), dtype=np.int32)
+        self._totals = np.zeros(capacity + 1, dtype=np.int64)
+        self._size = len(days)
+        # Rows load_new_draws dropped for not being newer than the latest stored draw
+        self.skipped_draws = 0
+
+        self._days[:self._size] = days
+        self._balls[:self._size] = balls
+        self._masks[:self._size] = combo_masks(balls)
+        self._sums[:self._size] = balls.sum(axis=1, dtype=np.uint16)
+
+        hits = self._counts[1:self._size + 1]
+        hits[np.arange(self._size)[:, None], balls] = 1
+        np.cumsum(hits, axis=0, out=hits)
+        np.cumsum(self._sums[:self._size], out=self._totals[1:self._size + 1])
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def empty(self):
+        return self._size == 0
+
+    # Read-only views, oldest first
+    @property
+    def days(self):
+        return _read_only(self._days[:self._size])
+
+    @property
+    def balls(self):
+        return _read_only(self._balls[:self._size])
+
+    @property
+    def masks(self):
+        return _read_only(self._masks[:self._size])
+
+    @property
+    def sums(self):
+        return _read_only(self._sums[:self._size])
+
+    @property
+    def latest_date(self):
+        """Date of the most recent draw (None when empty)"""
+        return day_date(self._days[self._size - 1]) if self._size else None
+
+    def append(self, draw_date, balls):
+        """
+        Add a draw dated on or after every stored one
+
+        Parameters:
+        draw_date (date or str): Draw date
+        balls (list): The five ball numbers
+        """
+        day = day_number(draw_date)
+        if self._size and day < self._days[self._size - 1]:
+            raise ValueError(f"Draw of {draw_date} is older than the latest draw ({self.latest_date})")
+
+        if self._size == len(self._days):
+            self._grow()
+        row = np.sort(np.asarray(balls, dtype=np.uint8))
+        self._days[self._size] = day
+        self._balls[self._size] = row
+        self._masks[self._size] = combo_masks(row[None, :])[0]
+        self._sums[self._size] = int(row.sum())
+        self._counts[self._size + 1] = self._counts[self._size]
+        self._counts[self._size + 1, row] += 1
+        self._totals[self._size + 1] = self._totals[self._size] + int(row.sum())
+        self._size += 1
+
+    def _grow(self):
+        """Double the capacity of every column"""
+        capacity = len(self._days)
+        for name in ('_days', '_balls', '_masks', '_sums', '_counts', '_totals'):
+            column = getattr(self, name)
+            extra = len(column) - capacity
+            grown = np.zeros((2 * capacity + extra,) + column.shape[1:], dtype=column.dtype)
+            grown[:self._size + extra] = column[:self._size + extra]
+            setattr(self, name, grown)
+
+    def window_start(self, days=None, draws=None, since=None, today=None):
+        """
+        Index of the first draw in a window ending at the latest draw
+
+        Parameters:
+        days (int): Draws dated within the last days days of today, as
+                    date >= DATE_SUB(NOW(), INTERVAL days DAY)
+        draws (int): The last draws draws
+        since (date or str): Draws on or after this date
+        today (date): Reference date for days (date.today() if omitted)
+
+        Returns:
+        int: Index into the oldest-first arrays (0 = whole history)
+        """
+        if draws is not None:
+            return max(self._size - draws, 0)
+        if days is not None:
+            # NOW() carries a time of day, so the first whole day counted is today - days + 1
+            first_day = day_number(today or date.today()) - days + 1
+        elif since is not None:
+            first_day = day_number(since)
+        else:
+            return 0
+        return int(np.searchsorted(self._days[:self._size], first_day, side='left'))
+
+    def frequency(self, days=None, draws=None, since=None, today=None):
+        """
+        Appearances of each ball over a window (see window_start), without a query
+
+        Returns:
+        np.ndarray: (43,) int32, index = ball number (index 0 unused)
+        """
+        start = self.window_start(days, draws, since, today)
+        return self._counts[self._size] - self._counts[start]
+
+    def average_sum(self, days=None, draws=None, since=None, today=None):
+        """Average winning sum over a window (see window_start), None when it holds no draws"""
+        start = self.window_start(days, draws, since, today)
+        if start >= self._size:
+            return None
+        return float(self._totals[self._size] - self._totals[start]) / (self._size - start)
+
+    def recent(self, n=3):
+        """Balls of the last n draws as lists, most recent first"""
+        start = max(self._size - n, 0)
+        return self._balls[start:self._size][::-1].tolist()
+
+    def last_draws(self, n=10):
+        """
+        The last n draws as records, most recent first
+
+        Returns:
+        list: Dicts with date (datetime.date), b1-b5 and sum
+        """
+        records = []
+        for i in range(self._size - 1, max(self._size - n, 0) - 1, -1):
+            record = {'date': day_date(self._days[i])}
+            record.update(zip(('b1', 'b2', 'b3', 'b4', 'b5'), self._balls[i].tolist()))
+            record['sum'] = int(self._sums[i])
+            records.append(record)
+        return records
+
+    def _balls_on_last_day(self):
+        """Sorted ball lists of the draws sharing the latest stored day"""
+        start = int(np.searchsorted(self._days[:self._size], self._days[self._size - 1]))
+        return self._balls[start:self._size].tolist()
+
+    def load_new_draws(self, cursor):
+        """
+        Append the draws newer than the latest stored one (all draws when empty)
+
+        Rows dated on the latest stored day are kept; rows dated before it (out of
+        order) and repeats of a stored draw (same date and balls) are counted in
+        skipped_draws and reported.
+
+        Parameters:
+        cursor: Dictionary cursor on the ga_f5_lotto database
+
+        Returns:
+        int: Number of draws added
+        """
+        if self._size:
+            cursor.execute("SELECT date, b1, b2, b3, b4, b5 FROM ga_f5_draws WHERE date > %s ORDER BY date",
+                           (self.latest_date,))
+        else:
+            cursor.execute("SELECT date, b1, b2, b3, b4, b5 FROM ga_f5_draws ORDER BY date")
+
+        added = 0
+        skipped = []
+        for row in cursor.fetchall():
+            draw_date = row['date']
+            balls = [int(row['b1']), int(row['b2']), int(row['b3']), int(row['b4']), int(row['b5'])]
+            if self._size:
+                day = day_number(draw_date)
+                last = self._days[self._size - 1]
+                if day < last or (day == last and sorted(balls) in self._balls_on_last_day()):
+                    skipped.append(str(draw_date))
+                    continue
+            self.append(draw_date, balls)
+            added += 1
+
+        if skipped:
+            self.skipped_draws += len(skipped)
+            print(f"Warning: skipped {len(skipped)} out-of-order or repeated draw(s) "
+                  f"({', '.join(skipped[:5])}{', ...' if len(skipped) > 5 else ''})")
+        return added
+
+
+_draw_history = None
+
+
+def load_draw_history(cursor=None):
+    """
+    Get the process-wide draw history, bringing it up to date
+
+    The first call loads every draw; later calls only fetch draws newer than
+    the latest one held. Without a cursor the store is returned as is.
+
+    Parameters:
+    cursor: Dictionary cursor on the ga_f5_lotto database
+
+    Returns:
+    DrawHistory: The shared store (treat as read-only outside this module)
+    """
+    global _draw_history
+
+    if _draw_history is None:
+        _draw_history = DrawHistory()
+    if cursor is not None:
+        _draw_history.load_new_draws(cursor)
+    return _draw_history
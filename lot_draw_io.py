@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+GA Fantasy 5 - Streaming Draw Writers and Readers
+Writes generated draw sets one record at a time as they are produced - as
+NDJSON, or as a compact columnar file (.npz, or .parquet when pyarrow is
+installed) - and reads them back as memory-mapped columns. Rows use the same column names as the scored
+ga_fantasy5_*.csv files, so LottoDrawSummary and api_analyze work unchanged.
+"""
+
+import os
+import json
+import zipfile
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Scored draw columns (the CSV layout without the Rank column, which is the row number)
+DRAW_COLUMNS = [
+    ('Score', 'f8'),
+    ('Num1', 'u1'), ('Num2', 'u1'), ('Num3', 'u1'), ('Num4', 'u1'), ('Num5', 'u1'),
+    ('Sum', 'u2'), ('Even', 'u1'), ('Odd', 'u1'), ('Seq2', 'u1'), ('Seq3', 'u1'),
+    ('Mod', 'u1'), ('Modx', 'u1'), ('Dup1', 'u1'), ('Dup2', 'u1'), ('Dup3', 'u1'),
+    ('r0', 'u1'), ('r1', 'u1'), ('r2', 'u1'), ('r3', 'u1'),
+    ('r4', 'u1'), ('r5', 'u1'), ('r6', 'u1'), ('r7', 'u1'),
+    ('Mean', 'f4'), ('Median', 'f4')
+]
+DRAW_COLUMN_NAMES = [name for name, _ in DRAW_COLUMNS]
+
+# Formats read_draws() prefers over a same-named CSV, best first
+COLUMNAR_EXTENSIONS = ['.npz', '.parquet']
+
+
+class NDJSONDrawWriter:
+    """
+    Write one compact JSON object per line as draws arrive
+
+    Lines are in generation order; each carries its Score, so readers can rank them.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w')
+
+    def write(self, row):
+        """Write a row (dict keyed by DRAW_COLUMN_NAMES)"""
+        self._file.write(json.dumps(row, separators=(',', ':')))
+        self._file.write('\n')
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+    def abort(self):
+        """Close and remove the partial file"""
+        self._file.close()
+        os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class ColumnarDrawWriter:
+    """
+    Collect rows into typed column buffers and write them on close
+
+    The path's extension picks the format: .parquet (needs pyarrow) or .npz.
+    Buffers are fixed-width arrays, so even 10,000-draw sets stay small. With
+    sort_by the rows are stored by that column, highest first (ties keep their
+    arrival order), e.g. 'Score' for the rank order of the CSV output.
+    """
+
+    def __init__(self, path, capacity=1024, sort_by=None):
+        if path.endswith('.parquet') and not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to write Parquet files")
+        self.path = path
+        self.count = 0
+        self.sort_by = sort_by
+        self.columns = {name: np.empty(max(capacity, 1), dtype=dtype) for name, dtype in DRAW_COLUMNS}
+
+    def write(self, row):
+        """Append a row (dict keyed by DRAW_COLUMN_NAMES)"""
+        if self.count == len(self.columns['Score']):
+            for name in self.columns:
+                self.columns[name] = np.resize(self.columns[name], 2 * self.count)
+        for name, values in self.columns.items():
+            values[self.count] = row[name]
+        self.count += 1
+
+    def close(self):
+        columns = {name: values[:self.count] for name, values in self.columns.items()}
+        if self.sort_by:
+            order = np.argsort(-columns[self.sort_by], kind='stable')
+            columns = {name: values[order] for name, values in columns.items()}
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        if self.path.endswith('.parquet'):
+            pq.write_table(pa.table(columns), temp_path)
+        else:
+            # Stored (uncompressed) members so readers can memory-map each column
+            with open(temp_path, 'wb') as f:
+                np.savez(f, **columns)
+        os.replace(temp_path, self.path)
+
+    def abort(self):
+        """Drop the buffered rows without writing a file"""
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def open_draw_writer(path, capacity=1024, sort_by=None):
+    """
+    Writer for a draw output file, picked by extension
+
+    Parameters:
+    path (str): .ndjson (streamed line by line) or .npz/.parquet (typed columns)
+    capacity (int): Expected number of rows (columnar buffers grow past it)
+    sort_by (str): Column the columnar formats are stored by, highest first
+
+    Returns:
+    NDJSONDrawWriter or ColumnarDrawWriter
+    """
+    if path.endswith('.ndjson'):
+        return NDJSONDrawWriter(path)
+    return ColumnarDrawWriter(path, capacity, sort_by)
+
+
+def _mmap_npz(path):
+    """Memory-map every column of an uncompressed .npz file"""
+    columns = {}
+    with zipfile.ZipFile(path) as zf, open(path, 'rb') as f:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path} is compressed and cannot be memory-mapped")
+            # Local file header: 30 fixed bytes + file name + extra field
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = np.frombuffer(f.read(4), dtype='<u2')
+            f.seek(info.header_offset + 30 + int(name_length) + int(extra_length))
+            if np.lib.format.read_magic(f) == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if shape[0] == 0:
+                columns[name] = np.empty(shape, dtype=dtype)
+            else:
+                columns[name] = np.memmap(path, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                                          order='F' if fortran_order else 'C')
+    return columns
+
+
+class DrawRow:
+    """Read-only mapping view of one row of a DrawTable"""
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, name):
+        return self._columns[name][self._index]
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def get(self, name, default=None):
+        return self[name] if name in self._columns else default
+
+    def keys(self):
+        return self._columns.keys()
+
+
+class DrawTable:
+    """Column store for a draw set; behaves like a list of row dicts"""
+
+    def __init__(self, columns, path=None):
+        self.columns = columns
+        self.path = path
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return DrawRow(self.columns, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield DrawRow(self.columns, index)
+
+    def column(self, name):
+        """Return a whole column as an array"""
+        return self.columns[name]
+
+
+def read_ndjson(path):
+    """Load an NDJSON draw file into columns"""
+    rows = []
+    with open(path, 'r') as f:
+        for line in f:
+            if line.strip():
+                rows.append(json.loads(line))
+    names = list(rows[0].keys()) if rows else DRAW_COLUMN_NAMES
+    return {name: np.array([row[name] for row in rows]) for name in names}
+
+
+def columnar_sibling(path):
+    """Columnar file written next to a CSV/JSON output, or None"""
+    base, _ = os.path.splitext(path)
+    for extension in COLUMNAR_EXTENSIONS:
+        candidate = base + extension
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def read_draws(path):
+    """
+    Read a draw set as memory-mapped columns
+
+    Parameters:
+    path (str): .npz, .parquet or .ndjson file - or a .csv whose columnar
+                sibling (same name, .npz/.parquet) exists
+
+    Returns:
+    DrawTable: Rows usable wherever csv.DictReader rows were used
+    """
+    if path.endswith('.csv'):
+        sibling = columnar_sibling(path)
+        if sibling is None:
+            raise FileNotFoundError(f"No columnar file found for {path}")
+        path = sibling
+
+    if path.endswith('.npz'):
+        columns = _mmap_npz(path)
+    elif path.endswith('.parquet'):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to read Parquet files")
+        table = pq.read_table(path, memory_map=True)
+        columns = {name: table.column(name).to_numpy() for name in table.column_names}
+    elif path.endswith('.ndjson'):
+        columns = read_ndjson(path)
+    else:
+        raise ValueError(f"Unsupported draw file format: {path}")
+
+    return DrawTable(columns, path)
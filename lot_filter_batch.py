@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - Vectorized Batch Filter
+Applies the filter_combination rules to whole arrays of combinations at once.
+Every generator's filter_combination delegates here so all of them agree.
+"""
+
+import time
+
+import numpy as np
+
+from lot_combo_table import compute_combo_features
+from lot_combo_mask import RecentDrawMasks, combo_masks
+
+# Filter configuration (matching main app defaults)
+DEFAULT_FILTER_SETTINGS = {
+    'max_seq2': 1,
+    'max_seq3': 0,
+    'max_mod_tot': 1,
+    'sum_range': (70, 139),
+    'dup_limits': (1, 2, 3)
+}
+
+# Default cumulative duplicate limits for the most recent 1, 2 and 3 draws
+DUP_LIMITS = DEFAULT_FILTER_SETTINGS['dup_limits']
+
+
+def get_filter_settings(settings=None):
+    """Merge user settings over the defaults"""
+    merged = DEFAULT_FILTER_SETTINGS.copy()
+    if settings:
+        merged.update({key: value for key, value in settings.items() if key in merged})
+    return merged
+
+
+def as_recent_masks(recent_draws):
+    """Accept either a RecentDrawMasks snapshot or a plain list of draws"""
+    if isinstance(recent_draws, RecentDrawMasks):
+        return recent_draws
+    return RecentDrawMasks([] if recent_draws is None else recent_draws, depth=len(DUP_LIMITS))
+
+
+def duplicate_counts_batch(combos, recent_draws, masks=None):
+    """
+    Count cumulative duplicates against the most recent draws
+
+    Parameters:
+    combos (np.ndarray): (N, 5) array of combinations
+    recent_draws (list or RecentDrawMasks): Previous draws, most recent first
+    masks (np.ndarray): Precomputed combination bitmasks (computed from combos if omitted)
+
+    Returns:
+    np.ndarray: (N, len(DUP_LIMITS)) array, column i = numbers shared with the last i+1 draws
+    """
+    if masks is None:
+        masks = combo_masks(combos)
+    return as_recent_masks(recent_draws).cumulative_duplicates_batch(masks, len(DUP_LIMITS))
+
+
+def _rule_masks(features, combos, settings, recent_draws, masks=None, dups=None):
+    """
+    Evaluate each filter rule in pipeline order
+
+    dups, when given, replaces the duplicate counts against recent_draws
+    (e.g. each row counted against the draws that preceded it).
+
+    Yields:
+    tuple: (rule name, description, boolean pass mask)
+    """
+    settings = get_filter_settings(settings)
+    min_sum, max_sum = settings['sum_range']
+
+    # Even/Odd distribution (2-3 even, 2-3 odd)
+    even = features['even']
+    yield 'even_odd', "Even/odd split 2-3", (even >= 2) & (even <= 3)
+
+    # Sequential numbers check
+    yield 'seq2', f"Sequential pairs <= {settings['max_seq2']}", features['seq2'] <= settings['max_seq2']
+    yield 'seq3', f"Sequential triplets <= {settings['max_seq3']}", features['seq3'] <= settings['max_seq3']
+
+    # Modular totals check
+    yield 'mod_tot', f"Modular total <= {settings['max_mod_tot']}", features['mod_tot'] <= settings['max_mod_tot']
+    yield 'mod_x', "No last digit 3+ times", features['mod_x'] == 0
+
+    # Decade distribution check (max 2 per decade)
+    decades = features['d0'] <= 2
+    for d in range(1, 5):
+        decades &= features[f'd{d}'] <= 2
+    yield 'decades', "At most 2 per decade", decades
+
+    # Historical duplicate check from previous draws
+    if dups is None and recent_draws is not None and len(recent_draws):
+        dups = duplicate_counts_batch(combos, recent_draws, masks)
+    if dups is not None:
+        limits = settings['dup_limits']
+        for i in range(min(len(limits), dups.shape[1])):
+            yield f'dup{i + 1}', f"Shares <= {limits[i]} with last {i + 1} draw(s)", dups[:, i] <= limits[i]
+
+    # Sum range check
+    total = features['sum']
+    yield 'sum_range', f"Sum {min_sum}-{max_sum}", (total >= min_sum) & (total <= max_sum)
+
+
+def _apply_rules(features, combos, settings, recent_draws, masks=None, dups=None):
+    """Combine every filter rule into one boolean mask"""
+    mask = None
+    for _, _, passed in _rule_masks(features, combos, settings, recent_draws, masks, dups):
+        if mask is None:
+            mask = passed
+        else:
+            mask &= passed
+    return mask
+
+
+def filter_batch(combos, settings=None, recent_draws=None):
+    """
+    Apply all filters to an array of combinations
+
+    Parameters:
+    combos (array-like): (N, 5) array of ball numbers
+    settings (dict): max_seq2, max_seq3, max_mod_tot and sum_range (defaults for missing keys)
+    recent_draws (list or RecentDrawMasks): Previous draws, most recent first, for the duplicate rules
+
+    Returns:
+    np.ndarray: (N,) boolean mask, True where the combination passes every filter
+    """
+    combos = np.asarray(combos, dtype=np.uint8).reshape(-1, 5)
+    features = compute_combo_features(combos)
+    return _apply_rules(features, combos, settings, recent_draws)
+
+
+def filter_table(table, settings=None, recent_draws=None, dups=None):
+    """
+    Apply all filters to the precomputed combination table (no feature recomputation)
+
+    dups may hold duplicate counts already computed for every table row
+    (see duplicate_counts_batch), e.g. when many settings share one history.
+    """
+    return _apply_rules(table, table.combos, settings, recent_draws, table.masks, dups)
+
+
+def filter_rules(combos, settings=None, dups=None):
+    """
+    Evaluate each filter rule separately for an array of combinations
+
+    Parameters:
+    combos (array-like): (N, 5) array of ball numbers
+    settings (dict): Filter settings (defaults for missing keys)
+    dups (np.ndarray): (N, len(DUP_LIMITS)) cumulative duplicate counts per row
+                       (the duplicate rules are skipped if omitted)
+
+    Returns:
+    list: (rule name, description, boolean pass mask) in pipeline order
+    """
+    combos = np.asarray(combos, dtype=np.uint8).reshape(-1, 5)
+    return list(_rule_masks(compute_combo_features(combos), combos, settings, None, dups=dups))
+
+
+def filter_pass_rates(table, settings=None, recent_draws=None):
+    """
+    Measure each filter rule against the full combination table
+
+    Parameters:
+    table (ComboTable): Precomputed combination table
+    settings (dict): Filter settings (defaults for missing keys)
+    recent_draws (list or RecentDrawMasks): Previous draws for the duplicate rules
+
+    Returns:
+    dict: total, survivors, elapsed_ms and one row per rule in pipeline order with
+          eliminated_alone (rule applied by itself), eliminated_in_order (by this
+          rule after the earlier ones) and remaining (survivors after this rule)
+    """
+    start = time.perf_counter()
+    total = len(table)
+    surviving = np.ones(total, dtype=bool)
+    remaining = total
+    rules = []
+
+    for name, description, passed in _rule_masks(table, table.combos, settings, recent_draws, table.masks):
+        passed_alone = int(np.count_nonzero(passed))
+        surviving &= passed
+        after = int(np.count_nonzero(surviving))
+        rules.append({
+            'rule': name,
+            'description': description,
+            'eliminated_alone': total - passed_alone,
+            'pass_rate': round(passed_alone / total * 100, 2),
+            'eliminated_in_order': remaining - after,
+            'remaining': after
+        })
+        remaining = after
+
+    return {
+        'total': total,
+        'survivors': remaining,
+        'survivor_rate': round(remaining / total * 100, 4),
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+        'rules': rules
+    }
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - Run Seeds and Manifests
+Every generator entry point takes an explicit seed. Each run records what
+produced its output (seed, filter settings, rank data, history snapshot and
+code version) in a manifest saved next to the output files, and the
+manifest's request key lets an identical request reuse an earlier run.
+"""
+
+import os
+import glob
+import json
+import random
+import hashlib
+import subprocess
+from datetime import datetime
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Manifest written next to an output file: foo.json -> foo.manifest.json
+MANIFEST_SUFFIX = '.manifest.json'
+
+# Manifest fields that determine a run's output (everything else is bookkeeping)
+REQUEST_FIELDS = ['generator', 'seed', 'count', 'settings', 'rank_limits', 'rank_counts',
+                  'history_snapshot', 'code_version']
+
+
+def seed_everything(seed=None):
+    """
+    Seed the global random and NumPy generators used by the generators
+
+    Parameters:
+    seed (int): Seed to use (a fresh one is drawn if None)
+
+    Returns:
+    int: The seed actually used, to be recorded in the manifest
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(32)
+    seed = int(seed)
+    random.seed(seed)
+    if NUMPY_AVAILABLE:
+        np.random.seed(seed % 2**32)
+    return seed
+
+
+_code_version = None
+
+
+def code_version():
+    """Git commit of the checkout ('unknown' when git is unavailable)"""
+    global _code_version
+
+    if _code_version is None:
+        try:
+            result = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, timeout=10,
+                                    cwd=os.path.dirname(os.path.abspath(__file__)))
+            _code_version = result.stdout.strip() if result.returncode == 0 else 'unknown'
+        except (OSError, subprocess.SubprocessError):
+            _code_version = 'unknown'
+    return _code_version
+
+
+def _digest(value):
+    """Stable hash of a JSON-serializable value"""
+    text = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def snapshot_id(*parts):
+    """Short id of a history snapshot (e.g. the recent draws or the latest draw date)"""
+    return _digest(parts)[:16]
+
+
+def build_manifest(generator, seed, count, settings, rank_limits=None, rank_counts=None,
+                   history_snapshot=None, outputs=None):
+    """
+    Describe a generation run
+
+    Parameters:
+    generator (str): Name of the generating module
+    seed (int): Seed the run used
+    count (int): Number of draws/predictions requested
+    settings (dict): Filter and mode settings that affect the output
+    rank_limits (list): Rank limits in effect
+    rank_counts (list): Rank counts in effect
+    history_snapshot (str): snapshot_id() of the history the run was based on
+    outputs (list): Output files of the run
+
+    Returns:
+    dict: Manifest including its request_key
+    """
+    manifest = {
+        'generator': generator,
+        'seed': seed,
+        'count': count,
+        'settings': settings,
+        'rank_limits': list(rank_limits) if rank_limits is not None else None,
+        'rank_counts': list(rank_counts) if rank_counts is not None else None,
+        'history_snapshot': history_snapshot,
+        'code_version': code_version(),
+        'created_at': datetime.now().isoformat(),
+        'outputs': list(outputs or [])
+    }
+    manifest['request_key'] = _digest({field: manifest[field] for field in REQUEST_FIELDS})
+    return manifest
+
+
+def manifest_path(output_file):
+    """Manifest location for an output file"""
+    base, _ = os.path.splitext(output_file)
+    return base + MANIFEST_SUFFIX
+
+
+def write_manifest(manifest, output_file):
+    """Write the manifest next to output_file and return its path"""
+    path = manifest_path(output_file)
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2, default=str)
+    print(f"Run manifest saved to {path}")
+    return path
+
+
+def find_cached_run(manifest, directory='.'):
+    """
+    Find an earlier run with the same request key whose outputs still exist
+
+    Returns:
+    dict: The earlier run's manifest (outputs resolved next to it), or None
+    """
+    for path in sorted(glob.glob(os.path.join(directory, '*' + MANIFEST_SUFFIX)), reverse=True):
+        try:
+            with open(path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if cached.get('request_key') != manifest['request_key'] or not cached.get('outputs'):
+            continue
+        # Outputs live next to their manifest
+        outputs = [os.path.join(os.path.dirname(path), os.path.basename(output)) for output in cached['outputs']]
+        if all(os.path.exists(output) for output in outputs):
+            cached['outputs'] = outputs
+            return cached
+    return None
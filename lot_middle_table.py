@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - Middle Triple Completion Table
+Precomputes every ascending middle triple (b2, b3, b4) grouped by sum, so
+completing a combination from its first and last balls is a short lookup
+keyed by (low, high, remaining_sum, evens_needed) instead of a triple loop
+over the whole number range.
+"""
+
+# GA Fantasy 5 game shape
+NUM_MAX = 42
+
+
+class MiddleTripleTable:
+    """Middle triples grouped by sum, each group in (b2, b3, b4) order"""
+
+    def __init__(self, max_value=NUM_MAX):
+        """
+        Parameters:
+        max_value (int): Highest ball number
+        """
+        self.max_value = max_value
+        self.by_sum = {}
+        for b2 in range(1, max_value + 1):
+            for b3 in range(b2 + 1, max_value + 1):
+                for b4 in range(b3 + 1, max_value + 1):
+                    evens = (b2 % 2 == 0) + (b3 % 2 == 0) + (b4 % 2 == 0)
+                    self.by_sum.setdefault(b2 + b3 + b4, []).append((b2, b3, b4, evens))
+        self._cache = {}
+
+    def triples(self, low, high, remaining_sum, evens_needed):
+        """
+        Middle triples strictly between low and high with the given sum and even count
+
+        Returns:
+        list: (b2, b3, b4) tuples in ascending order
+        """
+        return [(b2, b3, b4) for b2, b3, b4, evens in self.by_sum.get(remaining_sum, [])
+                if low < b2 and b4 < high and evens == evens_needed]
+
+    def closest(self, low, high, remaining_sum, evens_needed):
+        """
+        Exact matches if any exist, otherwise the closest triples
+
+        Closeness is sum difference * 10 + even-count difference, the measure
+        find_middle_values always used. An even-count difference is at most 3,
+        so the nearest sum that has any triple in range always wins.
+
+        Returns:
+        list: (b2, b3, b4) tuples in ascending order (empty if high - low < 4)
+        """
+        key = (low, high, remaining_sum, evens_needed)
+        if key in self._cache:
+            return self._cache[key]
+
+        best = self.triples(low, high, remaining_sum, evens_needed)
+        if best or high - low < 4:
+            self._cache[key] = best
+            return best
+
+        # No exact match: widen the sum until some triple fits between low and high
+        max_distance = abs(remaining_sum) + 3 * self.max_value
+        for distance in range(max_distance + 1):
+            sums = [remaining_sum] if distance == 0 else [remaining_sum - distance, remaining_sum + distance]
+            in_range = []
+            for total in sums:
+                in_range.extend((b2, b3, b4, evens) for b2, b3, b4, evens in self.by_sum.get(total, [])
+                                if low < b2 and b4 < high)
+            if in_range:
+                min_diff = min(abs(evens - evens_needed) for *_, evens in in_range)
+                best = sorted((b2, b3, b4) for b2, b3, b4, evens in in_range
+                              if abs(evens - evens_needed) == min_diff)
+                break
+
+        self._cache[key] = best
+        return best
+
+
+_middle_table = None
+
+
+def get_middle_table():
+    """Get the process-wide middle triple table, building it on first use"""
+    global _middle_table
+
+    if _middle_table is None:
+        _middle_table = MiddleTripleTable()
+    return _middle_table
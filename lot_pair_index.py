@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - Cumulative Pair Index
+Pair co-occurrence counts of a game's draw history, kept as flat
+(num_max + 1)^2 uint16 count matrices (cell [a][b], a < b, = draws holding
+both a and b). The running total is checkpointed every CHECKPOINT_INTERVAL
+draws, so the counts over the last L draws are the running total minus the
+checkpoint below the window start and the few draws after it - O(n^2) array
+arithmetic instead of re-querying and re-counting the draws. New draws are
+appended incrementally, and each window's matrix is cached until the next one.
+
+Top pairs come from argpartition over the count matrix, ordered by count,
+then most recent appearance, then pair - the order of the original
+per-request loops.
+"""
+
+import argparse
+from itertools import combinations
+
+import numpy as np
+
+from lot_combo_rank import NUM_MAX, NUMS_PER_DRAW
+
+# Draws between stored cumulative count matrices
+CHECKPOINT_INTERVAL = 64
+
+# Draw rows allocated for an empty index
+INITIAL_CAPACITY = 1024
+
+
+def pair_ids(balls, num_max=NUM_MAX):
+    """
+    Flat matrix cell of every pair in each draw
+
+    Parameters:
+    balls (array-like): (N, k) ball numbers
+    num_max (int): Highest ball number
+
+    Returns:
+    np.ndarray: (N, C(k, 2)) int32 ids, id = a * (num_max + 1) + b with a < b
+    """
+    balls = np.sort(np.asarray(balls, dtype=np.int32), axis=1)
+    columns = [balls[:, i] * (num_max + 1) + balls[:, j]
+               for i, j in combinations(range(balls.shape[1]), 2)]
+    return np.stack(columns, axis=1) if columns else np.empty((len(balls), 0), dtype=np.int32)
+
+
+def pair_matrix(balls, num_max=NUM_MAX):
+    """
+    Pair counts of a set of draws
+
+    Returns:
+    np.ndarray: (num_max + 1, num_max + 1) int64, upper triangle holds the counts
+    """
+    counts = np.bincount(pair_ids(balls, num_max).ravel(), minlength=(num_max + 1) ** 2)
+    return counts.reshape(num_max + 1, num_max + 1)
+
+
+def top_pairs(matrix, count, recency=None):
+    """
+    The most frequent pairs of a count matrix
+
+    Parameters:
+    matrix (np.ndarray): (n, n) pair counts
+    count (int): Number of pairs (fewer if fewer pairs occur)
+    recency (np.ndarray): Same-shape tie-break, higher first (e.g. last draw index)
+
+    Returns:
+    tuple: (num1, num2, counts) arrays, by count, then recency, then pair
+    """
+    flat = np.asarray(matrix).ravel()
+    ids = np.flatnonzero(flat)
+    if count < len(ids):
+        # Every pair tied with the count-th largest stays a candidate for the tie-break
+        values = flat[ids]
+        threshold = values[np.argpartition(values, -count)[-count:]].min()
+        ids = ids[values >= threshold]
+
+    tie_break = np.zeros(len(ids)) if recency is None else np.asarray(recency).ravel()[ids]
+    ids = ids[np.lexsort((ids, -tie_break, -flat[ids].astype(np.int64)))][:count]
+    side = matrix.shape[1]
+    return ids // side, ids % side, flat[ids]
+
+
+class PairIndex:
+    """Checkpointed cumulative pair counts of one game's draws, oldest first"""
+
+    def __init__(self, num_max=NUM_MAX, balls_drawn=NUMS_PER_DRAW, checkpoint_interval=CHECKPOINT_INTERVAL):
+        """
+        Parameters:
+        num_max (int): Highest ball number
+        balls_drawn (int): Balls per draw
+        checkpoint_interval (int): Draws between stored cumulative matrices
+        """
+        self.num_max = num_max
+        self.balls_drawn = balls_drawn
+        self.checkpoint_interval = checkpoint_interval
+        self.dates = []
+        # Rows load_new_draws dropped for not being newer than the latest indexed draw
+        self.skipped_draws = 0
+
+        cells = (num_max + 1) ** 2
+        self._pairs = np.empty((INITIAL_CAPACITY, len(list(combinations(range(balls_drawn), 2)))), dtype=np.int32)
+        self._current = np.zeros(cells, dtype=np.uint16)
+        self._checkpoints = [self._current.copy()]
+        self._last_seen = np.full(cells, -1, dtype=np.int32)
+        self._windows = {}
+
+    def __len__(self):
+        return len(self.dates)
+
+    @property
+    def latest_date(self):
+        return self.dates[-1] if self.dates else None
+
+    def append(self, draw_date, balls):
+        """
+        Add the next draw
+
+        Parameters:
+        draw_date: Draw date (kept for the last-appearance column)
+        balls (list): The balls_drawn ball numbers
+        """
+        size = len(self.dates)
+        if size == len(self._pairs):
+            grown = np.empty((2 * size, self._pairs.shape[1]), dtype=self._pairs.dtype)
+            grown[:size] = self._pairs
+            self._pairs = grown
+
+        ids = pair_ids([balls], self.num_max)[0]
+        self._pairs[size] = ids
+        self._current[ids] += 1
+        self._last_seen[ids] = size
+        self.dates.append(draw_date)
+        if (size + 1) % self.checkpoint_interval == 0:
+            self._checkpoints.append(self._current.copy())
+        self._windows.clear()
+
+    def _cumulative(self, index):
+        """Pair counts of the first index draws: a checkpoint plus the draws after it"""
+        if index == len(self.dates):
+            return self._current
+        base = index // self.checkpoint_interval
+        counts = self._checkpoints[base].copy()
+        tail = self._pairs[base * self.checkpoint_interval:index].ravel()
+        counts += np.bincount(tail, minlength=len(counts)).astype(np.uint16)
+        return counts
+
+    def counts(self, last=None):
+        """
+        Pair counts over the last draws (all draws when last is None)
+
+        Returns:
+        np.ndarray: Read-only (num_max + 1, num_max + 1) uint16 matrix, upper
+                    triangle holds the counts; cached until the next append
+        """
+        start = 0 if last is None else min(max(len(self.dates) - last, 0), len(self.dates))
+        if start not in self._windows:
+            window = (self._current - self._cumulative(start)).reshape(self.num_max + 1, self.num_max + 1)
+            window.flags.writeable = False
+            self._windows[start] = window
+        return self._windows[start]
+
+    def top_pairs(self, count, last=None):
+        """
+        The most frequent pairs of the last draws
+
+        Returns:
+        list: Dicts with num1, num2, count and last_date (most recent draw holding the pair)
+        """
+        matrix = self.counts(last)
+        num1, num2, pair_counts = top_pairs(matrix, count, self._last_seen)
+        last_seen = self._last_seen.reshape(matrix.shape)[num1, num2]
+        return [{'num1': a, 'num2': b, 'count': c, 'last_date': self.dates[i]}
+                for a, b, c, i in zip(num1.tolist(), num2.tolist(), pair_counts.tolist(), last_seen.tolist())]
+
+    def _indexed_on_last_day(self, balls):
+        """Whether a draw with these balls is already indexed on the latest day"""
+        pairs = set(pair_ids([balls], self.num_max)[0].tolist())
+        index = len(self.dates) - 1
+        while index >= 0 and self.dates[index] == self.latest_date:
+            if set(self._pairs[index].tolist()) == pairs:
+                return True
+            index -= 1
+        return False
+
+    def load_new_draws(self, cursor, table):
+        """
+        Append the draws of table newer than the latest indexed one
+
+        Rows dated on the latest indexed day are kept; rows dated before it (out of
+        order) and repeats of an indexed draw (same date and balls) are counted in
+        skipped_draws and reported.
+
+        Parameters:
+        cursor: Dictionary cursor on the lottery database
+        table (str): Draw table (date, b1..b<balls_drawn> columns)
+
+        Returns:
+        int: Number of draws added
+        """
+        columns = ', '.join(f'b{i}' for i in range(1, self.balls_drawn + 1))
+        if self.dates:
+            cursor.execute(f"SELECT date, {columns} FROM {table} WHERE date > %s ORDER BY date", (self.latest_date,))
+        else:
+            cursor.execute(f"SELECT date, {columns} FROM {table} ORDER BY date")
+
+        added = 0
+        skipped = []
+        for row in cursor.fetchall():
+            balls = [int(row[f'b{i}']) for i in range(1, self.balls_drawn + 1)]
+            if self.dates and (row['date'] < self.latest_date or
+                               (row['date'] == self.latest_date and self._indexed_on_last_day(balls))):
+                skipped.append(str(row['date']))
+                continue
+            self.append(row['date'], balls)
+            added += 1
+
+        if skipped:
+            self.skipped_draws += len(skipped)
+            print(f"Warning: skipped {len(skipped)} {table} out-of-order or repeated draw(s) "
+                  f"({', '.join(skipped[:5])}{', ...' if len(skipped) > 5 else ''})")
+        return added
+
+
+_pair_indexes = {}
+
+
+def load_pair_index(cursor, table, num_max=NUM_MAX, balls_drawn=NUMS_PER_DRAW):
+    """
+    Get the process-wide pair index of a draw table, bringing it up to date
+
+    The first call per table loads every draw; later calls only fetch newer draws.
+
+    Returns:
+    PairIndex: The shared index of table
+    """
+    index = _pair_indexes.get(table)
+    if index is None:
+        index = _pair_indexes[table] = PairIndex(num_max, balls_drawn)
+    index.load_new_draws(cursor, table)
+    return index
+
+
+if __name__ == "__main__":
+    import time
+
+    import mysql.connector
+
+    from lot_backtest import DEFAULT_DB_CONFIG
+
+    parser = argparse.ArgumentParser(description="GA Fantasy 5 Pair Co-occurrence Index")
+    parser.add_argument("--table", default="ga_f5_draws", help="Draw table")
+    parser.add_argument("--limit", type=int, default=30, help="Window of most recent draws")
+    parser.add_argument("--top", type=int, default=20, help="Number of pairs to print")
+
+    args = parser.parse_args()
+
+    conn = mysql.connector.connect(**DEFAULT_DB_CONFIG)
+    cursor = conn.cursor(dictionary=True)
+    start = time.perf_counter()
+    index = load_pair_index(cursor, args.table)
+    print(f"Indexed {len(index)} draws in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    pairs = index.top_pairs(args.top, args.limit)
+    print(f"Top pairs of the last {args.limit} draws in {(time.perf_counter() - start) * 1000:.2f} ms")
+    for pair in pairs:
+        print(f"{pair['num1']:2d}-{pair['num2']:2d}  {pair['count']:3d}  {pair['last_date']}")
+    cursor.close()
+    conn.close()
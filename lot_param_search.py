@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - Walk-Forward Filter Parameter Search
+Grid or random search over the filter settings (max_seq2, max_seq3,
+max_mod_tot, sum_range, duplicate limits) and the cover score weights.
+
+Every configuration is measured on the backtest (each historical winner
+seen with only the draws before it, split into consecutive folds) against
+the size of the filtered space it leaves. The selection rule is then checked
+walk-forward: for each fold after the first, the configuration it picks from
+the earlier folds alone is scored on that fold, and the pooled out-of-sample
+pass rate (and winner percentile for the weights) is reported next to the
+in-sample table. Configurations run
+on a process pool; the immutable precomputed arrays (winner features and
+duplicate counts, the full space's duplicate counts, the reference score
+components) are placed in shared memory once and attached by every worker,
+and the combination table itself is memory-mapped by each worker.
+
+The result is a Pareto table (most winners kept for the smallest space),
+saved as JSON for the dashboard, which takes its defaults from the
+recommended row.
+"""
+
+import argparse
+import itertools
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from lot_backtest import Backtest, load_history
+from lot_combo_table import load_combo_table
+from lot_filter_batch import DUP_LIMITS, duplicate_counts_batch, filter_rules, filter_table
+from lot_scoring import SCORE_WEIGHTS, ScoringContext, combine_components, score_batch
+
+# Saved search result loaded by the dashboard
+PARETO_FILE = "filter_search_pareto.json"
+
+# Values searched for each filter setting
+SEARCH_GRID = {
+    'max_seq2': [0, 1, 2],
+    'max_seq3': [0, 1],
+    'max_mod_tot': [0, 1, 2],
+    'sum_range': [(60, 150), (70, 139), (80, 130), (90, 120)],
+    'dup_limits': [(1, 2, 3), (2, 2, 3), (1, 2, 4), (2, 3, 4), (2, 3, 5)]
+}
+
+# Walk-forward folds (consecutive slices of the history)
+FOLDS = 5
+
+# Random reference combinations each winner's score is ranked against
+REFERENCE_SAMPLE = 256
+
+# Random cover weight sets tried besides the current SCORE_WEIGHTS['cover']
+WEIGHT_SAMPLES = 16
+
+# The recommended row must keep at least this share of winners in every (training) fold
+MIN_PASS_RATE = 25.0
+
+# Score components that do not depend on the draw date
+STATIC_COMPONENTS = ('even_odd', 'decade', 'sequential', 'rank')
+
+
+class SharedArrays:
+    """Named NumPy arrays copied once into shared memory blocks"""
+
+    def __init__(self, arrays):
+        """
+        Parameters:
+        arrays (dict): Name -> np.ndarray
+        """
+        self.blocks = []
+        self.specs = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self.blocks.append(block)
+            self.specs[name] = (block.name, array.shape, array.dtype.str)
+
+    @staticmethod
+    def attach(specs):
+        """
+        Map the arrays described by specs (in another process)
+
+        Returns:
+        tuple: (arrays, blocks) - read-only arrays and the blocks that must stay referenced
+        """
+        arrays, blocks = {}, []
+        for name, (block_name, shape, dtype) in specs.items():
+            block = shared_memory.SharedMemory(name=block_name)
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            array.flags.writeable = False
+            arrays[name] = array
+            blocks.append(block)
+        return arrays, blocks
+
+    def close(self):
+        """Release and remove every block"""
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+def search_arrays(backtest, recent_draws, rank_limits=None, rank_counts=None,
+                  folds=FOLDS, reference_sample=REFERENCE_SAMPLE, seed=0):
+    """
+    Precompute everything the configurations share
+
+    Parameters:
+    backtest (Backtest): Rolling per-draw state of the history
+    recent_draws (list): Latest draws, most recent first (the filtered space is sized against them)
+    rank_limits (list): Rank limits for the cover rank component
+    rank_counts (list): Rank counts for the cover rank component
+    folds (int): Consecutive folds of the history
+    reference_sample (int): Random combinations each winner is ranked against
+    seed (int): Seed of the reference sample
+
+    Returns:
+    dict: Name -> array
+    """
+    table = load_combo_table()
+    fold = (np.arange(len(backtest)) * folds // max(len(backtest), 1)).astype(np.int16)
+    arrays = {
+        'balls': backtest.balls,
+        'dups': backtest.dups,
+        'fold': fold,
+        'fold_sizes': np.bincount(fold, minlength=folds),
+        'space_dups': duplicate_counts_batch(table.combos, recent_draws[:len(DUP_LIMITS)], table.masks)
+    }
+
+    # Winner components, each against its own history
+    context = ScoringContext(backtest.frequency, backtest.avg_sum, None, rank_limits, rank_counts)
+    _, components = score_batch(backtest.balls, context, model='cover')
+    for name in SCORE_WEIGHTS['cover'].keys() | {'sequential'}:
+        arrays[f'win_{name}'] = components[name]
+
+    # Reference components: static ones once, frequency and sum once per draw (in chunks)
+    rng = np.random.default_rng(seed)
+    reference = np.asarray(table.combos[np.sort(rng.choice(len(table), reference_sample, replace=False))])
+    _, components = score_batch(reference, ScoringContext(rank_limits=rank_limits, rank_counts=rank_counts), model='cover')
+    for name in STATIC_COMPONENTS:
+        arrays[f'ref_{name}'] = components[name]
+
+    frequency = np.empty((len(backtest), reference_sample), dtype=np.float32)
+    sums = np.empty((len(backtest), reference_sample), dtype=np.float32)
+    chunk = max(1, 65536 // reference_sample)
+    for start in range(0, len(backtest), chunk):
+        stop = min(start + chunk, len(backtest))
+        context = ScoringContext(np.repeat(backtest.frequency[start:stop], reference_sample, axis=0),
+                                 np.repeat(backtest.avg_sum[start:stop], reference_sample))
+        _, components = score_batch(np.tile(reference, (stop - start, 1)), context, model='cover')
+        frequency[start:stop] = components['frequency'].reshape(-1, reference_sample)
+        sums[start:stop] = components['sum'].reshape(-1, reference_sample)
+    arrays['ref_frequency'] = frequency
+    arrays['ref_sum'] = sums
+    return arrays
+
+
+def filter_configurations(samples=None, seed=0):
+    """Every SEARCH_GRID combination, or a random subset of samples of them"""
+    names = list(SEARCH_GRID)
+    configs = [dict(zip(names, values)) for values in itertools.product(*(SEARCH_GRID[name] for name in names))]
+    if samples is not None and samples < len(configs):
+        configs = random.Random(seed).sample(configs, samples)
+    return configs
+
+
+def weight_configurations(samples=WEIGHT_SAMPLES, seed=0):
+    """The current cover weights followed by random weight sets (each summing to 1)"""
+    names = list(SCORE_WEIGHTS['cover'])
+    rng = np.random.default_rng(seed)
+    configs = [dict(SCORE_WEIGHTS['cover'])]
+    for weights in rng.dirichlet(np.ones(len(names)), samples):
+        weights = np.round(weights, 2)
+        weights[-1] = max(0.0, round(1 - weights[:-1].sum(), 2))
+        configs.append(dict(zip(names, (float(w) for w in weights))))
+    return configs
+
+
+def evaluate_filters(settings, arrays):
+    """
+    Per-fold pass counts and filtered space size of one filter configuration
+
+    Returns:
+    dict: settings, fold_passed (winners kept per fold), space_size, space_rate and
+          the summary columns of fold_summary over every fold
+    """
+    passed = np.ones(len(arrays['balls']), dtype=bool)
+    for _, _, rule_passed in filter_rules(arrays['balls'], settings, arrays['dups']):
+        passed &= rule_passed
+
+    fold_passed = np.bincount(arrays['fold'], weights=passed, minlength=len(arrays['fold_sizes']))
+    table = load_combo_table()
+    space_size = int(np.count_nonzero(filter_table(table, settings, dups=arrays['space_dups'])))
+
+    row = {
+        'settings': {name: list(value) if isinstance(value, tuple) else value for name, value in settings.items()},
+        'fold_passed': [int(count) for count in fold_passed],
+        'space_size': space_size,
+        'space_rate': round(space_size / len(table) * 100, 3)
+    }
+    row.update(fold_summary(row, arrays['fold_sizes']))
+    return row
+
+
+def fold_summary(row, fold_sizes, folds=None):
+    """
+    Pass rates of a filter row over a subset of the folds
+
+    Parameters:
+    row (dict): evaluate_filters row
+    fold_sizes (list): Winners per fold
+    folds (int): Use only the first folds folds (None = all of them)
+
+    Returns:
+    dict: pass_rate, fold_pass_rates, worst_fold_pass_rate and lift (pass rate / space rate)
+    """
+    passed = np.asarray(row['fold_passed'][:folds], dtype=np.float64)
+    sizes = np.asarray(fold_sizes[:folds], dtype=np.float64)
+    fold_rates = passed / np.maximum(sizes, 1) * 100
+    pass_rate = float(passed.sum() / sizes.sum() * 100) if sizes.sum() else 0.0
+    return {
+        'pass_rate': round(pass_rate, 2),
+        'fold_pass_rates': [round(float(rate), 2) for rate in fold_rates],
+        'worst_fold_pass_rate': round(float(fold_rates.min()), 2) if len(fold_rates) else 0.0,
+        'lift': round(pass_rate / row['space_rate'], 3) if row['space_size'] else 0.0
+    }
+
+
+def evaluate_weights(weights, arrays):
+    """
+    How highly one set of cover weights ranks each winner among random combinations
+
+    Returns:
+    dict: weights, winner_percentile (mean percentile of the winner's score
+          among the reference sample, 50 = no better than chance) and per fold
+    """
+    winner = combine_components({name: arrays[f'win_{name}'] for name in weights.keys() | {'sequential'}},
+                                'cover', weights)
+    reference = {name: arrays[f'ref_{name}'] for name in STATIC_COMPONENTS}
+    reference.update(frequency=arrays['ref_frequency'], sum=arrays['ref_sum'])
+    reference = combine_components(reference, 'cover', weights)
+
+    # Ties count half, so identical scoring everywhere gives 50
+    percentile = ((reference < winner[:, None]).mean(axis=1) + (reference == winner[:, None]).mean(axis=1) / 2) * 100
+    fold_percentiles = np.bincount(arrays['fold'], weights=percentile,
+                                   minlength=len(arrays['fold_sizes'])) / np.maximum(arrays['fold_sizes'], 1)
+
+    return {
+        'weights': weights,
+        'winner_percentile': round(float(percentile.mean()), 2) if len(percentile) else 50.0,
+        'fold_percentiles': [round(float(value), 2) for value in fold_percentiles]
+    }
+
+
+def pareto_front(rows):
+    """Rows no other row beats on both pass rate (higher) and space size (smaller), by space size"""
+    front = []
+    best_pass_rate = -1.0
+    for row in sorted(rows, key=lambda r: (r['space_size'], -r['pass_rate'])):
+        if row['pass_rate'] > best_pass_rate:
+            front.append(row)
+            best_pass_rate = row['pass_rate']
+    return front
+
+
+def recommend(front, min_pass_rate=MIN_PASS_RATE):
+    """Index of the highest-lift row that keeps min_pass_rate in every fold (else the highest pass rate)"""
+    eligible = [i for i, row in enumerate(front) if row['worst_fold_pass_rate'] >= min_pass_rate]
+    if eligible:
+        return max(eligible, key=lambda i: front[i]['lift'])
+    return max(range(len(front)), key=lambda i: front[i]['pass_rate']) if front else None
+
+
+def walk_forward(filter_rows, weight_rows, fold_sizes, min_pass_rate=MIN_PASS_RATE):
+    """
+    Out-of-sample check of the selection rules
+
+    For each fold after the first, the filter row is chosen by pareto_front and
+    recommend over the earlier folds only, and the weight set by its mean winner
+    percentile over the earlier folds; both are then scored on that fold.
+
+    Returns:
+    dict: steps (per tested fold: the chosen settings and weights with their
+          training and test results), out_of_sample_pass_rate and
+          out_of_sample_percentile pooled over the tested folds
+    """
+    sizes = np.asarray(fold_sizes, dtype=np.float64)
+    steps = []
+    for fold in range(1, len(sizes)):
+        if not sizes[fold] or not sizes[:fold].sum():
+            continue
+        step = {'fold': fold, 'draws': int(sizes[fold])}
+
+        front = pareto_front([dict(row, **fold_summary(row, fold_sizes, fold)) for row in filter_rows])
+        chosen = recommend(front, min_pass_rate)
+        if chosen is not None:
+            row = front[chosen]
+            step.update(settings=row['settings'], train_pass_rate=row['pass_rate'],
+                        test_passed=row['fold_passed'][fold],
+                        test_pass_rate=round(row['fold_passed'][fold] / sizes[fold] * 100, 2))
+
+        if weight_rows:
+            training = [float(np.dot(row['fold_percentiles'][:fold], sizes[:fold]) / sizes[:fold].sum())
+                        for row in weight_rows]
+            best = int(np.argmax(training))
+            step.update(weights=weight_rows[best]['weights'], train_percentile=round(training[best], 2),
+                        test_percentile=weight_rows[best]['fold_percentiles'][fold])
+        steps.append(step)
+
+    filter_steps = [step for step in steps if 'settings' in step]
+    weight_steps = [step for step in steps if 'weights' in step]
+    return {
+        'steps': steps,
+        'out_of_sample_pass_rate': _pooled(filter_steps, lambda step: step['test_passed'] * 100),
+        'out_of_sample_percentile': _pooled(weight_steps, lambda step: step['test_percentile'] * step['draws'])
+    }
+
+
+def _pooled(steps, total):
+    """Sum of total(step) over the steps per tested draw, None without steps"""
+    draws = sum(step['draws'] for step in steps)
+    return round(sum(total(step) for step in steps) / draws, 2) if draws else None
+
+
+# Shared arrays attached by each worker process (set by _init_worker)
+_worker_arrays = None
+_worker_blocks = None
+
+
+def _init_worker(specs):
+    """Process pool initializer - attach the shared arrays once per worker"""
+    global _worker_arrays, _worker_blocks
+    _worker_arrays, _worker_blocks = SharedArrays.attach(specs)
+
+
+def _run_task(task):
+    """Process pool entry point for one configuration"""
+    kind, config = task
+    if kind == 'filters':
+        return kind, evaluate_filters(config, _worker_arrays)
+    return kind, evaluate_weights(config, _worker_arrays)
+
+
+def run_search(backtest, recent_draws, rank_limits=None, rank_counts=None, workers=1, samples=None,
+               weight_samples=WEIGHT_SAMPLES, folds=FOLDS, min_pass_rate=MIN_PASS_RATE, seed=0):
+    """
+    Evaluate every configuration and build the Pareto table
+
+    Parameters:
+    backtest (Backtest): Rolling per-draw state of the history
+    recent_draws (list): Latest draws, most recent first
+    workers (int): Worker processes (1 evaluates in this process)
+    samples (int): Random filter configurations to try (None = the full grid)
+    weight_samples (int): Random cover weight sets to try
+    folds (int): Consecutive folds of the history (walk-forward steps = folds - 1)
+    min_pass_rate (float): Minimum worst-fold pass rate of the recommended row
+    seed (int): Seed of the random choices
+
+    Returns:
+    dict: Search summary with the pareto rows, the recommended index, the ranked
+          weights and the walk_forward check of both selections
+    """
+    global _worker_arrays
+
+    start = time.perf_counter()
+    arrays = search_arrays(backtest, recent_draws, rank_limits, rank_counts, folds, seed=seed)
+    tasks = ([('filters', config) for config in filter_configurations(samples, seed)] +
+             [('weights', config) for config in weight_configurations(weight_samples, seed)])
+
+    if workers > 1:
+        shared = SharedArrays(arrays)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(shared.specs,)) as executor:
+                results = list(executor.map(_run_task, tasks, chunksize=8))
+        finally:
+            shared.close()
+    else:
+        _worker_arrays = arrays
+        results = [_run_task(task) for task in tasks]
+
+    filter_rows = [row for kind, row in results if kind == 'filters']
+    weight_rows = sorted((row for kind, row in results if kind == 'weights'),
+                         key=lambda row: row['winner_percentile'], reverse=True)
+    front = pareto_front(filter_rows)
+    first_date, last_date = backtest.date_range()
+
+    return {
+        'generated_at': datetime.now().isoformat(),
+        'draws': len(backtest),
+        'first_date': first_date,
+        'last_date': last_date,
+        'folds': folds,
+        'recent_draws': [list(map(int, draw)) for draw in recent_draws[:len(DUP_LIMITS)]],
+        'configurations': len(filter_rows),
+        'elapsed_s': round(time.perf_counter() - start, 2),
+        'pareto': front,
+        'recommended': recommend(front, min_pass_rate),
+        'weights': weight_rows,
+        'walk_forward': walk_forward(filter_rows, weight_rows, arrays['fold_sizes'].tolist(), min_pass_rate)
+    }
+
+
+def load_pareto_table(path=PARETO_FILE):
+    """Saved search result, or None if no search has been run"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def recommended_settings(path=PARETO_FILE):
+    """
+    Dashboard settings of the recommended Pareto row
+
+    Returns:
+    dict: max_seq2, max_seq3, max_mod_tot, sum_min, sum_max, dup1-dup3 (empty without a saved search)
+    """
+    result = load_pareto_table(path)
+    if not result or result.get('recommended') is None:
+        return {}
+
+    settings = result['pareto'][result['recommended']]['settings']
+    dashboard = {name: settings[name] for name in ('max_seq2', 'max_seq3', 'max_mod_tot')}
+    dashboard['sum_min'], dashboard['sum_max'] = settings['sum_range']
+    for i, limit in enumerate(settings['dup_limits'], 1):
+        dashboard[f'dup{i}'] = limit
+    return dashboard
+
+
+if __name__ == "__main__":
+    from lot_cover_1000 import GAFantasy5Generator
+
+    parser = argparse.ArgumentParser(description="GA Fantasy 5 Walk-Forward Filter Parameter Search")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes")
+    parser.add_argument("--samples", type=int, help="Random filter configurations (default: the full grid)")
+    parser.add_argument("--weight-samples", type=int, default=WEIGHT_SAMPLES, help="Random cover weight sets")
+    parser.add_argument("--folds", type=int, default=FOLDS, help="Consecutive history folds (walk-forward steps + 1)")
+    parser.add_argument("--min-pass-rate", type=float, default=MIN_PASS_RATE,
+                        help="Minimum worst-fold pass rate of the recommended configuration")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random choices")
+    parser.add_argument("--output", default=PARETO_FILE, help="Pareto table file")
+
+    args = parser.parse_args()
+
+    days, balls = load_history()
+    if not len(days):
+        raise SystemExit("No draw history available")
+    backtest = Backtest(days, balls)
+    recent_draws = balls[::-1][:len(DUP_LIMITS)].tolist()
+    generator = GAFantasy5Generator()
+
+    result = run_search(backtest, recent_draws, generator.rank_limits, generator.rank_counts, args.workers,
+                        args.samples, args.weight_samples, args.folds, args.min_pass_rate, args.seed)
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2)
+
+    print(f"\n{result['configurations']} configurations over {result['draws']} draws "
+          f"({result['first_date']} to {result['last_date']}) in {result['elapsed_s']}s")
+    print(f"{'':2}{'seq2':>5}{'seq3':>5}{'mod':>5}{'sum':>10}{'dups':>10}{'pass %':>8}{'worst %':>9}"
+          f"{'space':>9}{'lift':>7}")
+    for i, row in enumerate(result['pareto']):
+        settings = row['settings']
+        marker = '* ' if i == result['recommended'] else '  '
+        print(f"{marker}{settings['max_seq2']:>5}{settings['max_seq3']:>5}{settings['max_mod_tot']:>5}"
+              f"{'-'.join(map(str, settings['sum_range'])):>10}{'/'.join(map(str, settings['dup_limits'])):>10}"
+              f"{row['pass_rate']:>8}{row['worst_fold_pass_rate']:>9}{row['space_size']:>9}{row['lift']:>7}")
+    best = result['weights'][0]
+    print(f"\nBest cover weights (winner percentile {best['winner_percentile']}): {best['weights']}")
+
+    check = result['walk_forward']
+    print(f"\nWalk-forward (select on earlier folds, test on the next):")
+    for step in check['steps']:
+        settings = step['settings']
+        chosen = (f"{settings['max_seq2']}/{settings['max_seq3']}/{settings['max_mod_tot']} "
+                  f"{'-'.join(map(str, settings['sum_range']))} {'/'.join(map(str, settings['dup_limits']))}")
+        print(f"  fold {step['fold']} ({step['draws']} draws): {chosen:<24} pass {step['train_pass_rate']}% -> "
+              f"{step['test_pass_rate']}%, weights percentile {step['train_percentile']} -> {step['test_percentile']}")
+    print(f"Out-of-sample pass rate {check['out_of_sample_pass_rate']}%, "
+          f"winner percentile {check['out_of_sample_percentile']}")
+    print(f"Pareto table saved to {args.output}")
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - Filtered Space Sampler
+Materializes the ids of every combination that passes the filters once per
+settings + history snapshot and draws from that array - uniformly, or in
+proportion to a weight through an alias table - so drawing costs the same
+however selective the filters are, and impossible requests fail at once.
+"""
+
+import numpy as np
+
+from lot_combo_table import load_combo_table
+from lot_filter_batch import filter_table, get_filter_settings
+from lot_manifest import snapshot_id
+
+# Samplers kept per process (one per settings + history snapshot)
+SAMPLER_CACHE_SIZE = 8
+
+
+class InsufficientCombinationsError(ValueError):
+    """Fewer combinations satisfy the filters than were requested"""
+
+    def __init__(self, available, requested):
+        self.available = available
+        self.requested = requested
+        super().__init__(f"Only {available} combinations satisfy these filters ({requested} requested)")
+
+
+class AliasTable:
+    """Walker/Vose alias table: constant-time weighted draws after linear setup"""
+
+    def __init__(self, weights):
+        """
+        Parameters:
+        weights (array-like): Non-negative weights, not all zero
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(weights) == 0 or weights.min() < 0 or weights.sum() <= 0:
+            raise ValueError("Alias table weights must be non-negative and not all zero")
+
+        n = len(weights)
+        self.support = int(np.count_nonzero(weights))
+        scaled = weights * (n / weights.sum())
+        self.prob = np.ones(n)
+        self.alias = np.arange(n)
+
+        small = np.flatnonzero(scaled < 1).tolist()
+        large = np.flatnonzero(scaled >= 1).tolist()
+        scaled = scaled.tolist()
+        prob, alias = self.prob, self.alias
+        while small and large:
+            less, more = small.pop(), large.pop()
+            prob[less] = scaled[less]
+            alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+        # Leftovers are 1 up to rounding error
+        for index in small + large:
+            prob[index] = 1
+
+    def __len__(self):
+        return len(self.prob)
+
+    def draw(self, size, rng):
+        """Draw size indexes (with replacement) using a numpy Generator"""
+        columns = rng.integers(0, len(self.prob), size)
+        return np.where(rng.random(size) < self.prob[columns], columns, self.alias[columns])
+
+
+class FilteredSampler:
+    """Draws from the ids of every combination that passes the filters"""
+
+    def __init__(self, ids):
+        """
+        Parameters:
+        ids (np.ndarray): uint32 ids (see lot_combo_rank) of the valid combinations
+        """
+        self.ids = ids
+        self._alias_tables = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def require(self, count):
+        """Raise InsufficientCombinationsError unless count draws are possible"""
+        if count > len(self.ids):
+            raise InsufficientCombinationsError(len(self.ids), count)
+
+    def alias_table(self, key, weights_fn):
+        """
+        Alias table over the valid ids, built once per weights key
+
+        Parameters:
+        key (hashable): Identifies the weights (e.g. the scoring snapshot)
+        weights_fn (callable): ids -> weight array, called on the first use of a key
+        """
+        if key not in self._alias_tables:
+            self._alias_tables[key] = AliasTable(weights_fn(self.ids))
+        return self._alias_tables[key]
+
+    def sample(self, count, rng=None, alias=None):
+        """
+        Draw distinct combination ids
+
+        Parameters:
+        count (int): Number of ids
+        rng (np.random.Generator): Random stream (derived from the seeded global state if omitted)
+        alias (AliasTable): Draw in proportion to these weights instead of uniformly
+
+        Returns:
+        np.ndarray: count distinct ids in draw order
+        """
+        self.require(count)
+        if rng is None:
+            rng = np.random.default_rng(np.random.randint(0, 2**32, dtype=np.uint64))
+
+        if alias is None:
+            return self.ids[rng.choice(len(self.ids), count, replace=False)]
+
+        if count > alias.support:
+            raise InsufficientCombinationsError(alias.support, count)
+
+        # Weighted draws with replacement, keeping the first occurrence of each id
+        positions = np.empty(0, dtype=np.int64)
+        while len(positions) < count:
+            batch = alias.draw(2 * (count - len(positions)) + 16, rng)
+            positions = np.concatenate([positions, batch])
+            _, first = np.unique(positions, return_index=True)
+            positions = positions[np.sort(first)]
+        return self.ids[positions[:count]]
+
+
+_samplers = {}
+
+
+def get_filtered_sampler(settings=None, recent_draws=None, recent_masks=None):
+    """
+    Get the sampler for a settings + history snapshot, enumerating it on first use
+
+    Parameters:
+    settings (dict): Filter settings (defaults for missing keys)
+    recent_draws (list): Recent draws, most recent first, for the duplicate rules
+    recent_masks (RecentDrawMasks): Precomputed masks of recent_draws (optional)
+
+    Returns:
+    FilteredSampler: Sampler shared by every caller with the same snapshot
+    """
+    settings = get_filter_settings(settings)
+    recent = [sorted(int(num) for num in draw) for draw in (recent_draws or [])]
+    key = snapshot_id(settings, recent)
+
+    if key not in _samplers:
+        mask = filter_table(load_combo_table(), settings, recent_masks if recent_masks is not None else recent)
+        if len(_samplers) >= SAMPLER_CACHE_SIZE:
+            _samplers.pop(next(iter(_samplers)))
+        _samplers[key] = FilteredSampler(np.flatnonzero(mask).astype(np.uint32))
+    return _samplers[key]
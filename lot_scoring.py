@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - Scoring Context
+Holds everything _calculate_score needs from the database (30-day number
+frequency, 365-day average sum, col1 lookup, rank data) so it is loaded once
+per generation - or once per new draw - and scoring itself issues no queries.
+
+score_batch() applies the same scoring rules to whole arrays of combinations.
+"""
+
+from datetime import date
+
+try:
+    import numpy as np
+    from lot_combo_table import compute_combo_features
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# GA Fantasy 5 game shape
+NUM_MAX = 42
+
+# Defaults used when the database is unavailable
+DEFAULT_AVG_SUM = 100
+FREQUENCY_DAYS = 30
+AVG_SUM_DAYS = 365
+
+# Frequency the cover generator gives every ball (it scores without history,
+# with DEFAULT_AVG_SUM as the average sum)
+COVER_FREQUENCY = 5
+
+# Component weights of the two scoring models
+# 'predictor' = GeorgiaFantasy5Predictor._calculate_score (app.py)
+# 'cover' = GAFantasy5Generator.calculate_score (lot_cover_1000.py), which
+# subtracts the sequential penalty instead of weighting it
+SCORE_WEIGHTS = {
+    'predictor': {
+        'frequency': 0.20,
+        'even_odd': 0.15,
+        'decade': 0.15,
+        'sequential': 0.10,
+        'sum': 0.15,
+        'rank': 0.15,
+        'col1': 0.10
+    },
+    'cover': {
+        'frequency': 0.25,
+        'even_odd': 0.20,
+        'decade': 0.20,
+        'sum': 0.15,
+        'rank': 0.20
+    }
+}
+
+# Scoring constants shared with the scalar implementations
+MAX_POSSIBLE_FREQ = 10
+SUM_RANGE_LABELS = ["<85", "85-95", "96-105", "106-115", ">115"]
+SUM_RANGE_BINS = [85, 96, 106, 116]
+
+
+class CountingCursor:
+    """Database cursor wrapper that counts executed queries"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.query_count = 0
+
+    def execute(self, *args, **kwargs):
+        self.query_count += 1
+        return self._cursor.execute(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class ScoringContext:
+    """Immutable per-generation snapshot of the data used for scoring"""
+
+    def __init__(self, frequency=None, avg_sum=DEFAULT_AVG_SUM, col1_data=None,
+                 rank_limits=None, rank_counts=None, snapshot_key=None):
+        """
+        Parameters:
+        frequency (list): 43 entries, frequency[ball] = appearances in the last 30 days
+                          (or an (N, 43) array, one row per combination scored by score_batch)
+        avg_sum (float): Average winning sum over the last 365 days (or an (N,) array)
+        col1_data (dict): (sum_range, even, odd) -> list of col1 values
+        rank_limits (list): Rank limits
+        rank_counts (list): Rank counts
+        snapshot_key (tuple): Identifies the history the context was built from
+        """
+        if frequency is None:
+            self.frequency = [0] * (NUM_MAX + 1)
+        elif NUMPY_AVAILABLE and isinstance(frequency, np.ndarray) and frequency.ndim == 2:
+            self.frequency = frequency
+        else:
+            self.frequency = list(frequency)
+        self.avg_sum = avg_sum
+        self.col1_data = col1_data or {}
+        self.rank_limits = rank_limits or []
+        self.rank_counts = rank_counts or []
+        self.snapshot_key = snapshot_key
+
+    @classmethod
+    def from_history(cls, history, col1_data=None, rank_limits=None, rank_counts=None,
+                     snapshot_key=None):
+        """
+        Build a context from the cumulative counts of a draw history, without a query
+
+        The windows are those of the original SQL: ball frequencies over the
+        last FREQUENCY_DAYS days and the average sum over the last AVG_SUM_DAYS
+        days, relative to today (see DrawHistory.window_start).
+
+        Parameters:
+        history (DrawHistory): Loaded draw history (see lot_draw_history)
+
+        Returns:
+        ScoringContext: The loaded context
+        """
+        avg_sum = history.average_sum(days=AVG_SUM_DAYS)
+        return cls(history.frequency(days=FREQUENCY_DAYS).tolist(),
+                   DEFAULT_AVG_SUM if avg_sum is None else avg_sum,
+                   col1_data, rank_limits, rank_counts, snapshot_key)
+
+
+def snapshot_key_for(latest_draw_date):
+    """
+    Key that changes whenever a new draw arrives or the day rolls over
+    (the frequency and average-sum windows are relative to today)
+    """
+    return (latest_draw_date, date.today())
+
+
+def _predictor_rank_score(rank_limits, rank_counts, nums_per_draw=5):
+    """Rank score of the predictor model (depends only on the rank tables)"""
+    rank_score = 0
+    total_rank_points = 0
+    for i in range(nums_per_draw):
+        if i < len(rank_limits) and i < len(rank_counts):
+            if rank_counts[i] == 0:
+                continue
+            if rank_limits[i] > 0 and rank_counts[i] <= rank_limits[i]:
+                rank_score += 20
+            total_rank_points += 20
+    return (rank_score / total_rank_points) * 100 if total_rank_points > 0 else 50
+
+
+def _cover_rank_points(rank_limits, rank_counts):
+    """Per-ball rank points of the cover model (index = ball number)"""
+    points = np.zeros(NUM_MAX + 1, dtype=np.float64)
+    for num in range(1, NUM_MAX + 1):
+        if (num - 1) < len(rank_counts):
+            num_frequency = rank_counts[num - 1]
+            # Lower frequencies map to more lenient limit indexes (7 = most lenient)
+            limit_index = 7 - num_frequency if 0 <= num_frequency <= 7 else 0
+            if limit_index < len(rank_limits) and num_frequency <= limit_index + 1:
+                points[num] = 20
+    return points
+
+
+def _col1_bonus_table(col1_data, nums_per_draw=5):
+    """
+    Col1 bonus lookup as an array
+
+    Returns:
+    np.ndarray: (sum range, even count, ball) -> 15 for an exact match, 10 for a generic match, else 0
+    """
+    table = np.zeros((len(SUM_RANGE_LABELS), nums_per_draw + 1, NUM_MAX + 1), dtype=np.float64)
+    for r, sum_range in enumerate(SUM_RANGE_LABELS):
+        for even in range(nums_per_draw + 1):
+            even_str, odd_str = str(even), str(nums_per_draw - even)
+            # Apply the weaker matches first so the exact match wins
+            for key, bonus in (((sum_range, "*", "*"), 10), (("*", even_str, odd_str), 10),
+                               ((sum_range, even_str, odd_str), 15)):
+                for value in col1_data.get(key, []):
+                    try:
+                        ball = int(value)
+                    except (TypeError, ValueError):
+                        continue
+                    if 0 <= ball <= NUM_MAX:
+                        table[r, even, ball] = bonus
+    return table
+
+
+def combine_components(components, model='predictor', weights=None):
+    """
+    Weighted score from the component columns of score_batch
+
+    Columns broadcast, so per-combination and per-draw components can be mixed
+    (e.g. (S,) static columns with (N, S) frequency and sum columns).
+
+    Parameters:
+    components (dict): Component name -> 0-100 values
+    model (str): 'predictor' or 'cover'
+    weights (dict): Component weights (SCORE_WEIGHTS[model] if omitted)
+
+    Returns:
+    np.ndarray: Scores (float64)
+    """
+    weights = weights or SCORE_WEIGHTS[model]
+    scores = sum(weights[name] * np.asarray(components[name], dtype=np.float64) for name in weights)
+    if model == 'cover':
+        # The cover model subtracts the sequential penalty (100 - sequential score) instead of weighting it
+        scores = np.clip(scores - (100 - np.asarray(components['sequential'], dtype=np.float64)), 0, 100)
+    return scores
+
+
+def score_batch(combos, context, model='predictor', weights=None):
+    """
+    Score an array of combinations in one pass
+
+    Parameters:
+    combos (array-like): (N, 5) array of ball numbers, sorted ascending
+    context (ScoringContext): Frequency, average sum, col1 and rank data
+    model (str): 'predictor' (app.py weights) or 'cover' (lot_cover_1000.py weights)
+    weights (dict): Component weights overriding SCORE_WEIGHTS[model]
+
+    Returns:
+    tuple: (scores, components) - (N,) float32 scores and a dict of (N,) float32
+           component columns (frequency, even_odd, decade, sequential, sum, rank, col1)
+    """
+    combos = np.asarray(combos, dtype=np.uint8).reshape(-1, 5)
+    nums_per_draw = combos.shape[1]
+    features = compute_combo_features(combos)
+
+    # Frequency score (0-100)
+    frequency = np.asarray(context.frequency, dtype=np.float64)
+    if frequency.ndim == 2:
+        # Per-combination frequencies (e.g. each backtested draw against its own history)
+        ball_freq = np.take_along_axis(frequency, combos.astype(np.intp), axis=1)
+    else:
+        ball_freq = frequency[combos]
+    freq_score = np.minimum(ball_freq, MAX_POSSIBLE_FREQ).sum(axis=1) / (nums_per_draw * MAX_POSSIBLE_FREQ) * 100
+
+    # Even/odd balance (0-100)
+    even = features['even'].astype(np.int64)
+    even_odd_balance = 100 - np.abs(even - nums_per_draw / 2) * 40
+
+    # Decade balance (0-100)
+    decade_balance = np.full(len(combos), 100.0)
+    for d in range(5):
+        count = features[f'd{d}']
+        decade_balance -= np.where(count > 2, 25, np.where(count == 0, 15, 0))
+
+    # Sequential penalty
+    seq_penalty = features['seq2'] * 5.0 + features['seq3'] * 15.0
+    seq_score = np.maximum(0, 100 - seq_penalty)
+
+    # Sum score - closeness to the average winning sum
+    total = combos.sum(axis=1, dtype=np.int64)
+    sum_score = 100 - np.minimum(np.abs(total - np.asarray(context.avg_sum, dtype=np.float64)), 30) * 3.33
+
+    components = {
+        'frequency': freq_score,
+        'even_odd': even_odd_balance,
+        'decade': decade_balance,
+        'sequential': seq_score,
+        'sum': sum_score
+    }
+
+    if model == 'cover':
+        rank_points = _cover_rank_points(context.rank_limits, context.rank_counts)
+        components['rank'] = rank_points[combos].sum(axis=1) / (nums_per_draw * 20) * 100
+        components['col1'] = np.zeros(len(combos))
+    else:
+        components['rank'] = np.full(len(combos), float(_predictor_rank_score(
+            context.rank_limits, context.rank_counts, nums_per_draw)))
+
+        # Col1 bonus for the first position, normalized to 0-100
+        sum_range = np.digitize(total, SUM_RANGE_BINS)
+        bonus = _col1_bonus_table(context.col1_data, nums_per_draw)[sum_range, even, combos[:, 0]]
+        components['col1'] = bonus * (100 / 15)
+
+    scores = combine_components(components, model, weights)
+    return scores.astype(np.float32), {name: values.astype(np.float32) for name, values in components.items()}
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - k-Subset Frequency Engine
+Counts how often every pair, triple and quad (any k-subset) appeared in the
+draw history. Each k-subset of a draw maps to its colex rank (see
+lot_combo_rank), so the counts are one np.bincount into a dense array per k
+(C(42, 4) = 111,930 quads) instead of tuples or '-'.join strings in a
+Counter, and the day each subset was last drawn is kept alongside.
+
+Top-N subsets, never-drawn subsets and per-window counts (last N draws or
+since a date) are then array operations over the dense counts.
+"""
+
+import argparse
+import json
+import time
+from math import comb
+
+import numpy as np
+
+from lot_combo_rank import decode, NUM_MAX
+from lot_coverage import subset_ids
+from lot_draw_history import day_date, day_number
+
+# Subset sizes counted by default (pairs, triples, quads)
+SUBSET_SIZES = (2, 3, 4)
+
+# Subsets listed by top()
+TOP_COUNT = 20
+
+# Names used in reports
+SUBSET_NAMES = {1: 'single', 2: 'pair', 3: 'triple', 4: 'quad', 5: 'quint'}
+
+
+def subset_counts(balls, k, num_max=NUM_MAX):
+    """
+    Appearances of every k-subset in a set of draws
+
+    Parameters:
+    balls (array-like): (N, nums_per_draw) ball numbers
+    k (int): Subset size
+    num_max (int): Highest ball number
+
+    Returns:
+    np.ndarray: (C(num_max, k),) int32 counts indexed by colex rank
+    """
+    balls = np.asarray(balls).reshape(len(balls), -1)
+    ids = subset_ids(balls, k, num_max)
+    return np.bincount(ids.ravel(), minlength=comb(num_max, k)).astype(np.int32)
+
+
+class SubsetCounts:
+    """Dense k-subset counts and last-drawn days over a draw history"""
+
+    def __init__(self, days, balls, sizes=SUBSET_SIZES, num_max=NUM_MAX):
+        """
+        Parameters:
+        days (array-like): (N,) day numbers (see lot_draw_history.day_number), ascending
+        balls (array-like): (N, nums_per_draw) ball numbers in the same order
+        sizes (tuple): Subset sizes to count
+        num_max (int): Highest ball number
+        """
+        self.days = np.asarray(days, dtype=np.int32)
+        self.balls = np.asarray(balls).reshape(len(self.days), -1)
+        self.num_max = num_max
+        self.ids = {}
+        self.totals = {}
+        self.last_seen = {}
+
+        for k in sizes:
+            ids = subset_ids(self.balls, k, num_max)
+            self.ids[k] = ids
+            self.totals[k] = np.bincount(ids.ravel(), minlength=comb(num_max, k)).astype(np.int32)
+            last_seen = np.full(comb(num_max, k), -1, dtype=np.int32)
+            np.maximum.at(last_seen, ids.ravel(), np.repeat(self.days, ids.shape[1]))
+            self.last_seen[k] = last_seen
+
+    def __len__(self):
+        return len(self.days)
+
+    def window_start(self, last=None, since=None):
+        """Index of the first draw of the last draws, or of the first draw on or after since"""
+        if last is not None:
+            return min(max(len(self.days) - last, 0), len(self.days))
+        if since is not None:
+            return int(np.searchsorted(self.days, day_number(since), side='left'))
+        return 0
+
+    def counts(self, k, last=None, since=None):
+        """
+        Counts of every k-subset over the whole history or a window ending at the latest draw
+
+        Parameters:
+        k (int): Subset size (one of the counted sizes)
+        last (int): Only the last draws
+        since (date or str): Only draws on or after this date
+
+        Returns:
+        np.ndarray: (C(num_max, k),) int32 counts indexed by colex rank
+        """
+        start = self.window_start(last, since)
+        if start == 0:
+            return self.totals[k]
+        return np.bincount(self.ids[k][start:].ravel(), minlength=len(self.totals[k])).astype(np.int32)
+
+    def top(self, k, count=TOP_COUNT, last=None, since=None):
+        """
+        The most frequent k-subsets
+
+        Ordered by count, then most recent appearance, then the numbers.
+
+        Returns:
+        list: Dicts with numbers, count and last_date (ISO date of the last draw holding the subset)
+        """
+        counts = self.counts(k, last, since)
+        ids = np.flatnonzero(counts)
+        if count < len(ids):
+            # Every subset tied with the count-th largest stays a candidate for the tie-break
+            values = counts[ids]
+            threshold = values[np.argpartition(values, -count)[-count:]].min()
+            ids = ids[values >= threshold]
+
+        numbers = decode(ids, k, self.num_max)
+        keys = [numbers[:, i] for i in range(k - 1, -1, -1)] + [-self.last_seen[k][ids], -counts[ids]]
+        order = np.lexsort(keys)[:count]
+        return [{'numbers': numbers[i].tolist(),
+                 'count': int(counts[ids[i]]),
+                 'last_date': day_date(self.last_seen[k][ids[i]]).isoformat()}
+                for i in order.tolist()]
+
+    def never_drawn(self, k):
+        """
+        The k-subsets that never appeared in the history
+
+        Returns:
+        np.ndarray: (M, k) uint8 sorted subsets, in colex order
+        """
+        return decode(np.flatnonzero(self.totals[k] == 0), k, self.num_max)
+
+    def summary(self, k):
+        """Distinct and never-drawn k-subsets of the history"""
+        drawn = int(np.count_nonzero(self.totals[k]))
+        return {
+            'subset_size': k,
+            'subsets': len(self.totals[k]),
+            'drawn': drawn,
+            'never_drawn': len(self.totals[k]) - drawn,
+            'max_count': int(self.totals[k].max()) if len(self.totals[k]) else 0
+        }
+
+
+def load_subset_counts(sizes=SUBSET_SIZES, db_config=None):
+    """
+    Count the k-subsets of the full draw history (MySQL, or else the CSV export)
+
+    Returns:
+    SubsetCounts: Counts over every historical draw
+    """
+    from lot_backtest import load_history
+
+    days, balls = load_history(db_config)
+    return SubsetCounts(days, balls, sizes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GA Fantasy 5 k-Subset Frequency Engine")
+    parser.add_argument("--k", type=int, nargs='+', default=list(SUBSET_SIZES), help="Subset sizes")
+    parser.add_argument("--top", type=int, default=TOP_COUNT, help="Number of top subsets per size")
+    parser.add_argument("--last", type=int, help="Only count the last N draws")
+    parser.add_argument("--since", help="Only count draws on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--never", type=int, default=0, help="Also print this many never-drawn subsets per size")
+    parser.add_argument("--json", help="Also write the report to this file")
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine = load_subset_counts(tuple(args.k))
+    print(f"Counted {', '.join(SUBSET_NAMES[k] + 's' for k in args.k)} of {len(engine)} draws "
+          f"in {time.perf_counter() - start:.2f}s")
+
+    report = []
+    for k in args.k:
+        start = time.perf_counter()
+        top = engine.top(k, args.top, args.last, args.since)
+        summary = engine.summary(k)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        print(f"\n{summary['drawn']} of {summary['subsets']} {SUBSET_NAMES[k]}s drawn "
+              f"({summary['never_drawn']} never); top {len(top)} in {elapsed:.1f} ms")
+        for rank, entry in enumerate(top, 1):
+            print(f"{rank:3d}. {'-'.join(map(str, entry['numbers'])):<14} {entry['count']:5d}  {entry['last_date']}")
+
+        never = engine.never_drawn(k)[:args.never].tolist() if args.never else []
+        for numbers in never:
+            print(f"     never: {'-'.join(map(str, numbers))}")
+        report.append(dict(summary, top=top, never_drawn_sample=never))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'draws': len(engine), 'last': args.last, 'since': args.since, 'sizes': report}, f, indent=2)
+        print(f"Report saved to {args.json}")
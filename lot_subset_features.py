@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - Bulk Subset-Hit Features
+Computes the per-combination history features of the ga_f5 schema for the
+whole combination space or any candidate batch in one pass:
+
+- nums_total_k: historical appearances of the combination's k-subsets in
+  draws whose sum is in the same decade (hml = int(sum / 10) * 10)
+- combo_total_k: the same, in draws with exactly the same sum
+- pair_sum: how many of the combination's 10 pairs were drawn in the last
+  PAIR_SUM_DRAWS draws (the ga_f5_temp_2_5000 lookup)
+- y1_sum: sum over the five positions of the percentage of same sum/even/odd
+  draws holding the combination's ball at that position
+
+The scripts behind combo_count_date_curr.incl and pair_sum_count_5 issue one
+query per subset per combination. Here every draw's k-subsets are mapped to
+their colex rank (see lot_coverage.subset_ids), keyed by sum bucket and
+counted once, so each feature is a vectorized gather over the candidates'
+subset ids.
+"""
+
+import argparse
+import time
+from math import comb
+
+import numpy as np
+
+from lot_combo_rank import NUM_MAX, NUMS_PER_DRAW
+from lot_coverage import subset_ids
+from lot_draw_history import day_date, day_number
+
+# Subset sizes with nums_total / combo_total columns
+FEATURE_SIZES = (2, 3, 4)
+
+# Width of the nums_total sum buckets (the hml column)
+SUM_BUCKET = 10
+
+# Draws behind pair_sum (ga_f5_temp_2_5000)
+PAIR_SUM_DRAWS = 5000
+
+
+class KeyCounts:
+    """Counts of integer keys, kept as sorted unique keys for vectorized lookup"""
+
+    def __init__(self, keys):
+        self.keys, self.counts = np.unique(np.asarray(keys, dtype=np.int64).ravel(), return_counts=True)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, keys):
+        """Count of each key (0 for keys never seen), same shape as keys"""
+        keys = np.asarray(keys, dtype=np.int64)
+        if not len(self.keys):
+            return np.zeros(keys.shape, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        return np.where(self.keys[positions] == keys, self.counts[positions], 0)
+
+
+class SubsetFeatures:
+    """Subset-hit counts of a draw history, for per-combination feature gathers"""
+
+    def __init__(self, days, balls, sizes=FEATURE_SIZES, num_max=NUM_MAX, pair_draws=PAIR_SUM_DRAWS):
+        """
+        Parameters:
+        days (array-like): (N,) day numbers (see lot_draw_history.day_number), ascending
+        balls (array-like): (N, 5) ball numbers in the same order
+        sizes (tuple): Subset sizes for nums_total / combo_total
+        num_max (int): Highest ball number
+        pair_draws (int): Draws counted for pair_sum
+        """
+        self.days = np.asarray(days, dtype=np.int32)
+        self.balls = np.sort(np.asarray(balls, dtype=np.int64).reshape(len(self.days), NUMS_PER_DRAW), axis=1)
+        self.sizes = tuple(sizes)
+        self.num_max = num_max
+        self.max_sum = num_max * self.balls.shape[1]
+
+        sums = self.balls.sum(axis=1)
+        self.nums_counts = {}
+        self.combo_counts = {}
+        for k in self.sizes:
+            ids = subset_ids(self.balls, k, num_max).astype(np.int64)
+            space = comb(num_max, k)
+            self.nums_counts[k] = KeyCounts((sums // SUM_BUCKET)[:, None] * space + ids)
+            self.combo_counts[k] = KeyCounts(sums[:, None] * space + ids)
+
+        # Pairs of the last pair_draws draws, as a dense hit flag per pair rank
+        recent = subset_ids(self.balls[-pair_draws:], 2, num_max) if pair_draws else np.empty((0, 1))
+        self.recent_pairs = np.bincount(recent.ravel(), minlength=comb(num_max, 2)) > 0
+
+        # Positional percentages per (sum, even count): [sum, even, position, ball]
+        evens = np.count_nonzero(self.balls % 2 == 0, axis=1)
+        width = self.balls.shape[1]
+        groups = np.zeros((self.max_sum + 1, width + 1), dtype=np.int64)
+        np.add.at(groups, (sums, evens), 1)
+        hits = np.zeros((self.max_sum + 1, width + 1, width, num_max + 1), dtype=np.int64)
+        positions = np.broadcast_to(np.arange(width), self.balls.shape)
+        np.add.at(hits, (sums[:, None], evens[:, None], positions, self.balls), 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.position_percent = np.where(groups[:, :, None, None] > 0,
+                                             100.0 * hits / groups[:, :, None, None], 0.0)
+
+    def __len__(self):
+        return len(self.days)
+
+    def _subset_ids(self, combos, k, ids=None):
+        """Subset ids of the sorted combinations, unless features() already computed them"""
+        return subset_ids(combos, k, self.num_max) if ids is None else ids
+
+    def nums_total(self, combos, k, ids=None):
+        """Appearances of each combination's k-subsets in draws of the same sum decade"""
+        combos = np.sort(np.asarray(combos), axis=1)
+        buckets = combos.sum(axis=1, dtype=np.int64) // SUM_BUCKET
+        keys = buckets[:, None] * comb(self.num_max, k) + self._subset_ids(combos, k, ids)
+        return self.nums_counts[k].lookup(keys).sum(axis=1)
+
+    def combo_total(self, combos, k, ids=None):
+        """Appearances of each combination's k-subsets in draws with the same sum"""
+        combos = np.sort(np.asarray(combos), axis=1)
+        sums = combos.sum(axis=1, dtype=np.int64)
+        keys = sums[:, None] * comb(self.num_max, k) + self._subset_ids(combos, k, ids)
+        return self.combo_counts[k].lookup(keys).sum(axis=1)
+
+    def pair_sum(self, combos, ids=None):
+        """Number of each combination's pairs drawn in the last pair_draws draws"""
+        combos = np.sort(np.asarray(combos), axis=1)
+        return np.count_nonzero(self.recent_pairs[self._subset_ids(combos, 2, ids)], axis=1)
+
+    def y1_sum(self, combos):
+        """Sum of the positional percentages of each combination's balls within its sum/even group"""
+        combos = np.sort(np.asarray(combos), axis=1)
+        sums = combos.sum(axis=1, dtype=np.int64)
+        evens = np.count_nonzero(combos % 2 == 0, axis=1)
+        positions = np.arange(combos.shape[1])
+        return self.position_percent[sums[:, None], evens[:, None], positions, combos].sum(axis=1)
+
+    def features(self, combos):
+        """
+        Every feature column for a batch of combinations
+
+        Each k-subset id array is computed once and shared by the columns that gather from it.
+
+        Parameters:
+        combos (array-like): (N, 5) ball numbers (any order)
+
+        Returns:
+        dict: Column name -> (N,) array (nums_total_k and combo_total_k per size,
+              pair_sum, y1_sum rounded to 2 places as in the float(4,2) column)
+        """
+        combos = np.sort(np.asarray(combos).reshape(-1, NUMS_PER_DRAW), axis=1)
+        ids = {k: subset_ids(combos, k, self.num_max) for k in set(self.sizes) | {2}}
+        columns = {}
+        for k in self.sizes:
+            columns[f'nums_total_{k}'] = self.nums_total(combos, k, ids[k]).astype(np.uint32)
+        for k in self.sizes:
+            columns[f'combo_total_{k}'] = self.combo_total(combos, k, ids[k]).astype(np.uint32)
+        columns['pair_sum'] = self.pair_sum(combos, ids[2]).astype(np.uint8)
+        columns['y1_sum'] = np.round(self.y1_sum(combos), 2)
+        return columns
+
+
+def build_features(combos, days, balls, before=None, sizes=FEATURE_SIZES):
+    """
+    Features of a combination batch from the draws before a date
+
+    Parameters:
+    combos (array-like): (N, 5) ball numbers
+    days (array-like): (M,) day numbers of the history, ascending
+    balls (array-like): (M, 5) ball numbers of the history
+    before (date or str): Only use draws dated before this (date < draw date in
+                          the original queries); whole history when omitted
+    sizes (tuple): Subset sizes for nums_total / combo_total
+
+    Returns:
+    dict: Column name -> (N,) array (see SubsetFeatures.features)
+    """
+    days = np.asarray(days, dtype=np.int32)
+    end = len(days) if before is None else int(np.searchsorted(days, day_number(before), side='left'))
+    return SubsetFeatures(days[:end], np.asarray(balls)[:end], sizes).features(combos)
+
+
+def load_subset_features(sizes=FEATURE_SIZES, db_config=None):
+    """
+    Subset-hit counts of the full draw history (MySQL, or else the CSV export)
+
+    Returns:
+    SubsetFeatures: Counts over every historical draw
+    """
+    from lot_backtest import load_history
+
+    days, balls = load_history(db_config)
+    return SubsetFeatures(days, balls, sizes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GA Fantasy 5 Bulk Subset-Hit Features")
+    parser.add_argument("--combo", type=int, nargs=NUMS_PER_DRAW, action='append',
+                        help="Combination to report (repeatable); every combination when omitted")
+    parser.add_argument("--before", help="Only use draws before this date (YYYY-MM-DD)")
+    parser.add_argument("--output", help="Write the feature columns to this .npz file")
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine = load_subset_features()
+    if args.before:
+        end = int(np.searchsorted(engine.days, day_number(args.before), side='left'))
+        engine = SubsetFeatures(engine.days[:end], engine.balls[:end])
+    last = day_date(engine.days[-1]).isoformat() if len(engine) else 'none'
+    print(f"Counted subsets of {len(engine)} draws (latest {last}) in {time.perf_counter() - start:.2f}s")
+
+    if args.combo:
+        combos = np.array(args.combo)
+    else:
+        from lot_combo_table import load_combo_table
+        combos = load_combo_table().combos
+
+    start = time.perf_counter()
+    columns = engine.features(combos)
+    print(f"Built features of {len(combos)} combinations in {time.perf_counter() - start:.2f}s")
+
+    if args.combo:
+        for i, numbers in enumerate(args.combo):
+            values = ', '.join(f"{name}={column[i]}" for name, column in columns.items())
+            print(f"{'-'.join(map(str, sorted(numbers)))}: {values}")
+    else:
+        for name, column in columns.items():
+            print(f"{name:<14} min {column.min():8}  mean {column.mean():10.2f}  max {column.max():8}")
+
+    if args.output:
+        np.savez_compressed(args.output, combos=np.sort(combos, axis=1), **columns)
+        print(f"Features saved to {args.output}")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - Sum/Even/Odd (Sumeo) Partitioned Index
+Orders the combination space by (sum, even) with an offsets table, so all
+combinations of one sumeo are a contiguous, zero-copy slice and the
+per-sumeo combination counts used by the wheel/sumeo reports are precomputed.
+
+Within a partition combinations stay in id order (odd is always 5 - even).
+"""
+
+import argparse
+
+import numpy as np
+
+from lot_combo_table import load_combo_table, NUM_MAX, NUMS_PER_DRAW
+
+# Largest possible sum (38 + 39 + 40 + 41 + 42)
+MAX_SUM = sum(range(NUM_MAX - NUMS_PER_DRAW + 1, NUM_MAX + 1))
+
+# Partitions per sum, one per even count 0-5
+EVEN_COUNTS = NUMS_PER_DRAW + 1
+
+
+class SumeoIndex:
+    """Combination ids and balls grouped by (sum, even, odd)"""
+
+    def __init__(self, table=None):
+        """
+        Parameters:
+        table (ComboTable): Combination table (the process-wide table by default)
+        """
+        table = table if table is not None else load_combo_table()
+        self.table_path = table.path
+        keys = table['sum'].astype(np.int64) * EVEN_COUNTS + table['even']
+
+        # Stable sort keeps combinations in id order within each partition
+        order = np.argsort(keys, kind='stable')
+        self.ids = order.astype(np.uint32)
+        self.combos = np.ascontiguousarray(table.combos[order])
+
+        # counts[sum, even] = combinations in that partition
+        self.counts = np.bincount(keys, minlength=(MAX_SUM + 1) * EVEN_COUNTS).reshape(MAX_SUM + 1, EVEN_COUNTS)
+        self.offsets = np.zeros(self.counts.size + 1, dtype=np.int64)
+        np.cumsum(self.counts.ravel(), out=self.offsets[1:])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def bounds(self, sum_val, even=None, odd=None):
+        """
+        Start/stop positions of a partition
+
+        Parameters:
+        sum_val (int): Sum of the five balls
+        even (int): Even count (None = every even count of this sum)
+        odd (int): Odd count (optional, must equal 5 - even)
+
+        Returns:
+        tuple: (start, stop), empty when the sumeo is impossible
+        """
+        if not 0 <= sum_val <= MAX_SUM:
+            return 0, 0
+        if even is None:
+            if odd is None:
+                first, last = sum_val * EVEN_COUNTS, (sum_val + 1) * EVEN_COUNTS
+                return int(self.offsets[first]), int(self.offsets[last])
+            even = NUMS_PER_DRAW - odd
+        if not 0 <= even <= NUMS_PER_DRAW or (odd is not None and even + odd != NUMS_PER_DRAW):
+            return 0, 0
+        key = sum_val * EVEN_COUNTS + even
+        return int(self.offsets[key]), int(self.offsets[key + 1])
+
+    def ids_for(self, sum_val, even=None, odd=None):
+        """Combination ids of a sumeo (zero-copy slice, ascending)"""
+        start, stop = self.bounds(sum_val, even, odd)
+        return self.ids[start:stop]
+
+    def combos_for(self, sum_val, even=None, odd=None):
+        """(N, 5) balls of a sumeo (zero-copy slice)"""
+        start, stop = self.bounds(sum_val, even, odd)
+        return self.combos[start:stop]
+
+    def count(self, sum_val, even=None, odd=None):
+        """Number of combinations in a sumeo"""
+        start, stop = self.bounds(sum_val, even, odd)
+        return stop - start
+
+    def partitions(self):
+        """(sum, even, odd, count) for every non-empty sumeo"""
+        for sum_val, even in zip(*np.nonzero(self.counts)):
+            yield int(sum_val), int(even), NUMS_PER_DRAW - int(even), int(self.counts[sum_val, even])
+
+
+_sumeo_index = None
+
+
+def load_sumeo_index():
+    """Get the process-wide sumeo index, building it on first use"""
+    global _sumeo_index
+
+    table = load_combo_table()
+    if _sumeo_index is None or _sumeo_index.table_path != table.path:
+        _sumeo_index = SumeoIndex(table)
+    return _sumeo_index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GA Fantasy 5 Sumeo Index")
+    parser.add_argument("--sum", type=int, help="Only show this sum")
+    parser.add_argument("--min-count", type=int, default=1, help="Hide sumeos with fewer combinations")
+
+    args = parser.parse_args()
+
+    index = load_sumeo_index()
+    print(f"{'Sum':>4} {'Even':>4} {'Odd':>4} {'Count':>7}")
+    for sum_val, even, odd, count in index.partitions():
+        if (args.sum is None or sum_val == args.sum) and count >= args.min_count:
+            print(f"{sum_val:>4} {even:>4} {odd:>4} {count:>7}")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Georgia Fantasy 5 Lottery - Bounded Diverse Top-K Selection
+Keeps the prediction diversity selection (best per col1, then best per unused
+col5, then the highest remaining scores) up to date while scored candidates
+stream in. Memory is bounded by K plus one entry per col1/col5 value, not by
+the number of candidates.
+"""
+
+import heapq
+
+
+class DiverseTopK:
+    """
+    Online version of the col1/col5 diversity selection
+
+    select() returns what the batch selection over every pushed candidate
+    returns: the best candidate of each of the top col1 groups, then the best
+    candidate of each col5 value not used yet, then the highest remaining
+    scores, ordered by score. Ties go to the candidate pushed first.
+    """
+
+    def __init__(self, k):
+        """
+        Parameters:
+        k (int): Number of candidates select() returns
+        """
+        self.k = k
+        self.pushed = 0
+        self.group_counts = {}  # col1 -> candidates pushed for that col1
+        self._col1_best = {}    # col1 -> entry of its best candidate
+        self._col5_best = {}    # col5 -> entry of its best candidate
+        self._top = []          # min-heap of the k best entries overall
+        self._top_keys = set()  # keys of the entries in _top
+
+    def __len__(self):
+        return self.pushed
+
+    def col1_values(self):
+        """Col1 values seen so far"""
+        return set(self._col1_best)
+
+    def push(self, score, item, col1, col5, key=None):
+        """
+        Offer a scored candidate
+
+        Parameters:
+        score (float): Candidate score (higher is better)
+        item: Candidate returned by select()
+        col1 (int): Diversity group of the first stage
+        col5 (int): Diversity group of the second stage
+        key (hashable): Identity of the candidate; a repeated key is ignored
+        """
+        # Entries compare by score, then earlier arrival
+        entry = (score, -self.pushed, item, col1, col5, key)
+        self.pushed += 1
+        self.group_counts[col1] = self.group_counts.get(col1, 0) + 1
+
+        best = self._col1_best.get(col1)
+        if best is None or entry[:2] > best[:2]:
+            self._col1_best[col1] = entry
+        best = self._col5_best.get(col5)
+        if best is None or entry[:2] > best[:2]:
+            self._col5_best[col5] = entry
+
+        # A repeat of an evicted candidate has its score and loses the tie, so
+        # checking the heap members is enough to keep keys unique
+        if key is not None and key in self._top_keys:
+            return
+        if len(self._top) < self.k:
+            heapq.heappush(self._top, entry[:2] + (entry,))
+            self._top_keys.add(key)
+        elif entry[:2] > self._top[0][:2]:
+            evicted = heapq.heapreplace(self._top, entry[:2] + (entry,))[2]
+            self._top_keys.discard(evicted[5])
+            self._top_keys.add(key)
+
+    def select(self, count=None):
+        """
+        Current diverse selection
+
+        Parameters:
+        count (int): Number of candidates (defaults to k, at most k)
+
+        Returns:
+        list: Selected items, highest score first
+        """
+        count = self.k if count is None else min(count, self.k)
+        rank = lambda entry: entry[:2]
+
+        # Best candidate of each col1 group, groups in order of their best score
+        selected = sorted(self._col1_best.values(), key=rank, reverse=True)[:count]
+        chosen = {entry[1] for entry in selected}
+        keys = {entry[5] for entry in selected if entry[5] is not None}
+
+        # A col5 group containing a first-stage pick is used, so each unused
+        # col5 value contributes its overall best candidate
+        used_col5 = {entry[4] for entry in selected}
+        col5_best = sorted((entry for col5, entry in self._col5_best.items() if col5 not in used_col5),
+                           key=rank, reverse=True)
+        for entry in col5_best:
+            if len(selected) >= count:
+                break
+            if entry[5] is None or entry[5] not in keys:
+                selected.append(entry)
+                chosen.add(entry[1])
+                keys.add(entry[5])
+
+        # Then the highest remaining scores (the k best overall always hold enough)
+        for _, _, entry in sorted(self._top, reverse=True):
+            if len(selected) >= count:
+                break
+            if entry[1] not in chosen and (entry[5] is None or entry[5] not in keys):
+                selected.append(entry)
+                chosen.add(entry[1])
+                keys.add(entry[5])
+
+        selected.sort(key=lambda entry: entry[0], reverse=True)
+        return [entry[2] for entry in selected]
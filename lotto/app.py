@@ -5,6 +5,11 @@ from datetime import datetime, timedelta
 import math
 import statistics
 import os
+import sys
+
+# Cumulative pair co-occurrence index (lot_pair_index.py lives in the parent directory)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lot_pair_index import load_pair_index
 
 # Create Flask application
 app = Flask(__name__)
@@ -51,6 +56,9 @@ class Config:
     # Default grid flags
     GRID_26_FLAG = 4
     GRID_ALL_FLAG = 35
+    
+    # Pairs listed on the pairs page
+    TOP_PAIRS = 30
 
 # Load the configuration
 config = Config()
@@ -321,50 +329,13 @@ def pairs(game_id):
     db = get_db_connection()
     cursor = db.cursor()
     
-    # We'll query and calculate pair data
-    pairs_data = {}
-    
-    # Create a grid of all possible pairs
-    grid_data = [[0 for _ in range(game_config['balls'] + 1)] for _ in range(game_config['balls'] + 1)]
-    
-    # Get the last 'limit' draws
-    query = f"""
-        SELECT * FROM {game_config['draw_table']}
-        ORDER BY date DESC
-        LIMIT {limit}
-    """
-    cursor.execute(query)
-    draws = cursor.fetchall()
+    # Pair counts of the last 'limit' draws from the cumulative pair index
+    # (only draws newer than the indexed ones are fetched)
+    index = load_pair_index(cursor, game_config['draw_table'], game_config['balls'], game_config['balls_drawn'])
+    grid_data = index.counts(limit).tolist()
     
-    # Process each draw to count pairs
-    for row in draws:
-        # Extract the draw numbers
-        draw_numbers = [row[f'b{i}'] for i in range(1, game_config['balls_drawn'] + 1)]
-        
-        # Count each pair in the draw
-        for i, num1 in enumerate(draw_numbers):
-            for num2 in draw_numbers[i+1:]:
-                if num1 < num2:
-                    key = f"{num1}-{num2}"
-                else:
-                    key = f"{num2}-{num1}"
-                    
-                # Update the pair count
-                if key in pairs_data:
-                    pairs_data[key]['count'] += 1
-                else:
-                    pairs_data[key] = {
-                        'num1': min(num1, num2),
-                        'num2': max(num1, num2),
-                        'count': 1,
-                        'last_date': row['date']
-                    }
-                
-                # Update the grid data
-                grid_data[min(num1, num2)][max(num1, num2)] += 1
-    
-    # Sort pairs by count (descending)
-    sorted_pairs = sorted(pairs_data.values(), key=lambda x: x['count'], reverse=True)
+    # Top pairs by count (then most recent appearance)
+    sorted_pairs = index.top_pairs(config.TOP_PAIRS, limit)
     
     # Close the database connection
     cursor.close()
@@ -452,28 +423,9 @@ def grid(game_id):
     db = get_db_connection()
     cursor = db.cursor()
     
-    # Create a grid of all possible pairs
-    grid_data = [[0 for _ in range(game_config['balls'] + 1)] for _ in range(game_config['balls'] + 1)]
-    
-    # Get the last 'limit' draws
-    query = f"""
-        SELECT * FROM {game_config['draw_table']}
-        ORDER BY date DESC
-        LIMIT {limit}
-    """
-    cursor.execute(query)
-    draws = cursor.fetchall()
-    
-    # Process each draw to count pairs
-    for row in draws:
-        # Extract the draw numbers
-        draw_numbers = [row[f'b{i}'] for i in range(1, game_config['balls_drawn'] + 1)]
-        
-        # Count each pair in the draw
-        for i, num1 in enumerate(draw_numbers):
-            for num2 in draw_numbers[i+1:]:
-                # Update the grid data (use min/max to ensure correct placement)
-                grid_data[min(num1, num2)][max(num1, num2)] += 1
+    # Pair counts of the last 'limit' draws (grid[min][max]) from the cumulative pair index
+    index = load_pair_index(cursor, game_config['draw_table'], game_config['balls'], game_config['balls_drawn'])
+    grid_data = index.counts(limit).tolist()
     
     # Determine grid flag based on limit
     if limit == 26:
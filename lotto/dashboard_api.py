@@ -6,9 +6,15 @@ import mysql.connector
 from mysql.connector import Error
 import datetime
 import json
+import os
+import sys
 from collections import Counter
 import statistics
 
+# Shared draw history with cumulative ball counts (lot_draw_history.py lives in the parent directory)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lot_draw_history import load_draw_history
+
 app = Flask(__name__)
 CORS(app)
 
@@ -114,6 +120,18 @@ class LotteryAPI:
         game_info = self.get_game_info(game_id)
         table_name = game_info['table']
         max_number = game_info['max_number']
+        numbers = list(range(1, max_number + 1))
+        
+        if table_name == 'ga_f5_draws':
+            # Two rows of the cumulative count matrix instead of pulling and counting draws
+            try:
+                cursor = connection.cursor(dictionary=True)
+                frequency = load_draw_history(cursor).frequency(draws=limit)
+                cursor.close()
+                return {'numbers': numbers, 'counts': [int(frequency[num]) for num in numbers]}
+            except Error as e:
+                print(f"Error getting number frequency: {e}")
+                return {'numbers': [], 'counts': []}
         
         try:
             cursor = connection.cursor()
@@ -136,7 +154,6 @@ class LotteryAPI:
             frequency = Counter(all_numbers)
             
             # Create arrays for all possible numbers
-            numbers = list(range(1, max_number + 1))
             counts = [frequency.get(num, 0) for num in numbers]
             
             cursor.close()
@@ -23,6 +23,9 @@ print("c:\\wamp\\www\\lotto\\<br>")
 k = 1
 debug = True
 
+# Candidate combinations copied into a temp_sumeo_draw_* table per INSERT
+CANDIDATE_BATCH = 1000
+
 if debug:
     import logging
     logging.basicConfig(level=logging.DEBUG)
@@ -53,6 +56,10 @@ try:
 except ImportError as e:
     print(f"Warning: Some modules not found: {e}")
 
+# In-memory combo_5_42 candidate queries (lot_candidates.py lives in the parent directory)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lot_candidates import CandidateEngine
+
 # Database connection
 try:
     connection = get_connection()
@@ -84,8 +91,8 @@ def print_draw_summary(sum_val, even, odd):
     cursor = connection.cursor()
     
     try:
-        from includes.calculate_draw_summary_sumeo import *
-        from includes.print_draw_summary_sumeo import *
+        import includes.calculate_draw_summary_sumeo
+        import includes.print_draw_summary_sumeo
     except ImportError:
         print("Warning: draw summary sumeo modules not found")
     
@@ -100,8 +107,8 @@ def print_sum_grid_sum4_sumeo(combin, sumeo_sum, sumeo_even, sumeo_odd):
     cursor = connection.cursor()
     
     try:
-        from includes.calculate_sum_count_sum4_sumeo import *
-        from includes.print_sum_table_sum4_sumeo import *
+        import includes.calculate_sum_count_sum4_sumeo
+        import includes.print_sum_table_sum4_sumeo
     except ImportError:
         print("Warning: sum grid sum4 sumeo modules not found")
     
@@ -148,6 +155,14 @@ def pair_sum_count_5(draw_num):
     cursor.close()
     return pair_sum
 
+def insert_candidates(cursor, table, combos):
+    """Copy the combo_5_42 rows of the candidate combinations into table, CANDIDATE_BATCH rows per INSERT"""
+    for start in range(0, len(combos), CANDIDATE_BATCH):
+        rows = ", ".join("(" + ", ".join(str(int(num)) for num in combo) + ")"
+                         for combo in combos[start:start + CANDIDATE_BATCH])
+        cursor.execute(f"""INSERT INTO {table} 
+                          SELECT * FROM combo_5_42 WHERE (b1, b2, b3, b4, b5) IN ({rows})""")
+
 def generate_html_header():
     """Generate HTML header"""
     html = """<HTML>
@@ -172,52 +187,46 @@ def main():
         # Configuration
         drop_tables = True  # Set to True as in PHP
         update_level = 2  # dup, rank
-        max_num = 42
-        
-        count = 1
-        count_all = 0
-        print_flag = 0
         
         # Scaffolding tables
         temp_table1 = f'temp_cover_1k_count_{currdate}'
-        temp_table2 = f'temp_cover_1k_scaffolding_135_{currdate}'
         temp_table4 = f'temp_cover_1k_candidates_scaffolding_{currdate}'
         
         cursor = connection.cursor()
         
         print("<p>############################################ scaffolding_drop_tables ####################################################</p>")
         try:
-            from includes_ga_f5.scaffolding_drop_tables import *
+            import includes_ga_f5.scaffolding_drop_tables
         except ImportError:
             print("Warning: scaffolding_drop_tables module not found")
         
         print("<p>############################################ build 1000 counts ####################################################</p>")
         try:
-            from includes_ga_f5.scaffolding_count import *
+            import includes_ga_f5.scaffolding_count
         except ImportError:
             print("Warning: scaffolding_count module not found")
         
         print("<p>############################################ Col 1 ####################################################</p>")
         try:
-            from includes_ga_f5.scaffolding_col1 import *
+            import includes_ga_f5.scaffolding_col1
         except ImportError:
             print("Warning: scaffolding_col1 module not found")
         
         print("<p>############################################ Col 5 ####################################################</p>")
         try:
-            from includes_ga_f5.scaffolding_col5 import *
+            import includes_ga_f5.scaffolding_col5
         except ImportError:
             print("Warning: scaffolding_col5 module not found")
         
         print("<p>############################################ Col 2/3/4 ####################################################</p>")
         try:
-            from includes_ga_f5.scaffolding_col234 import *
+            import includes_ga_f5.scaffolding_col234
         except ImportError:
             print("Warning: scaffolding_col234 module not found")
         
         print("<p>############################################ Col 2/Col4 ####################################################</p>")
         try:
-            from includes_ga_f5.scaffolding_col2_col4 import *
+            import includes_ga_f5.scaffolding_col2_col4
         except ImportError:
             print("Warning: scaffolding_col2_col4 module not found")
         
@@ -230,10 +239,16 @@ def main():
         cursor.execute(query3)
         results3 = cursor.fetchall()
         
+        # Candidate ids per (sum, even, odd), answered in memory instead of one
+        # INSERT ... SELECT per (decade profile, b1) pair, then written to the
+        # temp_sumeo_draw_{sum}_{even}_{odd} tables the later stages read
+        engine = CandidateEngine()
+        sumeo_candidates = {}
+        build_start = time.time()
+        
         for row3 in results3:
             print(f"<b>{row3[0]}, {row3[1]}, {row3[2]} - {row3[3]}</b><br>")
             
-            # Build temp draw table for sumeo
             temp_table3 = f'temp_sumeo_draw_{row3[0]}_{row3[1]}_{row3[2]}'
             temp_table_sumeo_col1 = f'temp2_column_sumeo_{row3[0]}_{row3[1]}_{row3[2]}_1'
             
@@ -268,262 +283,32 @@ def main():
                         except NameError:
                             print(f"Warning: print_column_test_sumeo_no_tables function not found")
                 else:
-                    for row_dc in results_dc:
-                        query5 = f"""SELECT * FROM {temp_table_sumeo_col1} 
-                                    WHERE percent_wa > 0.100 
-                                    ORDER BY percent_wa DESC"""
-                        
-                        print(f"<p>{query5}</p>")
-                        cursor.execute(query5)
-                        results5 = cursor.fetchall()
-                        
-                        for row5 in results5:
-                            query4 = f"""INSERT INTO {temp_table3} 
-                                        SELECT * FROM combo_5_42 WHERE sum = {row3[0]} AND even = {row3[1]} AND odd = {row3[2]}
-                                        AND seq2 <= 1 AND seq3 = 0 AND mod_tot <= 1 AND mod_x = 0
-                                        AND d0 = {row_dc[5]} AND d1 = {row_dc[6]} AND d2 = {row_dc[7]} AND d3 = {row_dc[8]} AND d4 = {row_dc[9]}
-                                        AND b1 = {row5[0]}"""
-                            
-                            cursor.execute(query4)
-        
-        # Exit early as in PHP
-        print("Main sumeo processing complete - exiting early")
-        connection.commit()
-        return
-        
-        # The following code would run if we didn't exit early
-        # (keeping it for reference but it won't execute)
-        
-        # Read draw count table for each sumeo
-        query3 = f"SELECT DISTINCT * FROM {temp_table1} ORDER BY k_count DESC"
-        print(f"<p>{query3}</p>")
-        
-        cursor.execute(query3)
-        results3 = cursor.fetchall()
-        
-        for row3 in results3:
-            print(f"{row3[0]}, {row3[1]}, {row3[2]} - {row3[3]}<br>")
-            
-            temp_table3 = f'temp_sumeo_draw_{row3[0]}_{row3[1]}_{row3[2]}'
-            
-            # Filter temp_table3
-            query_dc = f"""SELECT * FROM ga_f5_draw_summary_by_sumeo2 
-                          WHERE sum = {row3[0]} AND even = {row3[1]} AND odd = {row3[2]} 
-                          ORDER BY percent_wa DESC"""
-            
-            cursor.execute(query_dc)
-            results_dc = cursor.fetchall()
-            
-            for row_dc in results_dc:
-                query5 = f"""SELECT * FROM {temp_table3} 
-                            WHERE d0 = {row_dc[5]} AND d1 = {row_dc[6]} AND d2 = {row_dc[7]} AND d3 = {row_dc[8]} AND d4 = {row_dc[9]}
-                            AND dup1 <= 1 AND dup2 <= 2 AND dup3 <= 3 AND dup4 <= 4
-                            AND rank0 <= 0 AND rank1 <= 1 AND rank2 <= 3 AND rank3 <= 3 AND rank4 <= 2 AND rank5 <= 3 AND rank6 <= 2 AND rank7 <= 0
-                            ORDER BY y1_sum DESC 
-                            LIMIT 10"""
-                
-                cursor.execute(query5)
-                results5 = cursor.fetchall()
-                
-                for row5e in results5:
-                    query7 = f"INSERT INTO {temp_table2} VALUES (0, "
-                    for t in range(1, 6):
-                        query7 += f"'{row5e[t]}', "
-                    for t in range(6, 60):
-                        query7 += f"'{row5e[t]}', "
-                    query7 += "'1962-08-17')"
-                    
-                    cursor.execute(query7)
-        
-        # Build combination 4/42
-        col1_num = [0] * 11
-        col2_num = [0] * 11
-        col3_num = [0] * 11
-        col4_num = [0] * 11
-        col5_num = [0] * 11
-        
-        draw_num = [0] * 6  # 0-indexed, but we'll use 1-5
-        draw_num[1] = k
-        draw_num[2] = k + 1
-        draw_num[3] = k + 2
-        draw_num[4] = k + 3
-        draw_num[5] = k + 4
-        
-        # Set specific starting values as in PHP
-        draw_num[1] = 8
-        draw_num[2] = 11
-        draw_num[3] = 21
-        draw_num[4] = 22
-        
-        print(f"<p align=\"center\"><b><font face=\"Arial, Helvetica, sans-serif\">Build Combo 4/{max_num}</font></b></p>")
-        
-        # Main combination building loop
-        while draw_num[1] <= 37:
-            num_rows = 0
-            temp_table = "combo_4_42"
-            
-            # Initialize counters
-            even = 0
-            odd = 0
-            d501 = 0
-            d502 = 0
-            d3_array = [0] * 3
-            d4_array = [0] * 4
-            seq2 = 0
-            seq3 = 0
-            mod_total = 0
-            dup_pass = 1
-            mod_x = 0
-            
-            total_combin = [0] * 7
-            num_count = [0] * 7
-            rank_count = [0] * 7
-            mod = [0] * 7
-            dup_count = [0] * 11
-            
-            draw_array = [draw_num[1], draw_num[2], draw_num[3], draw_num[4]]
-            draw_array_0 = [0, draw_num[1], draw_num[2], draw_num[3], draw_num[4]]
-            
-            sum_val = draw_num[1] + draw_num[2] + draw_num[3] + draw_num[4]
-            
-            print(f"<h3>{draw_num[1]} - {draw_num[2]} - {draw_num[3]} - {draw_num[4]}</h3>")
-            
-            # Calculate sequences
-            try:
-                seq2 = Count2Seq(draw_array)
-                seq3 = Count3Seq(draw_array)
-            except NameError:
-                seq2 = 0
-                seq3 = 0
-            
-            # Calculate even/odd
-            for val in draw_array:
-                if val % 2 == 0:
-                    even += 1
-                else:
-                    odd += 1
-            
-            # Calculate modulus
-            for x in range(1, 5):
-                if 0 < draw_num[x] < 10:
-                    y = draw_num[x]
-                    mod[y] += 1
-                    num_count[0] += 1
-                elif 9 < draw_num[x] < 20:
-                    y = draw_num[x] - 10
-                    mod[y] += 1
-                    num_count[1] += 1
-                elif 19 < draw_num[x] < 30:
-                    y = draw_num[x] - 20
-                    mod[y] += 1
-                    num_count[2] += 1
-                elif 29 < draw_num[x] < 40:
-                    y = draw_num[x] - 30
-                    mod[y] += 1
-                    num_count[3] += 1
-                else:
-                    y = draw_num[x] - 40
-                    mod[y] += 1
-                    num_count[4] += 1
-            
-            mod_x = 0
-            for x in range(10):
-                if mod[x] > 1:
-                    mod_total += mod[x] - 1
-                if mod[x] > 2:
-                    mod_x += 1
-            
-            # Check if combination passes filters
-            if True:  # All filters passed in PHP
-                # Calculate statistics
-                avg = sum_val / 4
-                median = (draw_num[2] + draw_num[3]) / 2
-                quart1 = (draw_num[1] + draw_num[2]) / 2
-                quart2 = (draw_num[1] + draw_num[2] + draw_num[3]) / 2
-                quart3 = (draw_num[1] + draw_num[2] + draw_num[3] + draw_num[4]) / 2
-                avedev = 0
-                
-                wheel_generated_rows = 0
-                wheel_generated_wa = 0.0
-                pair_sum = 0
-                draw_count = 0
-                
-                # Check for existing combination
-                query7 = f"""SELECT * FROM combo_4_42 
-                           WHERE b1 = {draw_num[1]} AND b2 = {draw_num[2]} 
-                           AND b3 = {draw_num[3]} AND b4 = {draw_num[4]}
-                           ORDER BY id ASC"""
-                
-                cursor.execute(query7)
-                results7 = cursor.fetchall()
-                draw_count = len(results7)
-                
-                if draw_count > 1:
-                    # Delete duplicates
-                    for i, row7 in enumerate(results7[1:], 1):
-                        query_delete = f"DELETE FROM combo_4_42 WHERE id = {row7[0]}"
-                        cursor.execute(query_delete)
-                else:
-                    draw_last = '1962-08-17'
-                    hml = int(sum_val / 10) * 10
+                    # The col1 rows are the same for every draw-summary row, so read them once
+                    query5 = f"""SELECT * FROM {temp_table_sumeo_col1} 
+                                WHERE percent_wa > 0.100 
+                                ORDER BY percent_wa DESC"""
                     
-                    # Insert new combination
-                    query = f"""INSERT INTO combo_4_42 
-                              (id, b1, b2, b3, b4, sum, hml, even, odd, 
-                               d0, d1, d2, d3, d4, rank0, rank1, rank2, rank3, rank4, rank5, rank6, rank7,
-                               mod_tot, mod_x, seq2, seq3, comb2, comb3, comb4, comb5,
-                               dup1, dup2, dup3, dup4, dup5, dup6, dup7, dup8, dup9, dup10,
-                               pair_sum, avg, median, harmean, geomean, quart1, quart2, quart3,
-                               stdev, variance, avedev, kurt, skew, devsq, wheel_cnt5000, wheel_percent_wa,
-                               draw_last, draw_count, y1_sum, last_updated) 
-                              VALUES (0, {draw_num[1]}, {draw_num[2]}, {draw_num[3]}, {draw_num[4]}, 
-                                     {sum_val}, {hml}, {even}, {odd}, 
-                                     {num_count[0]}, {num_count[1]}, {num_count[2]}, {num_count[3]}, {num_count[4]},
-                                     0, 0, 0, 0, 0, 0, 0, 0,
-                                     {mod_total}, {mod_x}, {seq2}, {seq3}, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
-                                     0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00,
-                                     0, 0.00, '1962-08-17', 0, 0.00, '1962-08-17')"""
+                    print(f"<p>{query5}</p>")
+                    cursor.execute(query5)
+                    results5 = cursor.fetchall()
                     
-                    cursor.execute(query)
-                    count += 1
-            
-            # Increment draw numbers
-            if draw_num[4] < max_num:
-                draw_num[4] += 1
-            elif draw_num[3] < max_num - 1:
-                draw_num[3] += 1
-                draw_num[4] = draw_num[3] + 1
-            elif draw_num[2] < max_num - 2:
-                draw_num[2] += 1
-                draw_num[3] = draw_num[2] + 1
-                draw_num[4] = draw_num[3] + 1
-            else:
-                draw_num[1] += 1
-                draw_num[2] = draw_num[1] + 1
-                draw_num[3] = draw_num[2] + 1
-                draw_num[4] = draw_num[3] + 1
-            
-            # Print progress
-            if print_flag == 50000:
-                print(f"{draw_num[1]},{draw_num[2]},{draw_num[3]},{draw_num[4]}<br>")
-                print_flag = 0
-            
-            print_flag += 1
-        
-        # Display final count
-        print("</table>")
-        print(f"<h2>Count = {count}</h2>")
-        
-        # Display example array data
-        array = [0, 0, 0, 0, 1, 19, 52, 55, 111, 166, 165, 115, 120, 67, 58, 39, 27, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-        
-        print("<table border='1'>")
-        print("<tr><th>Index</th><th>Value</th></tr>")
-        
-        for index, value in enumerate(array):
-            print(f"<tr><td>{index}</td><td>{value}</td></tr>")
-        
-        print("</table>")
+                    # Every (decade profile, b1) pair at once:
+                    # sum/even/odd AND seq2 <= 1 AND seq3 = 0 AND mod_tot <= 1 AND mod_x = 0
+                    # AND (d0..d4) IN decade_profiles AND b1 IN col1_values
+                    decade_profiles = [tuple(row_dc[5:10]) for row_dc in results_dc]
+                    col1_values = [row5[0] for row5 in results5]
+                    ids = engine.candidate_ids(row3[0], row3[1], row3[2], decade_profiles, col1_values)
+                    sumeo_candidates[(row3[0], row3[1], row3[2])] = ids
+                    insert_candidates(cursor, temp_table3, engine.combinations(ids))
+                    print(f"<p>{len(ids)} candidates into {temp_table3}</p>")
+        
+        total_candidates = sum(len(ids) for ids in sumeo_candidates.values())
+        print(f"<p>{total_candidates} candidates for {len(sumeo_candidates)} sumeo rows "
+              f"in {time.time() - build_start:.2f}s</p>")
+        
+        # The PHP stage stops here as well; the later stages read the temp_sumeo_draw_* tables
+        print("Main sumeo processing complete")
+        connection.commit()
         
         # Close HTML
         print("</body>")
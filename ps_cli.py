@@ -6,6 +6,12 @@ import argparse
 import json
 import sys
 from itertools import combinations
+from lot_filter_batch import filter_batch
+from lot_combo_mask import RecentDrawMasks
+from lot_manifest import seed_everything, build_manifest, snapshot_id, write_manifest
+
+# Random candidates drawn between filter_batch calls
+FILTER_BATCH_SIZE = 256
 
 class GeorgiaFantasy5Predictor:
     def __init__(self, config):
@@ -47,6 +53,9 @@ class GeorgiaFantasy5Predictor:
         # Convert to DataFrame for easier manipulation
         self.historical_draws = pd.DataFrame(results)
         print(f"Loaded {len(self.historical_draws)} historical draws")
+        
+        # Bitmask snapshot of the last 3 draws for the duplicate rules, built once per load
+        self.recent_masks = RecentDrawMasks(self.get_recent_draw_numbers(3), depth=3)
     
     def get_last_n_draws(self, n=10):
         """Get the last n draws"""
@@ -143,6 +152,12 @@ class GeorgiaFantasy5Predictor:
         
         return dup_counts, cumulative_dups
     
+    def get_recent_draw_numbers(self, n=3):
+        """Get the numbers of the last n draws as lists, most recent first"""
+        last_draws = self.get_last_n_draws(n)
+        return [[int(row['b1']), int(row['b2']), int(row['b3']), int(row['b4']), int(row['b5'])]
+                for _, row in last_draws.iterrows()]
+    
     def filter_combination(self, combination):
         """
         Apply all filters to a combination
@@ -156,67 +171,55 @@ class GeorgiaFantasy5Predictor:
         # Basic checks
         if len(combination) != self.nums_per_draw:
             return False
-            
-        # Get statistics
-        stats = {}
         
-        # Even/Odd distribution
-        even_count = sum(1 for num in combination if num % 2 == 0)
-        odd_count = self.nums_per_draw - even_count
+        return bool(self.filter_combinations([combination])[0])
+    
+    def filter_settings(self):
+        """Current filter settings in the form filter_batch takes"""
+        return {
+            'max_seq2': self.max_seq2,
+            'max_seq3': self.max_seq3,
+            'max_mod_tot': self.max_mod_tot,
+            'sum_range': self.sum_range
+        }
+    
+    def filter_combinations(self, combos):
+        """
+        Apply all filters to a list of 5-number combinations in one kernel call
         
-        if not (2 <= even_count <= 3 and 2 <= odd_count <= 3):
-            return False
-            
-        # Sequential numbers check
-        seq2, seq3 = self.count_sequential_numbers(combination)
-        if seq2 > self.max_seq2 or seq3 > self.max_seq3:
-            return False
-            
-        # Modular totals check
-        mod_total, mod_x = self.calculate_modular_total(combination)
-        if mod_total > self.max_mod_tot or mod_x > 0:
-            return False
-            
-        # Decade distribution check
-        d0, d1, d2, d3, d4 = self.calculate_decade_distribution(combination)
-        if d0 > 2 or d1 > 2 or d2 > 2 or d3 > 2 or d4 > 2:
-            return False
-            
-        # Duplicate check from previous draws
-        dup_counts, cumulative_dups = self.calculate_duplicates_from_previous(combination)
+        Even/odd, sequential, modular, decade, duplicate and sum rules are
+        applied by the shared vectorized kernel against the recent draws
+        captured when the history was loaded.
         
-        # Your filtering rules:
-        # - No more than 1 number from most recent draw
-        if dup_counts[0] > 1:
-            return False
-            
-        # - No more than 2 numbers from cumulative 2 most recent draws
-        if cumulative_dups[1] > 2:
-            return False
-            
-        # - No more than 3 numbers from cumulative 3 most recent draws
-        if cumulative_dups[2] > 3:
-            return False
-            
-        # Sum range check
-        total_sum = sum(combination)
-        min_sum, max_sum = self.sum_range
-        if not (min_sum <= total_sum <= max_sum):
-            return False
-            
-        # All filters passed
-        return True
+        Returns:
+        np.ndarray: Boolean mask, True where the combination passes all filters
+        """
+        if not len(combos):
+            return np.zeros(0, dtype=bool)
+        return filter_batch(combos, self.filter_settings(), self.recent_masks)
     
-    def generate_predictions(self, count=10):
+    def run_manifest(self, seed, count, outputs=None):
+        """Manifest describing a generate_predictions run with the current settings"""
+        settings = self.filter_settings()
+        # The frequency queries count back from NOW(), so the reference date is part of the snapshot
+        latest_date = self.historical_draws.iloc[0]['date'] if not self.historical_draws.empty else None
+        return build_manifest('ps_cli', seed, count, settings,
+                              history_snapshot=snapshot_id(latest_date, datetime.now().date(),
+                                                           len(self.historical_draws)),
+                              outputs=outputs)
+    
+    def generate_predictions(self, count=10, seed=None):
         """
         Generate top predictions
         
         Parameters:
         count (int): Number of predictions to generate
+        seed (int): Random seed (a fresh one is drawn if None; see self.seed)
         
         Returns:
         list: List of prediction dictionaries with combinations and scores
         """
+        self.seed = seed_everything(seed)
         print(f"Generating {count} predictions for Georgia Fantasy 5...")
         
         # Get the latest draw date for tracking
@@ -268,6 +271,8 @@ class GeorgiaFantasy5Predictor:
         max_scaffolds = min(count * 10, 100)  # Cap at 100 scaffolds
         
         print("Building combinations using scaffolding approach...")
+        # Enumerate every scaffold combination in search order, then filter them in one batch
+        scaffold_combos = []
         for pos1 in pos1_candidates[:5]:  # Limit to top 5 for position 1
             for pos3 in pos3_candidates[:5]:  # Limit to top 5 for position 3
                 for pos5 in pos5_candidates[:5]:  # Limit to top 5 for position 5
@@ -275,35 +280,27 @@ class GeorgiaFantasy5Predictor:
                     if not (pos1 < pos3 < pos5):
                         continue
                     
-                    # Now find valid positions 2 and 4
                     # For each scaffold (1, 3, 5), try all possible positions 2 and 4
                     for pos2 in range(pos1 + 1, pos3):
                         for pos4 in range(pos3 + 1, pos5):
-                            # Create the full combination
-                            combo = sorted([pos1, pos2, pos3, pos4, pos5])
-                            
-                            # Check if it passes all filters
-                            if self.filter_combination(combo):
-                                # Calculate a score for this combination
-                                stats = self._calculate_stats(combo)
-                                score = self._calculate_score(combo, stats)
-                                
-                                filtered_combinations.append({
-                                    'combination': combo,
-                                    'score': score,
-                                    'sum': sum(combo),
-                                    'stats': stats
-                                })
-                                
-                                scaffold_count += 1
-                                if scaffold_count >= max_scaffolds:
-                                    break
-                        if scaffold_count >= max_scaffolds:
-                            break
-                    if scaffold_count >= max_scaffolds:
-                        break
-                if scaffold_count >= max_scaffolds:
-                    break
+                            scaffold_combos.append(sorted([pos1, pos2, pos3, pos4, pos5]))
+        
+        for combo, passed in zip(scaffold_combos, self.filter_combinations(scaffold_combos)):
+            if not passed:
+                continue
+            
+            # Calculate a score for this combination
+            stats = self._calculate_stats(combo)
+            score = self._calculate_score(combo, stats)
+            
+            filtered_combinations.append({
+                'combination': combo,
+                'score': score,
+                'sum': sum(combo),
+                'stats': stats
+            })
+            
+            scaffold_count += 1
             if scaffold_count >= max_scaffolds:
                 break
         
@@ -344,26 +341,34 @@ class GeorgiaFantasy5Predictor:
             checked_combos = set(tuple(combo['combination']) for combo in filtered_combinations)
             attempts = 0
             
-            # Try to find more combinations
+            # Try to find more combinations, filtering each batch of new candidates in one call
             while len(filtered_combinations) < count * 2 and attempts < 5000:
-                attempts += 1
-                
-                # Generate a random 5-number combination
-                if attempts % 2 == 0:
-                    # Every other attempt, use weighted selection
-                    combo = sorted(np.random.choice(weighted_nums, self.nums_per_draw, replace=False))
-                else:
-                    # Otherwise, use pure random selection from all numbers
-                    combo = sorted(np.random.choice(range(1, 43), self.nums_per_draw, replace=False))
-                
-                combo_tuple = tuple(combo)
-                if combo_tuple in checked_combos:
-                    continue
-                
-                checked_combos.add(combo_tuple)
+                batch = []
+                for _ in range(min(FILTER_BATCH_SIZE, 5000 - attempts)):
+                    attempts += 1
+                    
+                    # Generate a random 5-number combination
+                    if attempts % 2 == 0:
+                        # Every other attempt, use weighted selection
+                        combo = sorted(np.random.choice(weighted_nums, self.nums_per_draw, replace=False))
+                    else:
+                        # Otherwise, use pure random selection from all numbers
+                        combo = sorted(np.random.choice(range(1, 43), self.nums_per_draw, replace=False))
+                    
+                    combo_tuple = tuple(combo)
+                    if combo_tuple in checked_combos:
+                        continue
+                    
+                    checked_combos.add(combo_tuple)
+                    batch.append(combo)
                 
-                # Check if it passes filters
-                if self.filter_combination(combo):
+                # Keep the passing combinations in draw order until enough are found
+                for combo, passed in zip(batch, self.filter_combinations(batch)):
+                    if len(filtered_combinations) >= count * 2:
+                        break
+                    if not passed:
+                        continue
+                    
                     # Calculate stats and score
                     stats = self._calculate_stats(combo)
                     score = self._calculate_score(combo, stats)
@@ -570,6 +575,7 @@ def main():
     # Output settings
     parser.add_argument('--count', type=int, default=10, help='Number of predictions to generate')
     parser.add_argument('--output', help='Output CSV filename (default: ga_f5_predictions_YYYYMMDD.csv)')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible predictions')
     
     # Parse arguments
     args = parser.parse_args()
@@ -593,13 +599,14 @@ def main():
         predictor.sum_range = (args.min_sum, args.max_sum)
         
         # Generate predictions
-        predictions = predictor.generate_predictions(count=args.count)
+        predictions = predictor.generate_predictions(count=args.count, seed=args.seed)
         
         # Display predictions
         predictor.display_predictions(predictions)
         
-        # Save predictions to CSV
-        predictor.save_predictions_to_csv(predictions, filename=args.output)
+        # Save predictions to CSV along with the run manifest
+        filename = predictor.save_predictions_to_csv(predictions, filename=args.output)
+        write_manifest(predictor.run_manifest(predictor.seed, args.count, outputs=[filename]), filename)
         
     except Exception as e:
         print(f"Error: {e}")
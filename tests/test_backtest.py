@@ -0,0 +1,44 @@
+"""
+Backtest rolling state against the live DrawHistory windows and the cover generator's scoring inputs
+"""
+
+import numpy as np
+
+from lot_backtest import Backtest
+from lot_draw_history import DrawHistory, day_date
+from lot_scoring import (ScoringContext, score_batch, AVG_SUM_DAYS, COVER_FREQUENCY,
+                         DEFAULT_AVG_SUM, FREQUENCY_DAYS, NUM_MAX)
+
+
+def synthetic_history(count=400, seed=11):
+    """Draws on irregular dates (gaps of 1-3 days) so window edges land on and between draws"""
+    rng = np.random.default_rng(seed)
+    days = 20000 + np.cumsum(rng.integers(1, 4, count)).astype(np.int32)
+    balls = np.sort(np.array([rng.choice(np.arange(1, NUM_MAX + 1), 5, replace=False)
+                              for _ in range(count)], dtype=np.uint8), axis=1)
+    return days, balls
+
+
+def test_rolling_windows_match_draw_history():
+    days, balls = synthetic_history()
+    backtest = Backtest(days, balls)
+
+    for i in range(len(days)):
+        # Live scoring on the draw's date sees only the draws before it
+        history = DrawHistory(days[:i], balls[:i])
+        today = day_date(days[i])
+        assert np.array_equal(backtest.frequency[i], history.frequency(days=FREQUENCY_DAYS, today=today))
+        expected = history.average_sum(days=AVG_SUM_DAYS, today=today)
+        assert backtest.avg_sum[i] == (DEFAULT_AVG_SUM if expected is None else expected)
+
+
+def test_cover_scores_use_generator_inputs():
+    days, balls = synthetic_history(count=200)
+    backtest = Backtest(days, balls)
+    rank_limits = [[1, 2, 3, 4, 5, 6, 7]] * 3
+    rank_counts = list(np.random.default_rng(3).integers(0, 7, NUM_MAX))
+
+    context = ScoringContext([COVER_FREQUENCY] * (NUM_MAX + 1), DEFAULT_AVG_SUM,
+                             rank_limits=rank_limits, rank_counts=rank_counts)
+    expected, _ = score_batch(balls, context, model='cover')
+    assert np.array_equal(backtest.scores('cover', rank_limits, rank_counts), expected)
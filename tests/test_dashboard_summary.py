@@ -0,0 +1,51 @@
+"""
+Dashboard file analysis from column arrays against the row-by-row summary
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('flask')
+
+from lot_cover_dashboard import analyze_draws_columns, analyze_draws_summary
+from lot_draw_io import DRAW_COLUMN_NAMES, ColumnarDrawWriter, read_draws
+
+
+def synthetic_rows(count, seed=11):
+    """Scored draw rows as the generator streams them (highest score first once written)"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _ in range(count):
+        balls = sorted(rng.choice(np.arange(1, 43), 5, replace=False).tolist())
+        even = sum(1 for num in balls if num % 2 == 0)
+        row = dict.fromkeys(DRAW_COLUMN_NAMES, 0)
+        row.update({f'Num{i}': num for i, num in enumerate(balls, 1)})
+        row.update(Score=round(float(rng.uniform(20, 90)), 4), Sum=sum(balls), Even=even, Odd=5 - even,
+                   Mean=sum(balls) / 5, Median=float(balls[2]))
+        rows.append(row)
+    return rows
+
+
+@pytest.mark.parametrize('count', [1, 37, 10000])
+def test_columns_match_row_summary(tmp_path, count):
+    path = str(tmp_path / 'draws.npz')
+    with ColumnarDrawWriter(path, sort_by='Score') as writer:
+        for row in synthetic_rows(count):
+            writer.write(row)
+
+    table = read_draws(path)
+    assert analyze_draws_columns(table.columns) == analyze_draws_summary(list(table))
+
+
+def test_csv_rows_match_columns(tmp_path):
+    # The CSV path reads strings; the columnar copy of the same draws gives the same summary
+    path = str(tmp_path / 'draws.npz')
+    rows = synthetic_rows(500, seed=3)
+    with ColumnarDrawWriter(path, sort_by='Score') as writer:
+        for row in rows:
+            writer.write(row)
+
+    table = read_draws(path)
+    csv_rows = [{name: str(value) for name, value in zip(table.columns, values)}
+                for values in zip(*(table.columns[name].tolist() for name in table.columns))]
+    assert analyze_draws_columns(table.columns) == analyze_draws_summary(csv_rows)
@@ -0,0 +1,81 @@
+"""
+DrawHistory loading (same-date, out-of-order and repeated rows) and the window frequencies its callers read
+"""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from lot_draw_history import DrawHistory, day_number
+
+
+class ListCursor:
+    """Dictionary cursor stand-in returning fixed rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchall(self):
+        return self.rows
+
+
+def draw(day, *balls):
+    return dict(zip(('date', 'b1', 'b2', 'b3', 'b4', 'b5'), (date(2026, 10, day),) + balls))
+
+
+def test_same_date_draws_are_kept():
+    # The DataFrame load kept every row, including two draws sharing a date
+    history = DrawHistory()
+    rows = [draw(1, 1, 2, 3, 4, 5), draw(1, 6, 7, 8, 9, 10), draw(2, 11, 12, 13, 14, 15)]
+    assert history.load_new_draws(ListCursor(rows)) == 3
+    assert history.skipped_draws == 0
+    assert history.recent(3) == [[11, 12, 13, 14, 15], [6, 7, 8, 9, 10], [1, 2, 3, 4, 5]]
+    assert history.frequency(since=date(2026, 10, 1)).sum() == 15
+
+    # A later row on the latest day is appended too
+    assert history.load_new_draws(ListCursor([draw(2, 20, 21, 22, 23, 24)])) == 1
+    assert len(history) == 4 and history.latest_date == date(2026, 10, 2)
+
+
+def test_older_and_repeated_rows_are_counted_and_reported(capsys):
+    history = DrawHistory()
+    rows = [draw(1, 1, 2, 3, 4, 5), draw(2, 6, 7, 8, 9, 10), draw(2, 10, 9, 8, 7, 6), draw(1, 11, 12, 13, 14, 15)]
+    assert history.load_new_draws(ListCursor(rows)) == 2
+    assert history.skipped_draws == 2
+    assert '2026-10-01' in capsys.readouterr().out
+
+    # Later loads keep counting
+    assert history.load_new_draws(ListCursor([draw(2, 6, 7, 8, 9, 10), draw(3, 1, 2, 3, 4, 7)])) == 1
+    assert history.skipped_draws == 3
+    assert len(history) == 3
+
+
+def test_clean_load_reports_nothing(capsys):
+    history = DrawHistory()
+    assert history.load_new_draws(ListCursor([draw(1, 1, 2, 3, 4, 5), draw(2, 6, 7, 8, 9, 10)])) == 2
+    assert history.skipped_draws == 0
+    assert 'skipped' not in capsys.readouterr().out
+
+
+def test_ps_index_rank_frequency_matches_date_query():
+    import ps_index
+
+    rng = np.random.default_rng(5)
+    today = date.today()
+    draws = [(today - timedelta(days=offset), sorted(rng.choice(np.arange(1, 43), 5, replace=False).tolist()))
+             for offset in range(90, 0, -1)]
+    predictor = object.__new__(ps_index.GeorgiaFantasy5Predictor)
+    predictor.draw_history = DrawHistory([day_number(d) for d, _ in draws], [balls for _, balls in draws])
+
+    for days in (1, 7, 30, 365):
+        # The SQL it replaced: date >= (NOW() - days) as 'YYYY-MM-DD', counted ball by ball
+        cutoff = (datetime.now() - timedelta(days=days)).date()
+        expected = {num: 0 for num in range(1, 43)}
+        for draw_date, balls in draws:
+            if draw_date >= cutoff:
+                for ball in balls:
+                    expected[ball] += 1
+        assert predictor.get_rank_frequency(days) == expected
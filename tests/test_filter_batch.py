@@ -0,0 +1,99 @@
+"""
+filter_batch against the original per-combination filter_combination rules
+
+The reference below is the scalar rule chain the generators ran before
+delegating to the vectorized kernel.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from lot_filter_batch import filter_batch
+from lot_combo_mask import RecentDrawMasks
+
+SETTINGS = [
+    {'max_seq2': 1, 'max_seq3': 0, 'max_mod_tot': 1, 'sum_range': (70, 139)},
+    {'max_seq2': 1, 'max_seq3': 0, 'max_mod_tot': 2, 'sum_range': (80, 120)},
+    {'max_seq2': 2, 'max_seq3': 1, 'max_mod_tot': 0, 'sum_range': (60, 160)},
+]
+
+
+def reference_filter(combination, settings, recent_draws):
+    """The filter_combination rule chain, one combination at a time"""
+    if len(combination) != 5:
+        return False
+
+    even = sum(1 for num in combination if num % 2 == 0)
+    if not (2 <= even <= 3 and 2 <= 5 - even <= 3):
+        return False
+
+    ordered = sorted(combination)
+    seq2 = sum(1 for i in range(4) if ordered[i + 1] - ordered[i] == 1)
+    seq3 = sum(1 for i in range(3) if ordered[i + 1] - ordered[i] == 1 and ordered[i + 2] - ordered[i + 1] == 1)
+    if seq2 > settings['max_seq2'] or seq3 > settings['max_seq3']:
+        return False
+
+    mod_counts = [0] * 10
+    for num in combination:
+        mod_counts[num % 10] += 1
+    mod_total = sum(max(0, count - 1) for count in mod_counts)
+    mod_x = sum(1 for count in mod_counts if count > 2)
+    if mod_total > settings['max_mod_tot'] or mod_x > 0:
+        return False
+
+    decades = [0] * 5
+    for num in combination:
+        decades[min(num // 10, 4)] += 1
+    if max(decades) > 2:
+        return False
+
+    seen = set()
+    for depth, limit in enumerate((1, 2, 3)):
+        if depth >= len(recent_draws):
+            break
+        seen |= set(recent_draws[depth])
+        if len(set(combination) & seen) > limit:
+            return False
+
+    min_sum, max_sum = settings['sum_range']
+    return min_sum <= sum(combination) <= max_sum
+
+
+@pytest.fixture(scope='module')
+def candidates():
+    rng = random.Random(2024)
+    return [sorted(rng.sample(range(1, 43), 5)) for _ in range(20000)]
+
+
+@pytest.fixture(scope='module')
+def recent_draws():
+    rng = random.Random(7)
+    return [sorted(rng.sample(range(1, 43), 5)) for _ in range(3)]
+
+
+@pytest.mark.parametrize('settings', SETTINGS)
+@pytest.mark.parametrize('depth', [0, 1, 3])
+def test_filter_batch_matches_reference(candidates, recent_draws, settings, depth):
+    recent = recent_draws[:depth]
+    expected = np.array([reference_filter(combo, settings, recent) for combo in candidates])
+    assert np.array_equal(filter_batch(candidates, settings, recent), expected)
+    assert np.array_equal(filter_batch(candidates, settings, RecentDrawMasks(recent, depth=3)), expected)
+
+
+def test_filter_batch_ignores_ball_order(candidates, recent_draws):
+    shuffled = [combo[::-1] for combo in candidates]
+    assert np.array_equal(filter_batch(shuffled, SETTINGS[0], recent_draws),
+                          filter_batch(candidates, SETTINGS[0], recent_draws))
+
+
+def test_ps_index_filters_match_reference(candidates, recent_draws):
+    import ps_index
+
+    predictor = object.__new__(ps_index.GeorgiaFantasy5Predictor)
+    predictor.nums_per_draw = 5
+    predictor.recent_masks = RecentDrawMasks(recent_draws, depth=3)
+    expected = np.array([reference_filter(combo, ps_index.FILTER_SETTINGS, recent_draws) for combo in candidates])
+    assert np.array_equal(predictor.filter_combinations(candidates), expected)
+    assert [predictor.filter_combination(combo) for combo in candidates[:500]] == expected[:500].tolist()
@@ -0,0 +1,98 @@
+"""
+PairIndex windows and top pairs against the per-request loops of the lotto /pairs and /grid pages
+
+The reference below is the loop those routes ran over the last 'limit' draws
+(ORDER BY date DESC) before they read the cumulative index.
+"""
+
+from collections import Counter
+from datetime import date, timedelta
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from lot_pair_index import PairIndex, pair_matrix, top_pairs
+
+NUM_MAX = 42
+LIMITS = [1, 5, 26, 63, 64, 65, 100, 299, 300, 1000]
+
+
+def synthetic_draws(count=300, seed=23):
+    rng = np.random.default_rng(seed)
+    first = date(2025, 1, 1)
+    return [(first + timedelta(days=i), sorted(rng.choice(np.arange(1, NUM_MAX + 1), 5, replace=False).tolist()))
+            for i in range(count)]
+
+
+def reference_pairs(draws, limit):
+    """Grid and count-sorted pair list of the last limit draws, as the pages built them"""
+    pairs_data = {}
+    grid_data = [[0 for _ in range(NUM_MAX + 1)] for _ in range(NUM_MAX + 1)]
+    for draw_date, draw_numbers in draws[::-1][:limit]:
+        for i, num1 in enumerate(draw_numbers):
+            for num2 in draw_numbers[i + 1:]:
+                key = f"{min(num1, num2)}-{max(num1, num2)}"
+                if key in pairs_data:
+                    pairs_data[key]['count'] += 1
+                else:
+                    pairs_data[key] = {'num1': min(num1, num2), 'num2': max(num1, num2),
+                                       'count': 1, 'last_date': draw_date}
+                grid_data[min(num1, num2)][max(num1, num2)] += 1
+    return grid_data, sorted(pairs_data.values(), key=lambda x: x['count'], reverse=True)
+
+
+@pytest.mark.parametrize('interval', [7, 64])
+def test_windows_match_reference(interval):
+    draws = synthetic_draws()
+    index = PairIndex(NUM_MAX, checkpoint_interval=interval)
+    for draw_date, balls in draws:
+        index.append(draw_date, balls)
+
+    for limit in LIMITS:
+        grid, pairs = reference_pairs(draws, limit)
+        assert index.counts(limit).tolist() == grid
+        assert index.top_pairs(30, limit) == pairs[:30]
+    assert index.counts().tolist() == reference_pairs(draws, len(draws))[0]
+
+
+def test_appends_invalidate_cached_windows():
+    draws = synthetic_draws(count=150)
+    index = PairIndex(NUM_MAX, checkpoint_interval=16)
+    for step, (draw_date, balls) in enumerate(draws, 1):
+        index.append(draw_date, balls)
+        if step % 10 == 0:
+            for limit in (3, 26, 200):
+                assert index.counts(limit).tolist() == reference_pairs(draws[:step], limit)[0]
+
+
+def test_pair_matrix_top_pairs_match_counter():
+    draws = [balls for _, balls in synthetic_draws(count=120)]
+    expected = Counter(pair for balls in draws for pair in combinations(balls, 2))
+    matrix = pair_matrix(draws)
+    assert {(a, b): int(matrix[a, b]) for a, b in expected} == dict(expected)
+    assert int(matrix.sum()) == sum(expected.values())
+
+    num1, num2, counts = top_pairs(matrix, 20)
+    ranked = sorted(expected.items(), key=lambda item: (-item[1], item[0]))[:20]
+    assert list(zip(num1.tolist(), num2.tolist(), counts.tolist())) == [(a, b, c) for (a, b), c in ranked]
+
+
+def test_same_date_draws_are_kept_and_repeats_counted():
+    draws = synthetic_draws(count=3)
+    rows = [dict(zip(('date', 'b1', 'b2', 'b3', 'b4', 'b5'), [draw_date] + balls)) for draw_date, balls in draws]
+    same_day = dict(zip(('date', 'b1', 'b2', 'b3', 'b4', 'b5'), [draws[1][0], 1, 2, 3, 4, 5]))
+    assert draws[1][1] != [1, 2, 3, 4, 5]
+
+    class ListCursor:
+        def execute(self, query, params=None):
+            pass
+
+        def fetchall(self):
+            # A second draw on day 1, a repeat of it, then an out-of-order row
+            return rows[:2] + [same_day, same_day, rows[2], rows[0]]
+
+    index = PairIndex(NUM_MAX)
+    assert index.load_new_draws(ListCursor(), 'ga_f5_draws') == 4
+    assert index.skipped_draws == 2
+    assert int(index.counts().sum()) == 4 * 10
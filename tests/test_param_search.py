@@ -0,0 +1,36 @@
+"""
+walk_forward selects on the earlier folds only and scores the choice on the next fold
+"""
+
+from lot_param_search import fold_summary, walk_forward
+
+FOLD_SIZES = [10, 10, 10]
+
+
+def filter_row(name, fold_passed, space_size):
+    row = {'settings': {'name': name}, 'fold_passed': fold_passed, 'space_size': space_size,
+           'space_rate': space_size / 1000 * 100}
+    row.update(fold_summary(row, FOLD_SIZES))
+    return row
+
+
+def test_filter_choice_ignores_later_folds():
+    # 'early' wins on fold 0 only; 'late' wins on folds 1-2, which only fold 2's step may see
+    rows = [filter_row('early', [8, 1, 1], 100), filter_row('late', [1, 9, 9], 100)]
+    result = walk_forward(rows, [], FOLD_SIZES, min_pass_rate=0)
+
+    first, second = result['steps']
+    assert first['settings'] == {'name': 'early'} and first['test_pass_rate'] == 10.0
+    assert second['settings'] == {'name': 'late'} and second['train_pass_rate'] == 50.0
+    assert result['out_of_sample_pass_rate'] == 50.0
+    assert result['out_of_sample_percentile'] is None
+
+
+def test_weight_choice_is_scored_out_of_sample():
+    weights = [{'weights': {'name': 'a'}, 'fold_percentiles': [60.0, 40.0, 40.0]},
+               {'weights': {'name': 'b'}, 'fold_percentiles': [50.0, 70.0, 70.0]}]
+    result = walk_forward([], weights, FOLD_SIZES)
+
+    assert [step['weights']['name'] for step in result['steps']] == ['a', 'b']
+    assert result['out_of_sample_percentile'] == 55.0
+    assert result['out_of_sample_pass_rate'] is None
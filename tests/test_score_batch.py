@@ -0,0 +1,91 @@
+"""
+score_batch against the scalar scorers it replaces
+
+'cover' is checked against GAFantasy5Generator.calculate_score
+(lot_cover_1000.py) and 'predictor' against
+GeorgiaFantasy5Predictor._calculate_score (app.py, needs Flask to import).
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from lot_draw_history import DrawHistory
+from lot_scoring import ScoringContext, score_batch, snapshot_key_for
+
+RANK_LIMITS = [1, 1, 2, 3, 2, 3, 1, 1]
+RANK_COUNTS = [5, 5, 2, 1, 3, 5, 3, 5, 5, 5, 5, 4, 2, 5, 5, 3, 5, 4, 0, 4, 5,
+               2, 4, 5, 3, 5, 5, 0, 4, 3, 2, 1, 4, 5, 3, 5, 1, 4, 3, 3, 2, 5]
+COL1_DATA = {
+    ('96-105', '2', '3'): [3, 7, 11],
+    ('<85', '*', '*'): [1, 2, 4],
+    ('*', '3', '2'): [2, 6, 8, 10],
+    ('>115', '3', '2'): [14],
+}
+
+
+@pytest.fixture(scope='module')
+def combos():
+    rng = random.Random(11)
+    return [sorted(rng.sample(range(1, 43), 5)) for _ in range(5000)]
+
+
+def _bare(cls, **attributes):
+    """Instance of cls without running its database-loading __init__"""
+    instance = object.__new__(cls)
+    instance.__dict__.update(attributes)
+    return instance
+
+
+def test_cover_model_matches_calculate_score(combos):
+    from lot_cover_1000 import GAFantasy5Generator
+
+    generator = _bare(GAFantasy5Generator, num_range=(1, 42), nums_per_draw=5,
+                      rank_limits=RANK_LIMITS, rank_counts=RANK_COUNTS)
+    context = ScoringContext(frequency=[5] * 43, avg_sum=100, rank_limits=RANK_LIMITS, rank_counts=RANK_COUNTS)
+
+    expected = np.array([generator.calculate_score(combo)[0] for combo in combos])
+    scores, _ = score_batch(combos, context, model='cover')
+    np.testing.assert_allclose(scores, expected, rtol=0, atol=1e-4)
+
+
+def test_predictor_model_matches_calculate_score(combos):
+    pytest.importorskip('flask')
+    from app import GeorgiaFantasy5Predictor
+
+    rng = np.random.default_rng(5)
+    history = DrawHistory()
+    context = ScoringContext(frequency=rng.integers(0, 14, 43).tolist(), avg_sum=104.3721,
+                             col1_data=COL1_DATA, rank_limits=RANK_LIMITS, rank_counts=RANK_COUNTS,
+                             snapshot_key=snapshot_key_for(history.latest_date))
+    predictor = _bare(GeorgiaFantasy5Predictor, nums_per_draw=5, scoring_context=context, historical_draws=history,
+                      rank_limits=RANK_LIMITS, rank_counts=RANK_COUNTS)
+
+    expected = np.array([predictor._calculate_score(combo, predictor._calculate_stats(combo)) for combo in combos])
+    scores, components = score_batch(combos, context)
+    np.testing.assert_allclose(scores, expected, rtol=0, atol=1e-4)
+    assert np.count_nonzero(components['col1']) > 0
+
+
+def test_calculate_score_rebuilds_a_stale_context(combos):
+    pytest.importorskip('flask')
+    from datetime import date, timedelta
+
+    from app import GeorgiaFantasy5Predictor
+
+    today = date.today()
+    history = DrawHistory()
+    for offset, combo in zip(range(60, 0, -1), combos):
+        history.append(today - timedelta(days=offset), combo)
+    stale = ScoringContext(frequency=[0] * 43, col1_data=COL1_DATA, rank_limits=RANK_LIMITS,
+                           rank_counts=RANK_COUNTS, snapshot_key=snapshot_key_for(today - timedelta(days=2)))
+    predictor = _bare(GeorgiaFantasy5Predictor, nums_per_draw=5, scoring_context=stale, historical_draws=history,
+                      col1_data=COL1_DATA, rank_limits=RANK_LIMITS, rank_counts=RANK_COUNTS)
+
+    combo = combos[-1]
+    score = predictor._calculate_score(combo, predictor._calculate_stats(combo))
+    assert predictor.scoring_context is not stale
+    assert predictor.scoring_context.snapshot_key == snapshot_key_for(history.latest_date)
+    expected, _ = score_batch([combo], ScoringContext.from_history(history, COL1_DATA, RANK_LIMITS, RANK_COUNTS))
+    assert score == pytest.approx(float(expected[0]), abs=1e-4)
@@ -0,0 +1,94 @@
+"""
+SubsetCounts against a Counter of k-subset tuples (the notebooks' approach)
+"""
+
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from lot_combo_rank import decode
+from lot_draw_history import day_date, day_number
+from lot_subset_counts import SubsetCounts, subset_counts
+
+NUM_MAX = 42
+SIZES = (1, 2, 3, 4, 5)
+
+
+def synthetic_history(count=250, seed=24):
+    rng = np.random.default_rng(seed)
+    days = 20000 + np.cumsum(rng.integers(1, 4, count)).astype(np.int32)
+    balls = np.array([rng.choice(np.arange(1, NUM_MAX + 1), 5, replace=False) for _ in range(count)])
+    return days, balls
+
+
+def window_draws(days, balls, last=None, since=None):
+    """The (day, draw) pairs a window covers"""
+    start = 0
+    if last is not None:
+        start = max(len(days) - last, 0)
+    elif since is not None:
+        start = int(np.searchsorted(days, day_number(since)))
+    return list(zip(days[start:], balls[start:]))
+
+
+def reference(days, balls, k, **window):
+    """Counter of sorted k-subset tuples and the last day each was drawn (whole history)"""
+    counts = Counter()
+    for _, draw in window_draws(days, balls, **window):
+        counts.update(combinations(sorted(draw.tolist()), k))
+    last_seen = {}
+    for day, draw in zip(days, balls):
+        for subset in combinations(sorted(draw.tolist()), k):
+            last_seen[subset] = day
+    return counts, last_seen
+
+
+@pytest.fixture(scope='module')
+def history():
+    days, balls = synthetic_history()
+    return days, balls, SubsetCounts(days, balls, SIZES)
+
+
+def windows(days):
+    """Whole history, last-N windows and since windows starting on and between draw dates"""
+    middle = days[len(days) // 2]
+    return [{}, {'last': 1}, {'last': 37}, {'last': 10000},
+            {'since': day_date(middle)}, {'since': day_date(middle + 1)}]
+
+
+@pytest.mark.parametrize('k', SIZES)
+def test_counts_match_counter(history, k):
+    days, balls, engine = history
+    for window in windows(days):
+        expected, _ = reference(days, balls, k, **window)
+        counts = engine.counts(k, **window)
+        drawn = np.flatnonzero(counts)
+        assert dict(zip(map(tuple, decode(drawn, k, NUM_MAX).tolist()), counts[drawn].tolist())) == dict(expected)
+
+    assert np.array_equal(subset_counts(balls, k), engine.totals[k])
+
+
+@pytest.mark.parametrize('k', SIZES)
+def test_top_matches_counter_order(history, k):
+    days, balls, engine = history
+    for window in windows(days):
+        expected, last_seen = reference(days, balls, k, **window)
+        ranked = sorted(expected, key=lambda subset: (-expected[subset], -last_seen[subset], subset))[:15]
+        assert engine.top(k, 15, **window) == [
+            {'numbers': list(subset), 'count': expected[subset], 'last_date': day_date(last_seen[subset]).isoformat()}
+            for subset in ranked]
+
+
+@pytest.mark.parametrize('k', (2, 3))
+def test_never_drawn_and_summary(history, k):
+    days, balls, engine = history
+    expected, _ = reference(days, balls, k)
+    never = [subset for subset in combinations(range(1, NUM_MAX + 1), k) if subset not in expected]
+    assert sorted(map(tuple, engine.never_drawn(k).tolist())) == never
+
+    summary = engine.summary(k)
+    assert summary['drawn'] == len(expected)
+    assert summary['never_drawn'] == len(never)
+    assert summary['max_count'] == max(expected.values())